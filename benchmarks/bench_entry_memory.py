@@ -0,0 +1,169 @@
+"""Measure the memory retained per log entry.
+
+The previous ``LogEntry`` was a plain dataclass holding the raw line next to
+the message, level and component strings sliced from every line, and a
+context dict allocated for every entry. It is copied below as the baseline.
+Entries are built the way ingestion builds them and kept in the history
+store, and tracemalloc reports the bytes retained per entry.
+
+Usage:
+    python benchmarks/bench_entry_memory.py --counts 1000 10000 100000
+"""
+from __future__ import annotations
+
+import argparse
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import gc
+from pathlib import Path
+import random
+import re
+import sys
+import tracemalloc
+import types
+from typing import Any
+
+COMPONENT_DIR = Path(__file__).resolve().parents[1] / "custom_components" / "ha_log_debugger"
+
+# Import the stdlib-only modules without running the integration's __init__
+_package = types.ModuleType("ha_log_debugger")
+_package.__path__ = [str(COMPONENT_DIR)]
+sys.modules["ha_log_debugger"] = _package
+
+from ha_log_debugger.entry_store import EntryStore, make_entry_id  # noqa: E402
+from ha_log_debugger.log_entry import LogEntry  # noqa: E402
+
+LEVELS = ["WARNING"] * 6 + ["ERROR"] * 3 + ["CRITICAL"]
+LOGGERS = [
+    "homeassistant.components.zha.core.gateway",
+    "homeassistant.components.mqtt.client",
+    "homeassistant.components.recorder.core",
+    "custom_components.hacs.base",
+]
+GITHUB_URL = "https://github.com/home-assistant/core/tree/dev/homeassistant/components/"
+
+
+@dataclass
+class LegacyLogEntry:
+    """Previous LogEntry."""
+
+    entry_id: str
+    timestamp: datetime
+    level: str
+    message: str
+    raw_line: str
+    component: str | None = None
+    entity_id: str | None = None
+    entity_ids: list[str] = field(default_factory=list)
+    device_id: str | None = None
+    github_url: str | None = None
+    ai_analysis: str | None = None
+    suggested_fix: str | None = None
+    analyzed: bool = False
+    exception: str | None = None
+    signature: str | None = None
+    context: dict[str, Any] = field(default_factory=dict)
+
+
+def make_lines(count: int, seed: int = 1) -> Iterator[str]:
+    """Generate distinct header lines.
+
+    Lines are generated while measuring so that what an entry keeps of its
+    line is counted and the rest is freed, as when reading the log.
+    """
+    rng = random.Random(seed)
+    start = datetime(2025, 10, 9)
+    for i in range(count):
+        timestamp = start + timedelta(milliseconds=i * 37)
+        yield (
+            f"{timestamp:%Y-%m-%d %H:%M:%S}.{timestamp.microsecond // 1000:03d} "
+            f"{rng.choice(LEVELS)} (MainThread) [{rng.choice(LOGGERS)}] "
+            f"Update of sensor.device_{rng.randrange(500)} failed after "
+            f"{rng.random():.3f} seconds (attempt {i})\n"
+        )
+
+
+def split_line(line: str) -> tuple[datetime, str, str, str]:
+    """Slice the parts of a header line like the parsers do."""
+    level_end = line.index(" ", 24)
+    logger_start = line.index("[", level_end) + 1
+    logger_end = line.index("]", logger_start)
+    logger = line[logger_start:logger_end]
+    component = logger.split(".")[2] if logger.startswith("homeassistant.") else logger
+    return (
+        datetime.fromisoformat(line[:23]),
+        line[24:level_end],
+        component,
+        line[logger_end + 2 :].rstrip("\n"),
+    )
+
+
+def build_legacy(line: str, enrich: bool) -> LegacyLogEntry:
+    """Build an entry the way the previous ingestion did."""
+    timestamp, level, component, message = split_line(line)
+    entry = LegacyLogEntry(
+        entry_id=f"{timestamp.timestamp()}_{hash(line) % 10000}",
+        timestamp=timestamp,
+        level=level,
+        message=message,
+        raw_line=line,
+        component=component,
+    )
+    if enrich:
+        entry.github_url = GITHUB_URL + component
+        entry.context["numbers"] = re.findall(r"\b\d+\.?\d*\b", message)
+    return entry
+
+
+def build_compact(line: str, enrich: bool) -> LogEntry:
+    """Build an entry the way ingestion does now."""
+    timestamp, level, component, message = split_line(line)
+    entry = LogEntry(
+        entry_id=make_entry_id(line),
+        timestamp=timestamp,
+        level=level,
+        message=message,
+        component=component,
+    )
+    if enrich:
+        entry.github_url = GITHUB_URL + component
+        entry.details.context["numbers"] = re.findall(r"\b\d+\.?\d*\b", message)
+    return entry
+
+
+def retained_bytes(build, count: int, enrich: bool, compact: bool) -> float:
+    """Return the bytes retained per entry kept in the history."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = EntryStore(count) if compact else deque(maxlen=count)
+    for line in make_lines(count):
+        store.append(build(line, enrich))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del store
+    return retained / count
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'enriched':>8} {'legacy B':>9} {'compact B':>9} {'saved':>6}")
+    for count in args.counts:
+        for enrich in (False, True):
+            legacy = retained_bytes(build_legacy, count, enrich, compact=False)
+            compact = retained_bytes(build_compact, count, enrich, compact=True)
+            print(
+                f"{count:>8} {str(enrich):>8} {legacy:>9.0f} {compact:>9.0f} "
+                f"{1 - compact / legacy:>6.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark header parsing against the previous regex-based parser.
+
+The previous ``LogMonitor._parse_log_line`` matched every line against a
+regex given as a string, parsed the timestamp with ``strptime`` and only then
+checked the level, rebuilding the level table on every call. It is copied
+below (without enrichment, which both paths share) as the baseline. It took
+the thread name as the component; the baseline takes it from the logger like
+LogLineParser, so both accept the same lines.
+
+Usage:
+    python benchmarks/bench_line_parser.py --lines 200000 --level WARNING
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+from pathlib import Path
+import random
+import re
+import sys
+import time
+import types
+
+COMPONENT_DIR = Path(__file__).resolve().parents[1] / "custom_components" / "ha_log_debugger"
+
+# Import the stdlib-only modules without running the integration's __init__
+_package = types.ModuleType("ha_log_debugger")
+_package.__path__ = [str(COMPONENT_DIR)]
+sys.modules["ha_log_debugger"] = _package
+
+from ha_log_debugger.line_parser import LogLineParser, component_from_logger  # noqa: E402
+
+LEVELS = ["DEBUG"] * 40 + ["INFO"] * 40 + ["WARNING"] * 12 + ["ERROR"] * 7 + ["CRITICAL"]
+LOGGERS = [
+    "homeassistant.core",
+    "homeassistant.components.zha.core.gateway",
+    "homeassistant.components.mqtt.client",
+    "homeassistant.components.recorder.core",
+    "custom_components.hacs.base",
+    "aiohttp.server",
+]
+
+
+def legacy_parse(line: str, log_level_filter: str, excluded: list[str]):
+    """Previous _parse_log_line, without enrichment."""
+    pattern = r"^(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+(\w+)\s+\(([^)]+)\)\s+\[([^\]]+)\]\s+(.+)$"
+    match = re.match(pattern, line.strip())
+    if not match:
+        return None
+    timestamp_str, level, thread, source, message = match.groups()
+    level_priority = {"WARNING": 1, "ERROR": 2, "CRITICAL": 3}
+    if level_priority.get(level.upper(), 0) < level_priority.get(log_level_filter, 1):
+        return None
+    # Excluded by the component of the logger, as the current parser does
+    component = component_from_logger(source)
+    if component in excluded:
+        return None
+    try:
+        timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        timestamp = datetime.now()
+    return timestamp, level, component, message
+
+
+def make_lines(count: int, millis: bool, seed: int = 1) -> list[str]:
+    """Generate header lines with a realistic level mix."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        second = i // 50
+        timestamp = f"2025-10-09 {second // 3600 % 24:02d}:{second // 60 % 60:02d}:{second % 60:02d}"
+        if millis:
+            timestamp += f".{rng.randrange(1000):03d}"
+        lines.append(
+            f"{timestamp} {rng.choice(LEVELS)} (MainThread) [{rng.choice(LOGGERS)}] "
+            f"Update of sensor.device_{rng.randrange(500)} took {rng.random():.3f} seconds\n"
+        )
+    return lines
+
+
+def run(func, lines: list[str]) -> tuple[float, int]:
+    """Return lines per second and number of accepted lines."""
+    start = time.perf_counter()
+    accepted = sum(1 for line in lines if func(line) is not None)
+    return len(lines) / (time.perf_counter() - start), accepted
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--level", default="WARNING")
+    parser.add_argument("--exclude", nargs="*", default=["aiohttp"])
+    args = parser.parse_args()
+
+    # The previous parser does not understand milliseconds, so it is
+    # compared on second-resolution lines
+    plain = make_lines(args.lines, millis=False)
+    with_millis = make_lines(args.lines, millis=True)
+
+    legacy_rate, legacy_count = run(
+        lambda line: legacy_parse(line, args.level, args.exclude), plain
+    )
+    line_parser = LogLineParser(args.level, args.exclude)
+    new_rate, new_count = run(line_parser.parse, plain)
+    millis_rate, millis_count = run(
+        LogLineParser(args.level, args.exclude).parse, with_millis
+    )
+    if legacy_count != new_count:
+        sys.exit(
+            f"Parsers accepted different lines: legacy {legacy_count}, "
+            f"LogLineParser {new_count}"
+        )
+
+    print(f"{'parser':<24} {'lines/s':>12} {'accepted':>9}")
+    print(f"{'legacy _parse_log_line':<24} {legacy_rate:>12,.0f} {legacy_count:>9}")
+    print(f"{'LogLineParser':<24} {new_rate:>12,.0f} {new_count:>9}")
+    print(f"{'LogLineParser (.mmm)':<24} {millis_rate:>12,.0f} {millis_count:>9}")
+    print(f"speedup: {new_rate / legacy_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Measure end-to-end latency and throughput from a log write to sensor state.
+
+A writer thread appends generated records to a temporary
+``home-assistant.log`` at a steady rate, with bursts, rotations and records
+written in two parts, the way Home Assistant's logging thread does. A real
+``LogMonitor`` follows the file through ``async_scan_logs``, triggered by
+the inotify watcher like the integration, or by a timer with --poll.
+
+Every record carries a sequence number. A record is detected when the
+statistics update that counts it is sent to the sensors, which is when
+the Total, Error and Warning sensors write their state. Reported are:
+
+    latency      write to sensor update, p50, p99 and maximum
+    lag          bytes written but not yet read, sampled while writing
+    lost         records at or above the level that were never processed
+    duplicated   records processed more than once
+    miscounted   difference between the level counters and the records
+
+The run fails (exit code 1) on lost, duplicated or miscounted records, or
+when the p99 latency exceeds --max-p99-ms, so it can gate changes to the
+scan interval, the reader or the pipeline.
+
+Usage:
+    python benchmarks/bench_load.py --rate 200 --seconds 20 --max-p99-ms 250
+    python benchmarks/bench_load.py --poll 5 --burst-size 5000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+import logging
+import os
+from pathlib import Path
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fake_hass  # noqa: E402
+from loggen import LogGenerator, entity_ids  # noqa: E402
+
+fake_hass.install()
+
+from ha_log_debugger.const import CONF_LOG_LEVEL, SIGNAL_STATS_UPDATED  # noqa: E402
+from ha_log_debugger.file_watcher import LogFileWatcher  # noqa: E402
+from ha_log_debugger.line_parser import LEVEL_PRIORITY  # noqa: E402
+from ha_log_debugger.log_entry import LogEntry  # noqa: E402
+from ha_log_debugger.log_monitor import LogMonitor  # noqa: E402
+
+_SEQUENCE = re.compile(r" #(\d+)$")
+_COUNTERS = ("total_warnings", "total_errors", "total_critical")
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Get a percentile of sorted values, nearest rank."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class LogWriter(threading.Thread):
+    """Append records to the log file like the logging thread of Home Assistant.
+
+    Headers get the current time and a sequence number. The write time of
+    every record at or above the level is kept, once it is flushed.
+    """
+
+    def __init__(self, path: Path, args: argparse.Namespace) -> None:
+        """Initialize the writer."""
+        super().__init__(name="log writer", daemon=True)
+        self.path = path
+        self.args = args
+        self.generator = LogGenerator(seed=args.seed)
+        self._rng = random.Random(args.seed)
+        self.priority = LEVEL_PRIORITY[args.level]
+        self.written: dict[int, float] = {}
+        self.records = 0
+        self.rotations = 0
+        self.lag_samples: list[int] = []
+        # Bytes of the files rotated away, by identity
+        self._rotated: dict[tuple[int, int], int] = {}
+        self._sequence = 0
+        self._reader = None
+
+    def follow(self, reader) -> None:
+        """Sample the lag of a log reader."""
+        self._reader = reader
+
+    def _write(self, log, count: int) -> None:
+        """Write count records and flush them."""
+        sequences = []
+        for record in self.generator.records(count):
+            self._sequence += 1
+            now = datetime.now()
+            header = (
+                f"{now:%Y-%m-%d %H:%M:%S}.{now.microsecond // 1000:03d}"
+                f"{record[0][23:-1]} #{self._sequence}\n"
+            )
+            level = header.split(" ", 3)[2]
+            if LEVEL_PRIORITY.get(level, 0) >= self.priority:
+                sequences.append(self._sequence)
+            if self._rng.random() < self.args.split_ratio:
+                # A record caught halfway by a scan
+                middle = len(header) // 2
+                log.write(header[:middle])
+                log.flush()
+                time.sleep(0.001)
+                log.write(header[middle:])
+            else:
+                log.write(header)
+            log.writelines(record[1:])
+        log.flush()
+        written = time.perf_counter()
+        for sequence in sequences:
+            self.written[sequence] = written
+        self.records += count
+
+    def _rotate(self, log):
+        """Move the log to .1 and start a new one, like a restart does."""
+        log.close()
+        stat = os.stat(self.path)
+        self._rotated = {(stat.st_dev, stat.st_ino): stat.st_size}
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        self.rotations += 1
+        return open(self.path, "a", encoding="utf-8")
+
+    def _sample_lag(self) -> None:
+        """Note the bytes written but not yet read."""
+        if self._reader is None or self._reader._identity is None:
+            return
+        stat = os.stat(self.path)
+        identity = (stat.st_dev, stat.st_ino)
+        if identity == self._reader._identity:
+            lag = stat.st_size - self._reader.position
+        else:
+            rotated = self._rotated.get(self._reader._identity, 0)
+            lag = stat.st_size + max(0, rotated - self._reader.position)
+        self.lag_samples.append(lag)
+
+    def run(self) -> None:
+        """Write at the rate until the time is up."""
+        args = self.args
+        tick = 0.01
+        start = time.perf_counter()
+        next_burst = args.burst_every
+        next_rotation = args.rotate_every or float("inf")
+        due = 0.0
+        log = open(self.path, "a", encoding="utf-8")
+        try:
+            while (elapsed := time.perf_counter() - start) < args.seconds:
+                due += args.rate * tick
+                if int(due):
+                    self._write(log, int(due))
+                    due -= int(due)
+                if args.burst_every and elapsed >= next_burst:
+                    self._write(log, args.burst_size)
+                    next_burst += args.burst_every
+                if elapsed >= next_rotation:
+                    log = self._rotate(log)
+                    next_rotation += args.rotate_every
+                self._sample_lag()
+                time.sleep(max(0.0, start + elapsed + tick - time.perf_counter()))
+        finally:
+            log.close()
+
+
+async def run(args: argparse.Namespace, directory: str) -> int:
+    """Run the writer against a monitor, report and return the exit code."""
+    hass = fake_hass.FakeHass(entity_ids(LogGenerator.entities), directory)
+    entry = fake_hass.FakeConfigEntry(options={CONF_LOG_LEVEL: args.level})
+    path = Path(hass.config.path("home-assistant.log"))
+    path.touch()
+
+    monitor = LogMonitor(hass, entry)
+    processed: dict[int, int] = {}
+    pending: list[int] = []
+    detected: dict[int, float] = {}
+    process_entry = monitor._process_entry
+
+    async def observe_entry(entry: LogEntry) -> None:
+        if match := _SEQUENCE.search(entry.message):
+            sequence = int(match.group(1))
+            processed[sequence] = processed.get(sequence, 0) + 1
+            pending.append(sequence)
+        await process_entry(entry)
+
+    def stats_updated(changed: frozenset[str]) -> None:
+        if changed.isdisjoint(_COUNTERS):
+            return
+        now = time.perf_counter()
+        for sequence in pending:
+            detected.setdefault(sequence, now)
+        pending.clear()
+
+    monitor._process_entry = observe_entry
+    fake_hass.async_dispatcher_connect(
+        hass, SIGNAL_STATS_UPDATED.format(entry.entry_id), stats_updated
+    )
+    await monitor.async_start()
+    counted_before = sum(monitor.stats[key] for key in _COUNTERS)
+
+    async def scan() -> None:
+        await monitor.async_scan_logs(full_scan=False)
+
+    watcher = None
+    stop_polling = None
+    if args.poll is None:
+        watcher = LogFileWatcher(hass, path, scan)
+        if not await watcher.async_start():
+            print("inotify not available, polling every second")
+            watcher, args.poll = None, 1.0
+    if watcher is None:
+        stop_polling = fake_hass.async_track_time_interval(
+            hass, lambda now: scan(), timedelta(seconds=args.poll)
+        )
+
+    writer = LogWriter(path, args)
+    writer.follow(monitor.reader)
+    started = time.perf_counter()
+    writer.start()
+    while writer.is_alive():
+        await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - started
+
+    # Let the monitor catch up, then read what is left
+    deadline = time.monotonic() + args.drain
+    while len(detected) < len(writer.written) and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    await scan()
+    if watcher is not None:
+        watcher.async_stop()
+    if stop_polling is not None:
+        stop_polling()
+    counted = sum(monitor.stats[key] for key in _COUNTERS) - counted_before
+    await monitor.async_stop()
+
+    latencies = sorted(
+        (detected[sequence] - written) * 1000
+        for sequence, written in writer.written.items()
+        if sequence in detected
+    )
+    lost = len(writer.written.keys() - processed.keys())
+    duplicated = sum(1 for count in processed.values() if count > 1)
+    miscounted = counted - len(writer.written)
+    lags = sorted(writer.lag_samples)
+    p99 = percentile(latencies, 0.99)
+
+    print(
+        f"{'watch' if watcher else f'poll {args.poll:g}s'}, level {args.level}, "
+        f"{writer.records} records in {elapsed:.1f}s "
+        f"({writer.records / elapsed:,.0f}/s), {writer.rotations} rotations"
+    )
+    print(
+        f"latency ms   p50 {percentile(latencies, 0.5):.1f}  "
+        f"p99 {p99:.1f}  max {latencies[-1] if latencies else 0:.1f}"
+    )
+    print(
+        f"lag KiB      p50 {percentile(lags, 0.5) / 1024:.1f}  "
+        f"p99 {percentile(lags, 0.99) / 1024:.1f}  "
+        f"max {(lags[-1] if lags else 0) / 1024:.1f}"
+    )
+    print(
+        f"records      {len(writer.written)} expected  {len(detected)} detected  "
+        f"{lost} lost  {duplicated} duplicated  {miscounted:+d} miscounted"
+    )
+    failed = bool(lost or duplicated or miscounted)
+    if args.max_p99_ms is not None and p99 > args.max_p99_ms:
+        print(f"p99 latency above {args.max_p99_ms:g} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+def main() -> None:
+    """Run the harness."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=200, help="records per second")
+    parser.add_argument("--seconds", type=float, default=20, help="time spent writing")
+    parser.add_argument("--burst-every", type=float, default=5, help="seconds, 0 for none")
+    parser.add_argument("--burst-size", type=int, default=2000, help="records per burst")
+    parser.add_argument("--rotate-every", type=float, default=8, help="seconds, 0 for none")
+    parser.add_argument(
+        "--split-ratio", type=float, default=0.02, help="share of headers written in two parts"
+    )
+    parser.add_argument(
+        "--poll", type=float, help="scan every this many seconds instead of watching"
+    )
+    parser.add_argument("--level", default="WARNING", help="minimum level")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--drain", type=float, default=10, help="seconds allowed to catch up after writing"
+    )
+    parser.add_argument("--max-p99-ms", type=float, help="fail above this p99 latency")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as directory:
+        sys.exit(asyncio.run(run(args, directory)))
+
+
+if __name__ == "__main__":
+    main()
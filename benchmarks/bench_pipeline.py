@@ -0,0 +1,212 @@
+"""Benchmark the ingestion pipeline on a synthetic log.
+
+Stages:
+    full_scan    read the tail of the log, group tracebacks, parse and store,
+                 as a full scan does
+    incremental  read appended chunks, group tracebacks, parse and store, as
+                 scans triggered by file changes do
+    parse        parse header lines into entries, without any I/O
+    enrich       run the deferred enrichment (entities, device, repository,
+                 context) of the parsed entries against fake registries
+
+Every stage is timed without tracing (best of --repeat) and run once more
+under tracemalloc for its peak memory. The log comes from ``loggen.py``, so
+the same seed gives the same input on every machine, and Home Assistant is
+replaced by ``fake_hass.py``.
+
+Usage:
+    python benchmarks/bench_pipeline.py --lines 100000 --level WARNING
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+import gc
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fake_hass  # noqa: E402
+from loggen import LogGenerator, entity_ids  # noqa: E402
+
+fake_hass.install()
+
+from ha_log_debugger.const import (  # noqa: E402
+    MAX_LOG_ENTRIES,
+    MAX_LOG_LINES_FULL_SCAN,
+)
+from ha_log_debugger.entry_store import EntryStore, make_entry_id  # noqa: E402
+from ha_log_debugger.line_parser import LogLineParser  # noqa: E402
+from ha_log_debugger.log_entry import LogEntry  # noqa: E402
+from ha_log_debugger.log_reader import LogFileReader, LogRecordAssembler  # noqa: E402
+from ha_log_debugger.parsers import LogParser  # noqa: E402
+from ha_log_debugger.signatures import SignatureStore  # noqa: E402
+
+Record = tuple[str, str | None]
+
+
+class Pipeline:
+    """The parsing and storing steps of LogMonitor, without Home Assistant.
+
+    ``build_entry`` follows ``LogMonitor._parse_log_line`` and ``process``
+    the deduplication and storage of ``LogMonitor._process_entry``.
+    """
+
+    def __init__(self, level: str, hass: fake_hass.FakeHass) -> None:
+        """Initialize the pipeline."""
+        self.line_parser = LogLineParser(level)
+        self.parser = LogParser(hass)
+        self.enricher = self.parser.enrich_entry
+        self.signatures = SignatureStore()
+        self.entries = EntryStore(MAX_LOG_ENTRIES)
+
+    def build_entry(self, header: str, exception: str | None) -> LogEntry | None:
+        """Parse a record into an entry with deferred enrichment."""
+        parsed = self.line_parser.parse(header)
+        if parsed is None:
+            return None
+        timestamp, level, component, message = parsed
+        return LogEntry(
+            entry_id=make_entry_id(header),
+            timestamp=timestamp,
+            level=level,
+            message=message,
+            component=component,
+            exception=exception,
+            enricher=self.enricher,
+        )
+
+    def process(self, records: list[Record]) -> int:
+        """Parse and store records, return the number of stored entries."""
+        stored = 0
+        for header, exception in records:
+            entry = self.build_entry(header, exception)
+            if entry is None or entry.entry_id in self.entries:
+                continue
+            group, _ = self.signatures.record(entry)
+            if group.entry is None:
+                self.entries.append(entry)
+                group.entry = entry
+                stored += 1
+        return stored
+
+
+def measure(
+    setup: Callable[[], object], run: Callable[[object], int], repeat: int
+) -> tuple[float, int, float]:
+    """Return the best time, the lines handled and the peak MiB of a stage."""
+    best = float("inf")
+    lines = 0
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        lines = run(state)
+        best = min(best, time.perf_counter() - start)
+
+    state = setup()
+    gc.collect()
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, lines, peak / 1024 / 1024
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100000, help="records in the log")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--level", default="WARNING", help="minimum level")
+    parser.add_argument("--chunk", type=int, default=500, help="records per append")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    hass = fake_hass.FakeHass(entity_ids(LogGenerator.entities))
+    records = list(LogGenerator(seed=args.seed).records(args.lines))
+    physical = [line for record in records for line in record]
+    assembled = LogRecordAssembler().feed(physical, flush=True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "home-assistant.log"
+        with open(path, "w", encoding="utf-8") as log:
+            log.writelines(physical)
+
+        def full_scan_setup() -> tuple[LogFileReader, Pipeline]:
+            return LogFileReader(path), Pipeline(args.level, hass)
+
+        def full_scan(state: tuple[LogFileReader, Pipeline]) -> int:
+            reader, pipeline = state
+            lines = reader.read_tail(MAX_LOG_LINES_FULL_SCAN)
+            pipeline.process(LogRecordAssembler().feed(lines, flush=True))
+            return len(lines)
+
+        incremental_path = Path(directory) / "incremental.log"
+
+        def incremental_setup() -> tuple[LogFileReader, Pipeline]:
+            incremental_path.write_bytes(b"")
+            reader = LogFileReader(incremental_path)
+            reader.seek_to_end()
+            return reader, Pipeline(args.level, hass)
+
+        def incremental(state: tuple[LogFileReader, Pipeline]) -> int:
+            # Appending is part of the loop, as the log grows between scans
+            reader, pipeline = state
+            assembler = LogRecordAssembler()
+            lines = 0
+            with open(incremental_path, "a", encoding="utf-8") as log:
+                for start in range(0, len(records), args.chunk):
+                    for record in records[start : start + args.chunk]:
+                        log.writelines(record)
+                    log.flush()
+                    new_lines = reader.read_new_lines()
+                    lines += len(new_lines)
+                    pipeline.process(
+                        assembler.feed(new_lines, flush=reader.pending_bytes == 0)
+                    )
+            return lines
+
+        def parse_setup() -> Pipeline:
+            return Pipeline(args.level, hass)
+
+        def parse(pipeline: Pipeline) -> int:
+            for header, exception in assembled:
+                pipeline.build_entry(header, exception)
+            return len(assembled)
+
+        def enrich_setup() -> list[LogEntry]:
+            pipeline = Pipeline(args.level, hass)
+            entries = (pipeline.build_entry(*record) for record in assembled)
+            return [entry for entry in entries if entry is not None]
+
+        def enrich(entries: list[LogEntry]) -> int:
+            for entry in entries:
+                entry.enrich()
+            return len(entries)
+
+        stages = {
+            "full_scan": (full_scan_setup, full_scan),
+            "incremental": (incremental_setup, incremental),
+            "parse": (parse_setup, parse),
+            "enrich": (enrich_setup, enrich),
+        }
+        print(
+            f"{args.lines} records, {len(physical)} lines, "
+            f"{path.stat().st_size / 1024 / 1024:.1f} MiB, level {args.level}"
+        )
+        print(f"{'stage':<12} {'items':>9} {'seconds':>9} {'items/s':>11} {'peak MiB':>9}")
+        for name, (setup, run) in stages.items():
+            seconds, lines, peak = measure(setup, run, args.repeat)
+            print(
+                f"{name:<12} {lines:>9} {seconds:>9.3f} "
+                f"{lines / seconds:>11,.0f} {peak:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark the reverse tail reader used for full log scans.
+
+Generates synthetic log files of increasing size and reports wall time and
+peak traced memory for reading the last MAX_LOG_LINES_FULL_SCAN lines.
+With ``--legacy`` the previous ``readlines()`` approach is measured as well.
+
+Usage:
+    python benchmarks/bench_tail_reader.py --sizes 10 100 1000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "custom_components" / "ha_log_debugger")
+)
+
+from log_reader import read_tail_lines  # noqa: E402
+
+MAX_LOG_LINES_FULL_SCAN = 5000
+
+SAMPLE_LINES = (
+    b"2025-10-09 12:00:00.123 INFO (MainThread) [homeassistant.core] Bus:Handling event state_changed\n"
+    b"2025-10-09 12:00:00.456 WARNING (MainThread) [homeassistant.components.zha] Device 0x1234 did not respond\n"
+    b"2025-10-09 12:00:01.789 ERROR (MainThread) [homeassistant.components.mqtt] Connection to 192.168.1.10 failed\n"
+    b"2025-10-09 12:00:02.001 DEBUG (SyncWorker_3) [custom_components.foo] Polling https://example.com/api\n"
+)
+
+
+def legacy_read(path: Path, max_lines: int) -> list[str]:
+    """Previous implementation: read every line, then slice."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        all_lines = f.readlines()
+    return all_lines[-max_lines:]
+
+
+def make_log(path: Path, size_mb: int) -> None:
+    """Write a synthetic log file of roughly ``size_mb`` megabytes."""
+    block = SAMPLE_LINES * (1024 * 1024 // len(SAMPLE_LINES))
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+
+
+def measure(func, *args) -> tuple[float, int, int]:
+    """Return elapsed seconds, peak traced bytes and number of lines."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    lines = result[0] if isinstance(result, tuple) else result
+    return elapsed, peak, len(lines)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="File sizes in MB")
+    parser.add_argument("--lines", type=int, default=MAX_LOG_LINES_FULL_SCAN)
+    parser.add_argument("--legacy", action="store_true", help="Also measure the readlines() approach")
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'method':>8} {'lines':>7} {'time (ms)':>10} {'peak (KiB)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes:
+            path = Path(tmp) / f"home-assistant-{size_mb}.log"
+            make_log(path, size_mb)
+            methods = [("tail", read_tail_lines)]
+            if args.legacy:
+                methods.append(("legacy", legacy_read))
+            for name, func in methods:
+                elapsed, peak, count = measure(func, path, args.lines)
+                print(
+                    f"{size_mb:>6}MB {name:>8} {count:>7} "
+                    f"{elapsed * 1000:>10.1f} {peak / 1024:>11.0f}"
+                )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
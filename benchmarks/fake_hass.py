@@ -0,0 +1,319 @@
+"""Lightweight stand-in for Home Assistant, so benchmarks run offline.
+
+``install()`` registers minimal ``homeassistant`` modules, enough for the
+parsing and enrichment modules of the integration and for running
+``LogMonitor`` on an asyncio loop, and makes the integration importable as
+``ha_log_debugger`` without running its ``__init__``. ``FakeHass`` holds an
+entity and device registry filled with the entities the log generator
+mentions. Timers, the dispatcher and storage behave like Home Assistant's,
+storage is kept in memory.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Coroutine, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+import types
+from typing import Any
+
+COMPONENT_DIR = Path(__file__).resolve().parents[1] / "custom_components" / "ha_log_debugger"
+
+
+@dataclass
+class RegistryEntry:
+    """Entity registry entry."""
+
+    entity_id: str
+    device_id: str | None = None
+
+
+@dataclass
+class DeviceEntry:
+    """Device registry entry."""
+
+    id: str
+    name: str
+    manufacturer: str = "Acme"
+    model: str = "Sensor v2"
+    name_by_user: str | None = None
+
+
+class EntityRegistry:
+    """Entity registry holding the entries by entity ID."""
+
+    def __init__(self, entries: Iterable[RegistryEntry] = ()) -> None:
+        """Initialize the registry."""
+        self.entities = {entry.entity_id: entry for entry in entries}
+
+    def async_get(self, entity_id: str) -> RegistryEntry | None:
+        """Get an entry."""
+        return self.entities.get(entity_id)
+
+
+class DeviceRegistry:
+    """Device registry holding the entries by device ID."""
+
+    def __init__(self, devices: Iterable[DeviceEntry] = ()) -> None:
+        """Initialize the registry."""
+        self.devices = {device.id: device for device in devices}
+
+    def async_get(self, device_id: str) -> DeviceEntry | None:
+        """Get an entry."""
+        return self.devices.get(device_id)
+
+
+class FakeBus:
+    """Event bus that accepts listeners and only counts fired events."""
+
+    def __init__(self) -> None:
+        """Initialize the bus."""
+        self.fired: Counter[str] = Counter()
+
+    def async_listen(self, event_type: str, listener: Callable) -> Callable[[], None]:
+        """Register a listener, return its remover."""
+        return lambda: None
+
+    def async_fire(self, event_type: str, event_data: dict[str, Any] | None = None) -> None:
+        """Count an event."""
+        self.fired[event_type] += 1
+
+
+class FakeServices:
+    """Service registry without services, calls are counted."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self.calls: Counter[str] = Counter()
+
+    def has_service(self, domain: str, service: str) -> bool:
+        """Check if a service exists."""
+        return False
+
+    async def async_call(self, domain: str, service: str, *args: Any, **kwargs: Any) -> None:
+        """Count a service call."""
+        self.calls[f"{domain}.{service}"] += 1
+
+
+@dataclass
+class FakeConfig:
+    """Configuration holding the config directory."""
+
+    config_dir: str
+
+    def path(self, *path: str) -> str:
+        """Get a path in the config directory."""
+        return str(Path(self.config_dir, *path))
+
+
+@dataclass
+class FakeConfigEntry:
+    """Config entry with data and options."""
+
+    entry_id: str = "bench"
+    data: dict[str, Any] = field(default_factory=dict)
+    options: dict[str, Any] = field(default_factory=dict)
+    _on_unload: list[Callable[[], Any]] = field(default_factory=list)
+
+    def async_on_unload(self, func: Callable[[], Any]) -> None:
+        """Register a function to call on unload."""
+        self._on_unload.append(func)
+
+    def add_update_listener(self, listener: Callable) -> Callable[[], None]:
+        """Register an options listener, return its remover."""
+        return lambda: None
+
+    def async_unload(self) -> None:
+        """Call the unload functions."""
+        while self._on_unload:
+            self._on_unload.pop()()
+
+
+class FakeHass:
+    """Home Assistant with registries of generated entities and devices.
+
+    Every other entity gets a device, and devices hold ten entities each.
+    """
+
+    def __init__(self, entity_ids: Iterable[str], config_dir: str = ".") -> None:
+        """Initialize the registries."""
+        entries = [
+            RegistryEntry(entity_id, f"device_{index // 20}" if index % 2 == 0 else None)
+            for index, entity_id in enumerate(entity_ids)
+        ]
+        device_ids = {entry.device_id for entry in entries if entry.device_id}
+        self.entity_registry = EntityRegistry(entries)
+        self.device_registry = DeviceRegistry(
+            DeviceEntry(device_id, f"Device {device_id}") for device_id in device_ids
+        )
+        self.bus = FakeBus()
+        self.services = FakeServices()
+        self.config = FakeConfig(config_dir)
+        self.data: dict[str, Any] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Get the running event loop."""
+        return asyncio.get_running_loop()
+
+    async def async_add_executor_job(self, target: Callable, *args: Any) -> Any:
+        """Run a blocking function in the default executor."""
+        return await self.loop.run_in_executor(None, target, *args)
+
+    def async_create_task(self, target: Coroutine, name: str | None = None) -> asyncio.Task:
+        """Create a task that is kept until it is done."""
+        task = self.loop.create_task(target, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async_create_background_task = async_create_task
+
+    def async_run_job(self, target: Callable, *args: Any) -> None:
+        """Call a callback or schedule a coroutine function."""
+        if asyncio.iscoroutine(result := target(*args)):
+            self.async_create_task(result)
+
+
+def _utcnow() -> datetime:
+    """Get the current time in UTC."""
+    return datetime.now(timezone.utc)
+
+
+def async_track_time_interval(
+    hass: FakeHass, action: Callable, interval: timedelta, **kwargs: Any
+) -> Callable[[], None]:
+    """Call an action every interval, return the remover."""
+    loop = hass.loop
+    seconds = interval.total_seconds()
+    handle: asyncio.TimerHandle
+
+    def run() -> None:
+        nonlocal handle
+        handle = loop.call_later(seconds, run)
+        hass.async_run_job(action, _utcnow())
+
+    handle = loop.call_later(seconds, run)
+    return lambda: handle.cancel()
+
+
+def async_track_point_in_utc_time(
+    hass: FakeHass, action: Callable, point_in_time: datetime
+) -> Callable[[], None]:
+    """Call an action at a point in time, return the remover."""
+    delay = max(0.0, (point_in_time - _utcnow()).total_seconds())
+    handle = hass.loop.call_later(delay, lambda: hass.async_run_job(action, _utcnow()))
+    return handle.cancel
+
+
+def async_call_later(
+    hass: FakeHass, delay: float | timedelta, action: Callable
+) -> Callable[[], None]:
+    """Call an action after a delay, return the remover."""
+    if isinstance(delay, timedelta):
+        delay = delay.total_seconds()
+    return async_track_point_in_utc_time(
+        hass, action, _utcnow() + timedelta(seconds=delay)
+    )
+
+
+def async_dispatcher_connect(
+    hass: FakeHass, signal: str, target: Callable
+) -> Callable[[], None]:
+    """Connect a target to a signal, return the disconnector."""
+    targets = hass.data.setdefault("dispatcher", {}).setdefault(signal, [])
+    targets.append(target)
+    return lambda: targets.remove(target)
+
+
+def async_dispatcher_send(hass: FakeHass, signal: str, *args: Any) -> None:
+    """Call the targets of a signal."""
+    for target in list(hass.data.get("dispatcher", {}).get(signal, ())):
+        hass.async_run_job(target, *args)
+
+
+class Store:
+    """Storage kept in memory for the lifetime of a FakeHass."""
+
+    def __init__(self, hass: FakeHass, version: int, key: str, **kwargs: Any) -> None:
+        """Initialize the store."""
+        self._data: dict[str, Any] = hass.data.setdefault("storage", {})
+        self.key = key
+
+    async def async_load(self) -> Any:
+        """Load the stored data, None if there is none."""
+        return self._data.get(self.key)
+
+    async def async_save(self, data: Any) -> None:
+        """Store data."""
+        self._data[self.key] = data
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        """Store data, without waiting for the delay."""
+        self._data[self.key] = data_func()
+
+
+def _module(name: str, **attributes: Any) -> types.ModuleType:
+    """Register a stub module."""
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install() -> None:
+    """Register the stub modules and the integration package."""
+    homeassistant = _module("homeassistant")
+    homeassistant.__path__ = []
+    _module(
+        "homeassistant.core",
+        HomeAssistant=FakeHass,
+        Event=Any,
+        CALLBACK_TYPE=Callable[[], None],
+        callback=lambda func: func,
+    )
+    helpers = _module("homeassistant.helpers")
+    helpers.__path__ = []
+    helpers.entity_registry = _module(
+        "homeassistant.helpers.entity_registry",
+        EntityRegistry=EntityRegistry,
+        EVENT_ENTITY_REGISTRY_UPDATED="entity_registry_updated",
+        async_get=lambda hass: hass.entity_registry,
+    )
+    helpers.device_registry = _module(
+        "homeassistant.helpers.device_registry",
+        DeviceRegistry=DeviceRegistry,
+        async_get=lambda hass: hass.device_registry,
+    )
+    helpers.dispatcher = _module(
+        "homeassistant.helpers.dispatcher",
+        async_dispatcher_connect=async_dispatcher_connect,
+        async_dispatcher_send=async_dispatcher_send,
+    )
+    helpers.event = _module(
+        "homeassistant.helpers.event",
+        async_call_later=async_call_later,
+        async_track_point_in_utc_time=async_track_point_in_utc_time,
+        async_track_time_interval=async_track_time_interval,
+    )
+    helpers.storage = _module("homeassistant.helpers.storage", Store=Store)
+    _module("homeassistant.config_entries", ConfigEntry=FakeConfigEntry)
+    util = _module("homeassistant.util")
+    util.__path__ = []
+    util.dt = _module(
+        "homeassistant.util.dt",
+        utcnow=_utcnow,
+        now=lambda: datetime.now().astimezone(),
+        as_local=lambda value: value.astimezone(),
+        utc_from_timestamp=lambda timestamp: datetime.fromtimestamp(
+            timestamp, timezone.utc
+        ),
+    )
+
+    package = types.ModuleType("ha_log_debugger")
+    package.__path__ = [str(COMPONENT_DIR)]
+    sys.modules["ha_log_debugger"] = package
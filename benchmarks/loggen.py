@@ -0,0 +1,212 @@
+"""Deterministic generator of synthetic Home Assistant logs.
+
+Models what the pipeline sees in a real ``home-assistant.log``: a level mix
+dominated by DEBUG and INFO, a few integrations producing most of the lines
+(Zipf-distributed), tracebacks after a share of the errors, messages that
+mention entities, IP addresses, URLs, numbers and file paths, and a long
+tail of long lines. The same seed always produces the same log.
+
+Usage:
+    python benchmarks/loggen.py --lines 100000 --seed 1 > home-assistant.log
+"""
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import random
+import sys
+
+LEVEL_WEIGHTS = {"DEBUG": 35, "INFO": 45, "WARNING": 12, "ERROR": 7, "CRITICAL": 1}
+
+LOGGERS = [
+    "homeassistant.components.zha.core.cluster_handlers",
+    "homeassistant.components.mqtt.client",
+    "homeassistant.components.recorder.core",
+    "homeassistant.core",
+    "homeassistant.components.sensor",
+    "homeassistant.components.template.template_entity",
+    "homeassistant.components.automation.kitchen_lights",
+    "homeassistant.helpers.entity",
+    "homeassistant.components.esphome.manager",
+    "homeassistant.components.http.ban",
+    "homeassistant.components.rest.data",
+    "homeassistant.components.energy.sensor",
+    "homeassistant.components.websocket_api.http.connection",
+    "homeassistant.components.cloud.iot",
+    "homeassistant.components.hue.v2.light",
+    "homeassistant.components.shelly.coordinator",
+    "homeassistant.components.tplink.coordinator",
+    "homeassistant.components.unifi.hub",
+    "homeassistant.components.cast.media_player",
+    "homeassistant.components.script.morning",
+    "custom_components.hacs.base",
+    "custom_components.alexa_media.media_player",
+    "custom_components.localtuya.common",
+    "custom_components.frigate.api",
+    "aiohttp.server",
+    "pychromecast.socket_client",
+    "zigpy.application",
+    "bellows.zigbee.application",
+]
+
+THREADS = ["MainThread"] * 8 + [f"SyncWorker_{i}" for i in range(4)] + ["Recorder"]
+
+DOMAINS = ["sensor", "light", "switch", "binary_sensor", "climate", "media_player"]
+
+TEMPLATES = {
+    "DEBUG": [
+        "Received message on {topic}: {payload}",
+        "Polling {url} took {seconds} seconds",
+        "Updating {entity} state to {number}",
+        "Bus:Handling <Event state_changed[L]: entity_id={entity}>",
+    ],
+    "INFO": [
+        "Setting up {domain}.{name}",
+        "Setup of domain {domain} took {seconds} seconds",
+        "Connected to {ip}:{port}",
+        "Loaded {domain} from {path}",
+    ],
+    "WARNING": [
+        "Update of {entity} is taking over 10 seconds",
+        "Template variable warning: '{name}' is undefined when rendering '{{{{ states.{entity}.state }}}}'",
+        "Device {ip} did not respond, retrying in {number} seconds",
+        "Entity {entity} state is unknown",
+        "Login attempt or request with invalid authentication from {ip}",
+    ],
+    "ERROR": [
+        "Error doing job: Task exception was never retrieved",
+        "Timeout fetching {domain} data",
+        "Connection to {ip}:{port} failed: [Errno 111] Connection refused",
+        "Error while setting up {domain} platform for {name}",
+        "Error requesting data from {url}: 503, message='Service Unavailable'",
+        "Entity {entity} is unavailable",
+        "Unexpected error in energy calculation for {entity}: could not convert '{name}' to float",
+    ],
+    "CRITICAL": [
+        "Setup failed for {domain}: Integration failed to initialize",
+        "Database error during schema migration: disk I/O error",
+    ],
+}
+
+FRAMES = [
+    ('/usr/src/homeassistant/homeassistant/helpers/entity.py', "async_update_ha_state"),
+    ('/usr/src/homeassistant/homeassistant/helpers/update_coordinator.py', "_async_refresh"),
+    ('/usr/local/lib/python3.12/site-packages/aiohttp/client.py', "_request"),
+    ('/usr/local/lib/python3.12/asyncio/tasks.py', "__step"),
+    ('/config/custom_components/localtuya/common.py', "async_connect"),
+    ('/usr/src/homeassistant/homeassistant/components/zha/core/device.py', "async_initialize"),
+]
+
+EXCEPTIONS = [
+    "TimeoutError",
+    "aiohttp.client_exceptions.ClientConnectorError: Cannot connect to host {ip}:{port}",
+    "ValueError: could not convert string to float: 'unavailable'",
+    "KeyError: '{name}'",
+    "ConnectionResetError: [Errno 104] Connection reset by peer",
+]
+
+
+def entity_ids(count: int) -> list[str]:
+    """Get the entity IDs the generated messages mention."""
+    return [f"{DOMAINS[i % len(DOMAINS)]}.device_{i}" for i in range(count)]
+
+
+@dataclass
+class LogGenerator:
+    """Generate log lines with a given seed and shape.
+
+    Entities are drawn from ``entity_ids(entities)``, with a share of
+    references to entities that do not exist, as logs often contain.
+    """
+
+    seed: int = 1
+    start: datetime = datetime(2025, 10, 9, 8, 0, 0)
+    level_weights: dict[str, int] = field(default_factory=lambda: dict(LEVEL_WEIGHTS))
+    entities: int = 2000
+    zipf_exponent: float = 1.1
+    traceback_ratio: float = 0.35
+    long_line_ratio: float = 0.03
+
+    def __post_init__(self) -> None:
+        """Prepare the distributions."""
+        self._rng = random.Random(self.seed)
+        self._levels = list(self.level_weights)
+        self._level_weights = list(self.level_weights.values())
+        self._logger_weights = [
+            1 / (rank + 1) ** self.zipf_exponent for rank in range(len(LOGGERS))
+        ]
+        self._entity_ids = entity_ids(self.entities)
+        self._time = self.start
+
+    def _fill(self, template: str) -> str:
+        """Fill the placeholders of a message template."""
+        rng = self._rng
+        entity = (
+            rng.choice(self._entity_ids)
+            if rng.random() < 0.9
+            else f"{rng.choice(DOMAINS)}.missing_{rng.randrange(100)}"
+        )
+        return template.format(
+            entity=entity,
+            domain=rng.choice(DOMAINS),
+            name=f"device_{rng.randrange(500)}",
+            ip=f"192.168.{rng.randrange(4)}.{rng.randrange(1, 255)}",
+            port=rng.choice((80, 443, 1883, 6053, 8123)),
+            url=f"https://api.example.com/v{rng.randrange(1, 3)}/devices/{rng.randrange(1000)}",
+            topic=f"zigbee2mqtt/device_{rng.randrange(200)}/state",
+            payload=f'{{"state": "ON", "linkquality": {rng.randrange(255)}}}',
+            seconds=f"{rng.random() * 12:.3f}",
+            number=rng.randrange(1000),
+            path=f"/config/packages/{rng.choice(DOMAINS)}_{rng.randrange(20)}.yaml",
+        )
+
+    def _traceback(self) -> list[str]:
+        """Build a traceback of a few frames."""
+        rng = self._rng
+        lines = ["Traceback (most recent call last):\n"]
+        for _ in range(rng.randint(3, 15)):
+            path, function = rng.choice(FRAMES)
+            lines.append(
+                f'  File "{path}", line {rng.randint(20, 2000)}, in {function}\n'
+            )
+            lines.append(f"    await self.{function}()\n")
+        lines.append(self._fill(rng.choice(EXCEPTIONS)) + "\n")
+        return lines
+
+    def records(self, count: int) -> Iterator[list[str]]:
+        """Generate records as lists of physical lines, header first."""
+        rng = self._rng
+        for _ in range(count):
+            self._time += timedelta(milliseconds=rng.expovariate(1 / 40))
+            level = rng.choices(self._levels, self._level_weights)[0]
+            logger = rng.choices(LOGGERS, self._logger_weights)[0]
+            message = self._fill(rng.choice(TEMPLATES[level]))
+            if rng.random() < self.long_line_ratio:
+                message += " " + "x" * rng.randint(200, 2000)
+            lines = [
+                f"{self._time:%Y-%m-%d %H:%M:%S}.{self._time.microsecond // 1000:03d} "
+                f"{level} ({rng.choice(THREADS)}) [{logger}] {message}\n"
+            ]
+            if level in ("ERROR", "CRITICAL") and rng.random() < self.traceback_ratio:
+                lines.extend(self._traceback())
+            yield lines
+
+    def lines(self, count: int) -> Iterator[str]:
+        """Generate the physical lines of count records."""
+        for record in self.records(count):
+            yield from record
+
+
+def main() -> None:
+    """Write a synthetic log to stdout."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100000, help="number of records")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    sys.stdout.writelines(LogGenerator(seed=args.seed).lines(args.lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,83 @@ import asyncio
 import logging
 from datetime import timedelta
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 
-from .const import CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    CONF_SCAN_INTERVAL,
+    DEFAULT_PROFILE_TOP,
+    DEFAULT_QUERY_LIMIT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TREND_DAYS,
+    DOMAIN,
+    INGEST_MODE_HANDLER,
+    LOG_LEVELS,
+    MAX_PROFILE_TOP,
+    MAX_QUERY_LIMIT,
+    MAX_TREND_DAYS,
+    SERVICE_GET_TRENDS,
+    SERVICE_PROFILE_SCAN,
+    SERVICE_QUERY_ENTRIES,
+)
+from .file_watcher import LogFileWatcher
 from .log_monitor import LogMonitor
+from .profiling import PROFILE_SORT_KEYS
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+QUERY_ENTRIES_SCHEMA = vol.Schema(
+    {
+        vol.Optional("level"): vol.In(LOG_LEVELS),
+        vol.Optional("component"): cv.string,
+        vol.Optional("entity_id"): cv.entity_id,
+        vol.Optional("device_id"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("text"): cv.string,
+        vol.Optional("cursor"): cv.string,
+        vol.Optional("limit", default=DEFAULT_QUERY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_QUERY_LIMIT)
+        ),
+        vol.Optional("count_only", default=False): cv.boolean,
+        vol.Optional("history", default=False): cv.boolean,
+    }
+)
+
+GET_TRENDS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("days", default=DEFAULT_TREND_DAYS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_TREND_DAYS)
+        ),
+        vol.Optional("level"): vol.In(LOG_LEVELS),
+        vol.Optional("component"): cv.string,
+        vol.Optional("signature"): cv.string,
+    }
+)
+
+PROFILE_SCAN_SCHEMA = vol.Schema(
+    {
+        vol.Optional("full_scan", default=False): cv.boolean,
+        vol.Optional("top", default=DEFAULT_PROFILE_TOP): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_TOP)
+        ),
+        vol.Optional("sort", default=PROFILE_SORT_KEYS[0]): vol.In(PROFILE_SORT_KEYS),
+        vol.Optional("memory", default=False): cv.boolean,
+    }
+)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -25,6 +91,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Initialize the log monitor
     log_monitor = LogMonitor(hass, entry)
     hass.data[DOMAIN][entry.entry_id] = log_monitor
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -35,6 +102,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Register services
     await async_setup_services(hass, log_monitor)
     
+    if log_monitor.ingest_mode == INGEST_MODE_HANDLER:
+        # Backfill from the log file, then receive new records as they are logged
+        await log_monitor.async_scan_logs(full_scan=True)
+        log_monitor.async_attach_handler()
+        entry.async_on_unload(log_monitor.async_detach_handler)
+        return True
+    
+    # Scan only when the log file changes if the platform supports it
+    watcher = LogFileWatcher(
+        hass,
+        log_monitor.log_file_path,
+        lambda: log_monitor.async_scan_logs(full_scan=False),
+    )
+    if await watcher.async_start():
+        _LOGGER.info("Log Debugger: Watching %s for changes", log_monitor.log_file_path)
+        entry.async_on_unload(watcher.async_stop)
+        await log_monitor.async_scan_logs(full_scan=True)
+        return True
+    
+    # Fall back to polling
     # Get scan interval from config (in seconds)
     scan_interval_seconds = entry.options.get(
         CONF_SCAN_INTERVAL,
@@ -62,6 +149,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change.
+
+    The ingest mode, scan interval, AI concurrency, history database and
+    rate sensors are set up from the options, so they change on a reload.
+    """
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -90,6 +186,24 @@ async def async_setup_services(hass: HomeAssistant, log_monitor: LogMonitor) ->
         _LOGGER.info("Manual full log scan triggered")
         await log_monitor.async_scan_logs(full_scan=True)
     
+    async def query_entries(call: ServiceCall) -> ServiceResponse:
+        """Find log entries and return them as response data."""
+        try:
+            return await log_monitor.async_query_entries(**call.data)
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+    
+    async def get_trends(call: ServiceCall) -> ServiceResponse:
+        """Return the counts of the last days from the rollups."""
+        return log_monitor.get_trends(**call.data)
+    
+    async def profile_scan(call: ServiceCall) -> ServiceResponse:
+        """Profile one log scan and return its hotspots."""
+        try:
+            return await log_monitor.async_profile_scan(**call.data)
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+    
     hass.services.async_register(
         DOMAIN, "analyze_log_entry", analyze_log_entry
     )
@@ -99,3 +213,24 @@ async def async_setup_services(hass: HomeAssistant, log_monitor: LogMonitor) ->
     hass.services.async_register(
         DOMAIN, "scan_logs_now", scan_logs_now
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_ENTRIES,
+        query_entries,
+        schema=QUERY_ENTRIES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TRENDS,
+        get_trends,
+        schema=GET_TRENDS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_SCAN,
+        profile_scan,
+        schema=PROFILE_SCAN_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
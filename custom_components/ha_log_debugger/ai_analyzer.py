@@ -1,23 +1,127 @@
 """AI-powered log analysis using Home Assistant AI Tasks."""
 from __future__ import annotations
 
+from collections import OrderedDict
+import hashlib
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    AI_CACHE_MAX_ENTRIES,
+    AI_CACHE_SAVE_DELAY,
+    AI_CACHE_STORAGE_KEY,
+    AI_CACHE_STORAGE_VERSION,
+    AI_CACHE_TTL_SECONDS,
+)
+from .signatures import normalize_message
 
 if TYPE_CHECKING:
-    from .log_monitor import LogEntry
+    from .log_entry import LogEntry
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class AIAnalysisCache:
+    """LRU cache of AI analyses with expiry, persisted across restarts.
+
+    Entries are keyed by component and normalized message, so a repeat of
+    an error that was already analyzed is answered without an AI call.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_entries: int = AI_CACHE_MAX_ENTRIES,
+        ttl: float = AI_CACHE_TTL_SECONDS,
+    ) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._store: Store[dict[str, Any]] = Store(
+            hass, AI_CACHE_STORAGE_VERSION, AI_CACHE_STORAGE_KEY
+        )
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(entry: LogEntry) -> str:
+        """Get the cache key of an entry."""
+        template = normalize_message(entry.message)
+        return hashlib.blake2b(
+            f"{entry.component}|{template}".encode(), digest_size=12
+        ).hexdigest()
+
+    async def async_load(self) -> None:
+        """Load cached analyses that have not expired."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        oldest = time.time() - self.ttl
+        for key, (created, result) in data.get("entries", {}).items():
+            if created >= oldest:
+                self._entries[key] = (created, result)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @callback
+    def async_get(self, entry: LogEntry) -> dict[str, Any] | None:
+        """Get the cached analysis of an entry."""
+        key = self.key_for(entry)
+        cached = self._entries.get(key)
+        if cached is None or cached[0] < time.time() - self.ttl:
+            if cached is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cached[1]
+
+    @callback
+    def async_contains(self, entry: LogEntry) -> bool:
+        """Check if an entry has an unexpired cached analysis."""
+        cached = self._entries.get(self.key_for(entry))
+        return cached is not None and cached[0] >= time.time() - self.ttl
+
+    @callback
+    def async_set(self, entry: LogEntry, result: dict[str, Any]) -> None:
+        """Cache the analysis of an entry."""
+        key = self.key_for(entry)
+        self._entries[key] = (time.time(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._store.async_delay_save(self._data_to_save, AI_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"entries": dict(self._entries)}
+
+    def get_statistics(self) -> dict[str, int]:
+        """Get cache counters."""
+        return {
+            "ai_cache_size": len(self._entries),
+            "ai_cache_hits": self.hits,
+            "ai_cache_misses": self.misses,
+        }
+
+
 class AIAnalyzer:
     """Analyze log entries using AI."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self, hass: HomeAssistant, cache: AIAnalysisCache | None = None
+    ) -> None:
         """Initialize the AI analyzer."""
         self.hass = hass
+        self.cache = cache
 
     async def analyze_log_entry(self, entry: LogEntry) -> dict[str, Any] | None:
         """Analyze a log entry using AI."""
@@ -42,7 +146,11 @@ class AIAnalyzer:
             )
             
             if response and "response" in response:
-                return self._parse_ai_response(response["response"].get("speech", {}).get("plain", {}).get("speech", ""))
+                result = self._parse_ai_response(response["response"].get("speech", {}).get("plain", {}).get("speech", ""))
+                # Only real AI answers are cached, never the fallback
+                if self.cache is not None:
+                    self.cache.async_set(entry, result)
+                return result
             
             return self._fallback_analysis(entry)
             
@@ -85,6 +193,10 @@ class AIAnalyzer:
         if entry.context.get("model"):
             prompt_parts.append(f"**Model:** {entry.context['model']}")
         
+        if entry.exception:
+            # The end of a traceback is the most relevant part
+            prompt_parts.append(f"**Traceback:**\n{entry.exception[-3000:]}")
+        
         prompt_parts.extend([
             "",
             "Please provide your response in the following format:",
@@ -0,0 +1,147 @@
+"""Token bucket limiting AI analysis calls."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import math
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    AI_BUDGET_SAVE_DELAY,
+    AI_BUDGET_STORAGE_KEY,
+    AI_BUDGET_STORAGE_VERSION,
+    AI_CRITICAL_RESERVE_RATIO,
+)
+
+
+class AIBudget:
+    """Token bucket for AI calls, refilled continuously over an hour.
+
+    The bucket holds up to the hourly limit and refills at limit/3600 tokens
+    per second, so no window boundary allows a burst of twice the limit. A
+    share of the capacity is reserved for CRITICAL entries. The state is
+    persisted so a restart does not hand out a fresh budget.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        get_capacity: Callable[[], int],
+        reserve_ratio: float = AI_CRITICAL_RESERVE_RATIO,
+    ) -> None:
+        """Initialize the budget."""
+        self.hass = hass
+        self._get_capacity = get_capacity
+        self.reserve_ratio = reserve_ratio
+        self._store: Store[dict[str, Any]] = Store(
+            hass, AI_BUDGET_STORAGE_VERSION, AI_BUDGET_STORAGE_KEY
+        )
+        self._tokens: float | None = None
+        self._updated = time.time()
+        self.spent = 0
+
+    @property
+    def capacity(self) -> int:
+        """Get the bucket size, the configured calls per hour."""
+        return self._get_capacity()
+
+    @property
+    def critical_reserve(self) -> int:
+        """Get the number of tokens only CRITICAL entries may use."""
+        return math.floor(self.capacity * self.reserve_ratio)
+
+    @property
+    def tokens(self) -> float:
+        """Get the current number of tokens."""
+        self._refill()
+        return self._tokens
+
+    async def async_load(self) -> None:
+        """Restore the bucket, a missing state starts full."""
+        data = await self._store.async_load()
+        if data:
+            self._tokens = data["tokens"]
+            self._updated = data["updated"]
+        self._refill()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update."""
+        capacity = self.capacity
+        now = time.time()
+        if self._tokens is None:
+            self._tokens = float(capacity)
+        else:
+            elapsed = max(0.0, now - self._updated)
+            self._tokens = min(
+                float(capacity), self._tokens + elapsed * capacity / 3600
+            )
+        self._updated = now
+
+    def _available(self, level: str) -> float:
+        """Get the tokens a level may use."""
+        if level == "CRITICAL":
+            return self.tokens
+        return self.tokens - self.critical_reserve
+
+    @callback
+    def async_can_spend(self, level: str) -> bool:
+        """Check if an AI call for this level is allowed now."""
+        return self._available(level) >= 1
+
+    @callback
+    def async_try_spend(self, level: str) -> bool:
+        """Take a token for an AI call, return False if none is available."""
+        if self._available(level) < 1:
+            return False
+        self._tokens -= 1
+        self.spent += 1
+        self._store.async_delay_save(self._data_to_save, AI_BUDGET_SAVE_DELAY)
+        return True
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        self._refill()
+        return {"tokens": self._tokens, "updated": self._updated}
+
+    def _time_until(self, tokens: float) -> datetime | None:
+        """Get when the bucket will hold the given number of tokens."""
+        capacity = self.capacity
+        current = self.tokens
+        if capacity <= 0 or tokens > capacity:
+            return None
+        seconds = max(0.0, (tokens - current) * 3600 / capacity)
+        return dt_util.utcnow() + timedelta(seconds=seconds)
+
+    @property
+    def next_token_at(self) -> datetime | None:
+        """Get when the next whole token will be available."""
+        current = self.tokens
+        if current >= self.capacity:
+            return None
+        return self._time_until(math.floor(current) + 1)
+
+    @property
+    def full_at(self) -> datetime | None:
+        """Get when the bucket will be full again."""
+        if self.tokens >= self.capacity:
+            return None
+        return self._time_until(self.capacity)
+
+    def get_statistics(self) -> dict[str, Any]:
+        """Get budget accounting."""
+        next_token = self.next_token_at
+        full = self.full_at
+        return {
+            "ai_calls_remaining": max(0, math.floor(self.tokens)),
+            "ai_tokens": round(self.tokens, 2),
+            "ai_critical_reserve": self.critical_reserve,
+            "ai_calls_spent": self.spent,
+            "ai_next_token": next_token.isoformat() if next_token else None,
+            "ai_budget_full": full.isoformat() if full else None,
+        }
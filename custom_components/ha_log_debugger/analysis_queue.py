@@ -0,0 +1,159 @@
+"""Background queue for AI analysis of log entries."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+import heapq
+import itertools
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    AI_QUEUE_MAX_AGE_SECONDS,
+    AI_QUEUE_MAX_SIZE,
+    AI_QUEUE_RETRY_SECONDS,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from .log_entry import LogEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower runs first
+LEVEL_QUEUE_PRIORITY = {"CRITICAL": 0, "ERROR": 1, "WARNING": 2}
+
+
+class AnalysisQueue:
+    """Bounded priority queue of entries waiting for AI analysis.
+
+    Entries are analyzed by a configurable number of background workers,
+    CRITICAL before ERROR before WARNING and oldest first within a level.
+    An entry whose signature is already queued is coalesced into the queued
+    one. While the AI budget is exhausted work waits, and work older than
+    the maximum age is dropped.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        analyze: Callable[[LogEntry], Coroutine[Any, Any, None]],
+        can_analyze: Callable[[LogEntry], bool],
+        max_size: int = AI_QUEUE_MAX_SIZE,
+        max_age: float = AI_QUEUE_MAX_AGE_SECONDS,
+    ) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self._analyze = analyze
+        self._can_analyze = can_analyze
+        self.max_size = max_size
+        self.max_age = max_age
+        self._heap: list[tuple[int, int, float, LogEntry]] = []
+        self._queued: set[str | None] = set()
+        self._wakeups: asyncio.Queue[None] = asyncio.Queue()
+        self._counter = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self.coalesced = 0
+        self.dropped = 0
+        self.processed = 0
+
+    def __len__(self) -> int:
+        """Return the number of queued entries."""
+        return len(self._heap)
+
+    @callback
+    def async_start(self, concurrency: int) -> None:
+        """Start the workers."""
+        for index in range(max(1, concurrency)):
+            self._workers.append(
+                self.hass.async_create_background_task(
+                    self._async_worker(), f"{DOMAIN} AI analysis worker {index}"
+                )
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the workers and drop queued work."""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers.clear()
+        self._heap.clear()
+        self._queued.clear()
+
+    @callback
+    def async_enqueue(self, entry: LogEntry) -> None:
+        """Queue an entry for analysis without waiting for it."""
+        if entry.signature in self._queued:
+            self.coalesced += 1
+            return
+
+        item = (
+            LEVEL_QUEUE_PRIORITY.get(entry.level, len(LEVEL_QUEUE_PRIORITY)),
+            next(self._counter),
+            time.monotonic(),
+            entry,
+        )
+        if len(self._heap) >= self.max_size:
+            # Make room by dropping the least important work, maybe this one
+            worst = max(self._heap, key=lambda queued: queued[:2])
+            if worst[:2] < item[:2]:
+                self.dropped += 1
+                return
+            self._heap.remove(worst)
+            heapq.heapify(self._heap)
+            self._queued.discard(worst[3].signature)
+            self.dropped += 1
+
+        heapq.heappush(self._heap, item)
+        self._queued.add(entry.signature)
+        self._wakeups.put_nowait(None)
+
+    def _drop_stale(self) -> None:
+        """Drop work that has waited longer than the maximum age."""
+        oldest = time.monotonic() - self.max_age
+        fresh = [item for item in self._heap if item[2] >= oldest]
+        if len(fresh) == len(self._heap):
+            return
+        self.dropped += len(self._heap) - len(fresh)
+        self._queued = {item[3].signature for item in fresh}
+        heapq.heapify(fresh)
+        self._heap = fresh
+
+    async def _async_worker(self) -> None:
+        """Analyze queued entries one at a time."""
+        while True:
+            await self._wakeups.get()
+            if not self._heap:
+                # The item this wakeup was for has been dropped
+                continue
+
+            item = heapq.heappop(self._heap)
+            entry = item[3]
+
+            if not self._can_analyze(entry):
+                # Budget exhausted: keep fresh work for later, drop old work
+                heapq.heappush(self._heap, item)
+                self._drop_stale()
+                if self._heap:
+                    await asyncio.sleep(AI_QUEUE_RETRY_SECONDS)
+                    self._wakeups.put_nowait(None)
+                continue
+
+            self._queued.discard(entry.signature)
+            try:
+                await self._analyze(entry)
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.error("Error analyzing log entry %s: %s", entry.entry_id, err)
+            self.processed += 1
+
+    def get_statistics(self) -> dict[str, int]:
+        """Get queue counters."""
+        return {
+            "ai_queue_size": len(self._heap),
+            "ai_queue_coalesced": self.coalesced,
+            "ai_queue_dropped": self.dropped,
+            "ai_queue_processed": self.processed,
+        }
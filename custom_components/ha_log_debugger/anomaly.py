@@ -0,0 +1,181 @@
+"""Streaming detection of bursts of log records.
+
+Only uses the standard library so it can be benchmarked without a running
+Home Assistant instance.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import math
+
+# ("component", name) or ("signature", signature)
+AnomalyKey = tuple[str, str]
+
+
+class AnomalyState:
+    """Rate baseline of one key: EWMA mean and variance of counts per interval."""
+
+    __slots__ = (
+        "component",
+        "interval",
+        "count",
+        "mean",
+        "variance",
+        "threshold",
+        "active",
+        "started",
+        "peak",
+    )
+
+    def __init__(self, component: str | None, interval: int, threshold: float) -> None:
+        """Initialize a state without history."""
+        self.component = component
+        self.interval = interval
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        # Count of the current interval that starts an anomaly
+        self.threshold = threshold
+        self.active = False
+        self.started = 0.0
+        self.peak = 0
+
+
+class AnomalyDetector:
+    """Detect when a key logs far more than its baseline.
+
+    Records are counted per interval. When an interval closes, its count
+    updates an exponentially weighted mean and variance, and the threshold
+    of the next interval is the mean plus z_score standard deviations (at
+    least one record), but never below min_count. An anomaly starts as soon
+    as the count of the current interval reaches the threshold and ends
+    with the first interval that closes below it.
+
+    State is O(1) per key and the least recently seen key is dropped
+    beyond max_keys, so memory is bounded whatever the number of distinct
+    signatures.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        ewma_intervals: int,
+        z_score: float,
+        min_count: int,
+        max_keys: int,
+    ) -> None:
+        """Initialize the detector."""
+        self.interval = interval
+        self.alpha = 2 / (ewma_intervals + 1)
+        # Beyond this many empty intervals the earlier history weighs nothing
+        self._max_decay = ewma_intervals * 4
+        self.z_score = z_score
+        self.min_count = min_count
+        self.max_keys = max_keys
+        self._states: OrderedDict[AnomalyKey, AnomalyState] = OrderedDict()
+        self._active: dict[AnomalyKey, AnomalyState] = {}
+        self._ended: list[tuple[AnomalyKey, AnomalyState]] = []
+        # No anomaly starts before this time, while baselines are built
+        self.quiet_until = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._states)
+
+    @property
+    def active(self) -> dict[AnomalyKey, AnomalyState]:
+        """Get the keys with an ongoing anomaly."""
+        return self._active
+
+    def observe(
+        self,
+        key: AnomalyKey,
+        component: str | None,
+        timestamp: float,
+        now: float,
+    ) -> AnomalyState | None:
+        """Count a record, return the state if it starts an anomaly.
+
+        Anomalies only start for records of the current or previous
+        interval and after quiet_until, so reading old records and the
+        records of a startup build baselines without alerting.
+        """
+        interval = int(timestamp // self.interval)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = AnomalyState(
+                component, interval, self.min_count
+            )
+            if len(self._states) > self.max_keys:
+                evicted_key, evicted = self._states.popitem(last=False)
+                self._end(evicted_key, evicted)
+        else:
+            self._states.move_to_end(key)
+            if interval < state.interval:
+                # Late record of a closed interval
+                return None
+            self._roll(key, state, interval)
+
+        state.count += 1
+        if state.active:
+            state.peak = max(state.peak, state.count)
+            return None
+        if (
+            state.count < state.threshold
+            or interval < int(now // self.interval) - 1
+            or now < self.quiet_until
+        ):
+            return None
+        state.active = True
+        state.started = timestamp
+        state.peak = state.count
+        self._active[key] = state
+        return state
+
+    def advance(self, now: float) -> list[tuple[AnomalyKey, AnomalyState]]:
+        """Close the intervals of active keys up to now, return ended anomalies."""
+        interval = int(now // self.interval)
+        for key, state in list(self._active.items()):
+            self._roll(key, state, interval)
+        return self.pop_ended()
+
+    def pop_ended(self) -> list[tuple[AnomalyKey, AnomalyState]]:
+        """Get and forget the anomalies that ended."""
+        ended, self._ended = self._ended, []
+        return ended
+
+    def _roll(self, key: AnomalyKey, state: AnomalyState, interval: int) -> None:
+        """Close the current interval of a key and move to a later one."""
+        if interval <= state.interval:
+            return
+        if state.active and state.count < state.threshold:
+            self._end(key, state)
+        self._update(state, state.count)
+        for _ in range(min(interval - state.interval - 1, self._max_decay)):
+            self._update(state, 0)
+        state.interval = interval
+        state.count = 0
+        state.threshold = max(
+            self.min_count,
+            state.mean + self.z_score * max(1.0, math.sqrt(state.variance)),
+        )
+
+    def _update(self, state: AnomalyState, count: int) -> None:
+        """Add the count of a closed interval to the baseline."""
+        diff = count - state.mean
+        increment = self.alpha * diff
+        state.mean += increment
+        state.variance = (1 - self.alpha) * (state.variance + diff * increment)
+
+    def _end(self, key: AnomalyKey, state: AnomalyState) -> None:
+        """End the anomaly of a key, if it has one."""
+        if state.active:
+            state.active = False
+            self._active.pop(key, None)
+            self._ended.append((key, state))
+
+    def clear(self) -> None:
+        """Forget all baselines and anomalies."""
+        self._states.clear()
+        self._active.clear()
+        self._ended.clear()
@@ -0,0 +1,78 @@
+"""Binary sensor platform for Log Debugger for Home Assistant."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, SIGNAL_STATS_UPDATED, STAT_ANOMALIES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the binary sensor platform."""
+    log_monitor = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_entities([LogDebuggerAnomalySensor(log_monitor, config_entry)])
+
+
+class LogDebuggerAnomalySensor(BinarySensorEntity):
+    """Binary sensor that is on while an integration or error logs in a burst."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_name = "Log Anomaly"
+    _attr_icon = "mdi:chart-bell-curve"
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
+        """Initialize the binary sensor."""
+        self.log_monitor = log_monitor
+        self._config_entry = config_entry
+        self._attr_unique_id = f"{config_entry.entry_id}_anomaly"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, config_entry.entry_id)},
+            "name": "Log Debugger",
+            "manufacturer": "Home Assistant Community",
+            "model": "Log Debugger",
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_STATS_UPDATED.format(self._config_entry.entry_id),
+                self._async_stats_updated,
+            )
+        )
+
+    @callback
+    def _async_stats_updated(self, changed: frozenset[str]) -> None:
+        """Write the state when anomalies start or end."""
+        if STAT_ANOMALIES in changed:
+            self.async_write_ha_state()
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if an anomaly is ongoing."""
+        return bool(self.log_monitor.anomalies.active)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the ongoing anomalies."""
+        return {"anomalies": self.log_monitor.get_anomalies()}
@@ -11,16 +11,34 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONF_AI_CONCURRENCY,
     CONF_AUTO_ANALYZE,
     CONF_EXCLUDED_INTEGRATIONS,
+    CONF_HISTORY_MAX_ENTRIES,
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_INGEST_MODE,
     CONF_LOG_LEVEL,
     CONF_MAX_AI_CALLS_PER_HOUR,
+    CONF_MAX_NOTIFICATIONS_PER_MINUTE,
+    CONF_NOTIFICATION_WINDOW,
+    CONF_PERSIST_HISTORY,
+    CONF_PINNED_COMPONENTS,
     CONF_SCAN_INTERVAL,
+    CONF_TOP_COMPONENTS,
+    DEFAULT_AI_CONCURRENCY,
     DEFAULT_AUTO_ANALYZE,
+    DEFAULT_HISTORY_MAX_ENTRIES,
+    DEFAULT_HISTORY_RETENTION_DAYS,
+    DEFAULT_INGEST_MODE,
     DEFAULT_LOG_LEVEL,
     DEFAULT_MAX_AI_CALLS,
+    DEFAULT_MAX_NOTIFICATIONS_PER_MINUTE,
+    DEFAULT_NOTIFICATION_WINDOW,
+    DEFAULT_PERSIST_HISTORY,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TOP_COMPONENTS,
     DOMAIN,
+    INGEST_MODES,
     LOG_LEVELS,
 )
 
@@ -89,12 +107,11 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
     ) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
-            # Process excluded integrations string
-            if CONF_EXCLUDED_INTEGRATIONS in user_input:
-                excluded = user_input[CONF_EXCLUDED_INTEGRATIONS]
-                if isinstance(excluded, str):
-                    user_input[CONF_EXCLUDED_INTEGRATIONS] = [
-                        x.strip() for x in excluded.split(",") if x.strip()
+            # Process excluded and pinned integrations strings
+            for key in (CONF_EXCLUDED_INTEGRATIONS, CONF_PINNED_COMPONENTS):
+                if key in user_input and isinstance(user_input[key], str):
+                    user_input[key] = [
+                        x.strip() for x in user_input[key].split(",") if x.strip()
                     ]
             
             return self.async_create_entry(title="", data=user_input)
@@ -111,10 +128,47 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             CONF_MAX_AI_CALLS_PER_HOUR,
             self._entry.data.get(CONF_MAX_AI_CALLS_PER_HOUR, DEFAULT_MAX_AI_CALLS),
         )
+        current_ai_concurrency = self._entry.options.get(
+            CONF_AI_CONCURRENCY,
+            self._entry.data.get(CONF_AI_CONCURRENCY, DEFAULT_AI_CONCURRENCY),
+        )
         current_scan_interval = self._entry.options.get(
             CONF_SCAN_INTERVAL,
             self._entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
         )
+        current_ingest_mode = self._entry.options.get(
+            CONF_INGEST_MODE,
+            self._entry.data.get(CONF_INGEST_MODE, DEFAULT_INGEST_MODE),
+        )
+        current_notification_window = self._entry.options.get(
+            CONF_NOTIFICATION_WINDOW,
+            self._entry.data.get(CONF_NOTIFICATION_WINDOW, DEFAULT_NOTIFICATION_WINDOW),
+        )
+        current_max_notifications = self._entry.options.get(
+            CONF_MAX_NOTIFICATIONS_PER_MINUTE,
+            self._entry.data.get(
+                CONF_MAX_NOTIFICATIONS_PER_MINUTE, DEFAULT_MAX_NOTIFICATIONS_PER_MINUTE
+            ),
+        )
+        current_persist_history = self._entry.options.get(
+            CONF_PERSIST_HISTORY,
+            self._entry.data.get(CONF_PERSIST_HISTORY, DEFAULT_PERSIST_HISTORY),
+        )
+        current_retention_days = self._entry.options.get(
+            CONF_HISTORY_RETENTION_DAYS,
+            self._entry.data.get(
+                CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS
+            ),
+        )
+        current_history_max_entries = self._entry.options.get(
+            CONF_HISTORY_MAX_ENTRIES,
+            self._entry.data.get(CONF_HISTORY_MAX_ENTRIES, DEFAULT_HISTORY_MAX_ENTRIES),
+        )
+        current_top_components = self._entry.options.get(
+            CONF_TOP_COMPONENTS,
+            self._entry.data.get(CONF_TOP_COMPONENTS, DEFAULT_TOP_COMPONENTS),
+        )
+        current_pinned = self._entry.options.get(CONF_PINNED_COMPONENTS, [])
         current_excluded = self._entry.options.get(
             CONF_EXCLUDED_INTEGRATIONS, []
         )
@@ -133,9 +187,37 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Optional(
                         CONF_MAX_AI_CALLS_PER_HOUR, default=current_max_calls
                     ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                    vol.Optional(
+                        CONF_AI_CONCURRENCY, default=current_ai_concurrency
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=5)),
                     vol.Optional(
                         CONF_SCAN_INTERVAL, default=current_scan_interval
                     ): vol.All(vol.Coerce(int), vol.Range(min=10, max=300)),
+                    vol.Optional(
+                        CONF_INGEST_MODE, default=current_ingest_mode
+                    ): vol.In(INGEST_MODES),
+                    vol.Optional(
+                        CONF_NOTIFICATION_WINDOW, default=current_notification_window
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_MAX_NOTIFICATIONS_PER_MINUTE,
+                        default=current_max_notifications,
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                    vol.Optional(
+                        CONF_PERSIST_HISTORY, default=current_persist_history
+                    ): bool,
+                    vol.Optional(
+                        CONF_HISTORY_RETENTION_DAYS, default=current_retention_days
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=365)),
+                    vol.Optional(
+                        CONF_HISTORY_MAX_ENTRIES, default=current_history_max_entries
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1000, max=1000000)),
+                    vol.Optional(
+                        CONF_TOP_COMPONENTS, default=current_top_components
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=20)),
+                    vol.Optional(
+                        CONF_PINNED_COMPONENTS, default=", ".join(current_pinned)
+                    ): str,
                     vol.Optional(
                         CONF_EXCLUDED_INTEGRATIONS, default=excluded_str
                     ): str,
@@ -8,16 +8,38 @@ CONF_AUTO_ANALYZE = "auto_analyze"
 CONF_MAX_AI_CALLS_PER_HOUR = "max_ai_calls_per_hour"
 CONF_EXCLUDED_INTEGRATIONS = "excluded_integrations"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_INGEST_MODE = "ingest_mode"
+CONF_AI_CONCURRENCY = "ai_concurrency"
+CONF_NOTIFICATION_WINDOW = "notification_window"
+CONF_MAX_NOTIFICATIONS_PER_MINUTE = "max_notifications_per_minute"
+CONF_PERSIST_HISTORY = "persist_history"
+CONF_HISTORY_RETENTION_DAYS = "history_retention_days"
+CONF_HISTORY_MAX_ENTRIES = "history_max_entries"
+CONF_TOP_COMPONENTS = "top_components"
+CONF_PINNED_COMPONENTS = "pinned_components"
 
 # Default values
 DEFAULT_LOG_LEVEL = "WARNING"
 DEFAULT_AUTO_ANALYZE = False
 DEFAULT_MAX_AI_CALLS = 10
 DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_INGEST_MODE = "file"
+DEFAULT_AI_CONCURRENCY = 1
+DEFAULT_NOTIFICATION_WINDOW = 60
+DEFAULT_MAX_NOTIFICATIONS_PER_MINUTE = 5
+DEFAULT_PERSIST_HISTORY = False
+DEFAULT_HISTORY_RETENTION_DAYS = 30
+DEFAULT_HISTORY_MAX_ENTRIES = 100000
+DEFAULT_TOP_COMPONENTS = 5
 
 # Log levels
 LOG_LEVELS = ["WARNING", "ERROR", "CRITICAL"]
 
+# Ingest modes: poll home-assistant.log, or receive records from the logging system
+INGEST_MODE_FILE = "file"
+INGEST_MODE_HANDLER = "handler"
+INGEST_MODES = [INGEST_MODE_FILE, INGEST_MODE_HANDLER]
+
 # Attributes
 ATTR_ENTRY_ID = "entry_id"
 ATTR_TIMESTAMP = "timestamp"
@@ -34,6 +56,100 @@ ATTR_SUGGESTED_FIX = "suggested_fix"
 SERVICE_ANALYZE_LOG = "analyze_log_entry"
 SERVICE_CLEAR_LOGS = "clear_analyzed_logs"
 SERVICE_SCAN_NOW = "scan_logs_now"
+SERVICE_QUERY_ENTRIES = "query_entries"
+SERVICE_GET_TRENDS = "get_trends"
+SERVICE_PROFILE_SCAN = "profile_scan"
+
+# Page size of query_entries
+DEFAULT_QUERY_LIMIT = 50
+MAX_QUERY_LIMIT = 500
 
 # Log scanning limits
 MAX_LOG_LINES_FULL_SCAN = 5000
+
+# Number of entries kept in the history
+MAX_LOG_ENTRIES = 1000
+
+# Maximum number of log records waiting to be processed in handler mode
+MAX_QUEUED_RECORDS = 10000
+
+# Delay used to coalesce bursts of log file change events
+WATCH_DEBOUNCE_SECONDS = 0.05
+# Scans triggered by file changes start at most this often
+WATCH_MIN_INTERVAL_SECONDS = 0.1
+
+# Signature-level deduplication
+MAX_SIGNATURES = 1000
+SIGNATURE_SAMPLES = 5
+
+# Persistent history database in the config directory
+HISTORY_DB_FILE = f"{DOMAIN}.db"
+HISTORY_PRUNE_INTERVAL_SECONDS = 3600
+
+# Per-component rates: one-minute buckets for the last hour, the window of
+# the per-minute rate sensors and the size of the noisiest list
+RATE_BUCKET_MINUTES = 60
+MAX_RATE_COMPONENTS = 200
+RATE_SENSOR_MINUTES = 5
+NOISIEST_COMPONENTS = 10
+
+# Counts rolled up by (seconds, retained buckets): two hours of minutes, a
+# week of hours and a year of days, checkpointed every few minutes
+ROLLUP_STORAGE_KEY = f"{DOMAIN}.rollups"
+ROLLUP_STORAGE_VERSION = 1
+ROLLUP_TIERS = ((60, 120), (3600, 168), (86400, 366))
+ROLLUP_MAX_KEYS = 200
+ROLLUP_SAVE_INTERVAL_SECONDS = 300
+
+# get_trends covers up to a year, by hour up to a week and by day beyond
+DEFAULT_TREND_DAYS = 7
+MAX_TREND_DAYS = 366
+TREND_HOURLY_MAX_DAYS = 7
+TREND_TOP_COUNT = 10
+
+# Profiling of scans on demand, files are kept in this directory of the
+# configuration directory
+PROFILE_DIRECTORY = "ha_log_debugger_profiles"
+PROFILE_MAX_FILES = 10
+DEFAULT_PROFILE_TOP = 20
+MAX_PROFILE_TOP = 100
+
+# Burst detection: per-minute counts compared to an EWMA baseline of about
+# an hour, for each component and signature
+EVENT_ANOMALY = f"{DOMAIN}_anomaly"
+ANOMALY_INTERVAL_SECONDS = 60
+ANOMALY_EWMA_INTERVALS = 60
+ANOMALY_Z_SCORE = 4.0
+ANOMALY_MIN_COUNT = 10
+MAX_ANOMALY_KEYS = 2000
+ANOMALY_STARTUP_GRACE_SECONDS = 600
+
+# Notifications kept in memory for coalescing repeats
+MAX_NOTIFICATION_BATCHES = 200
+
+# Persistent cache of AI analyses, keyed by component and message template
+AI_CACHE_STORAGE_KEY = f"{DOMAIN}.ai_cache"
+AI_CACHE_STORAGE_VERSION = 1
+AI_CACHE_MAX_ENTRIES = 500
+AI_CACHE_TTL_SECONDS = 7 * 24 * 3600
+AI_CACHE_SAVE_DELAY = 30
+
+# Background AI analysis queue
+AI_QUEUE_MAX_SIZE = 50
+AI_QUEUE_MAX_AGE_SECONDS = 600
+AI_QUEUE_RETRY_SECONDS = 60
+
+# Token bucket for AI calls
+AI_BUDGET_STORAGE_KEY = f"{DOMAIN}.ai_budget"
+AI_BUDGET_STORAGE_VERSION = 1
+AI_BUDGET_SAVE_DELAY = 10
+AI_CRITICAL_RESERVE_RATIO = 0.2
+
+# Dispatcher signal sent with the names of the changed statistics, formatted
+# with the config entry ID
+SIGNAL_STATS_UPDATED = f"{DOMAIN}_stats_updated_{{}}"
+STAT_LAST_ERROR = "last_error"
+STAT_AI_BUDGET = "ai_budget"
+STAT_RATES = "rates"
+STAT_ANOMALIES = "anomalies"
+STAT_METRICS = "metrics"
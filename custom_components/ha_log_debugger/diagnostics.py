@@ -0,0 +1,37 @@
+"""Diagnostics support for Log Debugger for Home Assistant."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the stage timings, counters and sizes of the log monitor."""
+    log_monitor = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "data": dict(entry.data),
+        "options": dict(entry.options),
+        "ingest_mode": log_monitor.ingest_mode,
+        "history_enabled": log_monitor.history is not None,
+        "reader": {
+            "path": str(log_monitor.log_file_path),
+            "position": log_monitor.reader.position,
+            "pending_bytes": log_monitor.reader.pending_bytes,
+        },
+        "metrics": log_monitor.metrics.as_dict(),
+        "statistics": log_monitor.get_statistics(),
+        "sizes": {
+            "entries": len(log_monitor.log_entries),
+            "signatures": len(log_monitor.signatures),
+            "rate_components": len(log_monitor.rates),
+            "anomaly_keys": len(log_monitor.anomalies),
+            "rollup_keys": len(log_monitor.rollups),
+        },
+        "anomalies": log_monitor.get_anomalies(),
+    }
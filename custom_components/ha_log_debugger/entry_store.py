@@ -0,0 +1,263 @@
+"""Bounded entry history with constant-time lookup by ID.
+
+Only uses the standard library so it can be benchmarked without a running
+Home Assistant instance.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Hashable, Iterator
+from datetime import datetime
+import hashlib
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from .line_parser import LEVEL_PRIORITY
+
+if TYPE_CHECKING:
+    from .log_entry import LogEntry
+
+Index = dict[Hashable, deque["LogEntry"]]
+
+
+def make_entry_id(header: str) -> str:
+    """Get the ID of the record starting with a log header line.
+
+    The header holds the millisecond timestamp, level, thread, logger and
+    first message line, so the ID identifies the record. It is a digest
+    rather than Python's hash(), which is randomized per process, so a
+    record keeps its ID across restarts and ingest modes.
+    """
+    return hashlib.blake2b(
+        header.rstrip("\n").encode(), digest_size=10
+    ).hexdigest()
+
+
+def _add(index: Index, key: Hashable, entry: LogEntry) -> None:
+    """Add an entry to a secondary index."""
+    entries = index.get(key)
+    if entries is None:
+        entries = index[key] = deque()
+    entries.append(entry)
+
+
+def _remove_oldest(index: Index, key: Hashable) -> None:
+    """Remove the oldest entry of a key from a secondary index."""
+    entries = index[key]
+    entries.popleft()
+    if not entries:
+        del index[key]
+
+
+class EntryStore:
+    """Ring buffer of the most recent entries, indexed by entry ID.
+
+    The index is updated together with the buffer on append and eviction,
+    so lookups stay O(1) whatever the size of the buffer. Secondary indexes
+    by level and component hold each key's entries in history order, so the
+    oldest entry of a key is at the front when it is evicted. Entities and
+    devices are only known after enrichment, so entries are added to those
+    indexes the first time a query filters on them.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        """Initialize the store."""
+        self.maxlen = maxlen
+        self._entries: deque[LogEntry] = deque()
+        self._index: dict[str, LogEntry] = {}
+        self._by_level: Index = {}
+        self._by_component: Index = {}
+        self._by_entity: Index = {}
+        self._by_device: Index = {}
+        # Newest entries not yet in the entity and device indexes, oldest first
+        self._unindexed: deque[LogEntry] = deque()
+        self._next_seq = 1
+
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        """Iterate from the oldest to the newest entry."""
+        return iter(self._entries)
+
+    def __contains__(self, entry_id: object) -> bool:
+        """Check if an entry with this ID is stored."""
+        return entry_id in self._index
+
+    def get(self, entry_id: str) -> LogEntry | None:
+        """Get an entry by its ID."""
+        return self._index.get(entry_id)
+
+    def append(self, entry: LogEntry) -> LogEntry | None:
+        """Store an entry, return the entry evicted to make room for it."""
+        evicted = None
+        if len(self._entries) >= self.maxlen:
+            evicted = self._entries.popleft()
+            # Only remove the index item if it still points at this entry
+            if self._index.get(evicted.entry_id) is evicted:
+                del self._index[evicted.entry_id]
+            self._unindex(evicted)
+        entry.seq = self._next_seq
+        self._next_seq += 1
+        self._entries.append(entry)
+        self._index[entry.entry_id] = entry
+        _add(self._by_level, entry.level_priority, entry)
+        _add(self._by_component, entry.component, entry)
+        self._unindexed.append(entry)
+        return evicted
+
+    def _unindex(self, evicted: LogEntry) -> None:
+        """Remove the evicted oldest entry from the secondary indexes."""
+        _remove_oldest(self._by_level, evicted.level_priority)
+        _remove_oldest(self._by_component, evicted.component)
+        if self._unindexed and self._unindexed[0] is evicted:
+            self._unindexed.popleft()
+            return
+        for entity_id in evicted.entity_ids:
+            _remove_oldest(self._by_entity, entity_id)
+        if evicted.device_id is not None:
+            _remove_oldest(self._by_device, evicted.device_id)
+
+    def _index_entities(self) -> None:
+        """Add the entries not indexed yet to the entity and device indexes."""
+        while self._unindexed:
+            entry = self._unindexed.popleft()
+            for entity_id in entry.entity_ids:
+                _add(self._by_entity, entity_id, entry)
+            if entry.device_id is not None:
+                _add(self._by_device, entry.device_id, entry)
+
+    def recent(self, count: int) -> list[LogEntry]:
+        """Get up to count of the newest entries, oldest first."""
+        if count <= 0:
+            return []
+        newest = list(islice(reversed(self._entries), count))
+        newest.reverse()
+        return newest
+
+    def query(
+        self,
+        *,
+        level: str | None = None,
+        component: str | None = None,
+        entity_id: str | None = None,
+        device_id: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        text: str | None = None,
+        before: int | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[LogEntry], int | None]:
+        """Find entries, newest first.
+
+        Candidates come from the smallest secondary index of the filters
+        given and only they are checked against the other filters. The
+        returned cursor is passed as ``before`` to get the next page, it is
+        None when there are no more entries. Repeats are not stored, an entry
+        matches ``start`` if it or a repeat of it was logged at or after it.
+        """
+        matches = self._matches(
+            level, component, entity_id, device_id, start, end, text, before
+        )
+        if limit is None:
+            return list(matches), None
+        entries = list(islice(matches, limit + 1))
+        if len(entries) > limit:
+            return entries[:limit], entries[limit - 1].seq
+        return entries, None
+
+    def count(
+        self,
+        *,
+        level: str | None = None,
+        component: str | None = None,
+        entity_id: str | None = None,
+        device_id: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        text: str | None = None,
+    ) -> int:
+        """Count matching entries."""
+        keys = (level, component, entity_id, device_id)
+        if sum(key is not None for key in keys) <= 1 and not (start or end or text):
+            # The candidates are exactly the matches
+            return len(self._candidates(*keys))
+        return sum(
+            1 for _ in self._matches(*keys, start, end, text, None)
+        )
+
+    def _candidates(
+        self,
+        level: str | None,
+        component: str | None,
+        entity_id: str | None,
+        device_id: str | None,
+    ) -> deque[LogEntry]:
+        """Get the smallest index that holds all matches, oldest first."""
+        if entity_id is not None or device_id is not None:
+            self._index_entities()
+
+        filters: list[tuple[Index, Hashable]] = []
+        if level is not None:
+            filters.append((self._by_level, LEVEL_PRIORITY.get(level)))
+        if component is not None:
+            filters.append((self._by_component, component))
+        if entity_id is not None:
+            filters.append((self._by_entity, entity_id))
+        if device_id is not None:
+            filters.append((self._by_device, device_id))
+
+        indexes: list[deque[LogEntry]] = []
+        for index, key in filters:
+            entries = index.get(key)
+            if entries is None:
+                return deque()
+            indexes.append(entries)
+        return min(indexes, key=len) if indexes else self._entries
+
+    def _matches(
+        self,
+        level: str | None,
+        component: str | None,
+        entity_id: str | None,
+        device_id: str | None,
+        start: datetime | None,
+        end: datetime | None,
+        text: str | None,
+        before: int | None,
+    ) -> Iterator[LogEntry]:
+        """Yield matching entries, newest first."""
+        candidates = self._candidates(level, component, entity_id, device_id)
+        skip = 0
+        if before is not None:
+            # Sequence numbers increase along every index
+            skip = len(candidates) - bisect_left(
+                candidates, before, key=lambda entry: entry.seq
+            )
+        priority = None if level is None else LEVEL_PRIORITY.get(level)
+        text = text.lower() if text else None
+
+        for entry in islice(reversed(candidates), skip, None):
+            if (
+                (priority is not None and entry.level_priority != priority)
+                or (component is not None and entry.component != component)
+                or (entity_id is not None and entity_id not in entry.entity_ids)
+                or (device_id is not None and entry.device_id != device_id)
+                or (start is not None and entry.last_seen < start)
+                or (end is not None and entry.timestamp > end)
+                or (text is not None and text not in entry.message.lower())
+            ):
+                continue
+            yield entry
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._index.clear()
+        self._by_level.clear()
+        self._by_component.clear()
+        self._by_entity.clear()
+        self._by_device.clear()
+        self._unindexed.clear()
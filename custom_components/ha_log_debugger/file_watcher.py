@@ -0,0 +1,192 @@
+"""Event-driven log file watching using Linux inotify."""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+import ctypes
+import ctypes.util
+import logging
+import os
+from pathlib import Path
+import struct
+import sys
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, WATCH_DEBOUNCE_SECONDS, WATCH_MIN_INTERVAL_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    """Load the C library if it provides inotify (blocking)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL("libc.so.6", use_errno=True)
+    except OSError:
+        name = ctypes.util.find_library("c")
+        if name is None:
+            return None
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+        except OSError:
+            return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class LogFileWatcher:
+    """Trigger a callback when the log file changes.
+
+    The file itself is watched for writes, moves and deletion, and its
+    directory for a new file appearing under the same name after rotation.
+    Bursts of events are coalesced into one callback per debounce window,
+    and callbacks are at least min_interval apart, so a log that is written
+    continuously is read in batches rather than line by line.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: Path,
+        on_change: Callable[[], Coroutine[Any, Any, None]],
+        debounce: float = WATCH_DEBOUNCE_SECONDS,
+        min_interval: float = WATCH_MIN_INTERVAL_SECONDS,
+    ) -> None:
+        """Initialize the watcher."""
+        self.hass = hass
+        self.path = path
+        self._on_change = on_change
+        self._debounce = debounce
+        self._min_interval = min_interval
+        self._last_fire: float | None = None
+        self._libc: ctypes.CDLL | None = None
+        self._fd: int | None = None
+        self._dir_wd = -1
+        self._file_wd = -1
+        self._pending: Any = None
+        self.events = 0
+        self.triggers = 0
+
+    async def async_start(self) -> bool:
+        """Start watching, return False if inotify is not available."""
+        try:
+            await self.hass.async_add_executor_job(self._setup)
+        except OSError as err:
+            _LOGGER.debug("inotify not available: %s", err)
+            self._close()
+            return False
+
+        if self._fd is None:
+            return False
+
+        self.hass.loop.add_reader(self._fd, self._read_events)
+        return True
+
+    def async_stop(self) -> None:
+        """Stop watching."""
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        if self._fd is not None:
+            self.hass.loop.remove_reader(self._fd)
+        self._close()
+
+    def _setup(self) -> None:
+        """Create the inotify instance and watches (runs in executor)."""
+        self._libc = _load_libc()
+        if self._libc is None:
+            return
+
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+
+        self._dir_wd = self._add_watch(self.path.parent, IN_CREATE | IN_MOVED_TO)
+        if self._dir_wd < 0:
+            raise OSError(ctypes.get_errno(), "Cannot watch config directory")
+        self._watch_file()
+
+    def _close(self) -> None:
+        """Close the inotify instance."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _add_watch(self, path: Path, mask: int) -> int:
+        """Add a watch and return its descriptor, negative on failure."""
+        return self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+
+    def _watch_file(self) -> None:
+        """Watch the current log file, replacing a previous file watch."""
+        if self._file_wd >= 0:
+            self._libc.inotify_rm_watch(self._fd, self._file_wd)
+        self._file_wd = self._add_watch(
+            self.path, IN_MODIFY | IN_MOVE_SELF | IN_DELETE_SELF
+        )
+
+    def _read_events(self) -> None:
+        """Read pending inotify events (runs in event loop, never blocks)."""
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as err:
+            _LOGGER.error("Error reading inotify events: %s", err)
+            return
+
+        changed = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size : offset + _EVENT_HEADER.size + name_len]
+            offset += _EVENT_HEADER.size + name_len
+            self.events += 1
+
+            if mask & IN_IGNORED:
+                continue
+            if wd == self._dir_wd:
+                if name.rstrip(b"\0") == os.fsencode(self.path.name):
+                    # A new file took the name, follow it
+                    self._watch_file()
+                    changed = True
+            elif wd == self._file_wd:
+                changed = True
+
+        if changed:
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """Schedule the callback after the debounce window."""
+        if self._pending is None:
+            delay = self._debounce
+            if self._last_fire is not None:
+                delay = max(
+                    delay, self._last_fire + self._min_interval - self.hass.loop.time()
+                )
+            self._pending = self.hass.loop.call_later(delay, self._fire)
+
+    def _fire(self) -> None:
+        """Run the callback."""
+        self._pending = None
+        self._last_fire = self.hass.loop.time()
+        self.triggers += 1
+        self.hass.async_create_background_task(
+            self._on_change(), f"{DOMAIN} log file changed"
+        )
@@ -0,0 +1,334 @@
+"""Persistent entry history in a SQLite database.
+
+Only uses the standard library so it can be benchmarked without a running
+Home Assistant instance. Every method is blocking and must run in the
+executor.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from .log_entry import LEVEL_NAMES, LogEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+# Identical records logged in the same millisecond share an entry ID, so
+# every occurrence gets a row ID of its own
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    entry_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    level INTEGER NOT NULL,
+    component TEXT,
+    signature TEXT,
+    message TEXT NOT NULL,
+    exception TEXT,
+    ai_analysis TEXT,
+    suggested_fix TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_entries_entry_id ON entries (entry_id);
+CREATE INDEX IF NOT EXISTS ix_entries_timestamp ON entries (timestamp);
+CREATE INDEX IF NOT EXISTS ix_entries_level ON entries (level, timestamp);
+CREATE INDEX IF NOT EXISTS ix_entries_component ON entries (component, timestamp);
+CREATE INDEX IF NOT EXISTS ix_entries_signature ON entries (signature, timestamp);
+"""
+
+# Version 1 keyed the rows by entry ID, its indexes are dropped with the
+# renamed table but their names must be free for the new ones first
+_MIGRATE_FROM_1 = f"""
+BEGIN;
+DROP INDEX IF EXISTS ix_entries_timestamp;
+DROP INDEX IF EXISTS ix_entries_level;
+DROP INDEX IF EXISTS ix_entries_component;
+DROP INDEX IF EXISTS ix_entries_signature;
+ALTER TABLE entries RENAME TO entries_v1;
+{_SCHEMA}
+INSERT INTO entries (
+    entry_id, timestamp, level, component, signature, message, exception,
+    ai_analysis, suggested_fix
+)
+SELECT
+    entry_id, timestamp, level, component, signature, message, exception,
+    ai_analysis, suggested_fix
+FROM entries_v1 ORDER BY rowid;
+DROP TABLE entries_v1;
+COMMIT;
+"""
+
+_COLUMNS = (
+    "entry_id, timestamp, level, component, signature, message, exception, "
+    "ai_analysis, suggested_fix"
+)
+
+Row = tuple[Any, ...]
+
+
+def entry_to_row(entry: LogEntry) -> Row:
+    """Convert an entry to a database row, without running its enrichment."""
+    return (
+        entry.entry_id,
+        entry.timestamp.timestamp(),
+        entry.level_priority,
+        entry.component,
+        entry.signature,
+        entry.message,
+        entry.exception,
+        entry.ai_analysis,
+        entry.suggested_fix,
+    )
+
+
+def row_to_entry(
+    row: Row, enricher: Callable[[LogEntry], None] | None = None
+) -> LogEntry:
+    """Rebuild an entry from a database row."""
+    (
+        entry_id,
+        timestamp,
+        level,
+        component,
+        signature,
+        message,
+        exception,
+        ai_analysis,
+        suggested_fix,
+    ) = row
+    entry = LogEntry(
+        entry_id=entry_id,
+        timestamp=datetime.fromtimestamp(timestamp),
+        level=LEVEL_NAMES[level],
+        message=message,
+        component=component,
+        exception=exception,
+        enricher=enricher,
+    )
+    entry.signature = signature
+    if ai_analysis is not None or suggested_fix is not None:
+        entry.ai_analysis = ai_analysis
+        entry.suggested_fix = suggested_fix
+        entry.analyzed = True
+    return entry
+
+
+def _where(
+    level: int | None,
+    component: str | None,
+    start: datetime | None,
+    end: datetime | None,
+    text: str | None,
+    before: tuple[float, int] | None = None,
+) -> tuple[str, list[Any]]:
+    """Build the WHERE clause of a query."""
+    clauses: list[str] = []
+    params: list[Any] = []
+    if level is not None:
+        clauses.append("level = ?")
+        params.append(level)
+    if component is not None:
+        clauses.append("component = ?")
+        params.append(component)
+    if start is not None:
+        clauses.append("timestamp >= ?")
+        params.append(start.timestamp())
+    if end is not None:
+        clauses.append("timestamp <= ?")
+        params.append(end.timestamp())
+    if text:
+        clauses.append("instr(lower(message), ?) > 0")
+        params.append(text.lower())
+    if before is not None:
+        clauses.append("(timestamp < ? OR (timestamp = ? AND rowid < ?))")
+        params.extend((before[0], before[0], before[1]))
+    if not clauses:
+        return "", params
+    return " WHERE " + " AND ".join(clauses), params
+
+
+class HistoryStore:
+    """Every occurrence of monitored log records, kept in SQLite.
+
+    Rows are indexed by timestamp, level, component and signature, written
+    in batches and pruned by age and row count. The connection is shared by
+    executor threads and serialized with a lock.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the store."""
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        """Open the database, creating the schema if needed."""
+        connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(
+                    f"{self.path} has schema version {version}, "
+                    f"this version supports up to {SCHEMA_VERSION}"
+                )
+            if version == 1:
+                _LOGGER.info("Migrating %s to schema version %d", self.path, SCHEMA_VERSION)
+                connection.executescript(_MIGRATE_FROM_1)
+            else:
+                connection.executescript(_SCHEMA)
+            connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        except Exception:
+            # A corrupt or newer database must not leave the file open
+            connection.close()
+            raise
+        self._connection = connection
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def write(
+        self,
+        rows: Iterable[Row],
+        analyses: Iterable[tuple[str, str | None, str | None]] = (),
+    ) -> None:
+        """Insert occurrences and store analyses in one transaction.
+
+        Every row is inserted, the caller skips records it wrote before.
+        Analyses are (entry_id, ai_analysis, suggested_fix) tuples.
+        """
+        with self._lock:
+            connection = self._require_connection()
+            with connection:
+                connection.execute("BEGIN")
+                connection.executemany(
+                    f"INSERT INTO entries ({_COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                connection.executemany(
+                    "UPDATE entries SET ai_analysis = ?, suggested_fix = ? "
+                    "WHERE entry_id = ?",
+                    [(analysis, fix, entry_id) for entry_id, analysis, fix in analyses],
+                )
+
+    def get(self, entry_id: str) -> Row | None:
+        """Get the row of an entry."""
+        with self._lock:
+            return (
+                self._require_connection()
+                .execute(f"SELECT {_COLUMNS} FROM entries WHERE entry_id = ?", (entry_id,))
+                .fetchone()
+            )
+
+    def newest(self) -> tuple[float, dict[str, int]] | None:
+        """Get the newest row time and how many rows each entry ID has then."""
+        with self._lock:
+            rows = self._require_connection().execute(
+                "SELECT timestamp, entry_id, COUNT(*) FROM entries "
+                "WHERE timestamp = (SELECT MAX(timestamp) FROM entries) "
+                "GROUP BY entry_id"
+            ).fetchall()
+        if not rows:
+            return None
+        return rows[0][0], {entry_id: count for _, entry_id, count in rows}
+
+    def count(
+        self,
+        *,
+        level: int | None = None,
+        component: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        text: str | None = None,
+    ) -> int:
+        """Count the rows matching the filters."""
+        where, params = _where(level, component, start, end, text)
+        with self._lock:
+            return self._require_connection().execute(
+                f"SELECT COUNT(*) FROM entries{where}", params
+            ).fetchone()[0]
+
+    def query(
+        self,
+        *,
+        level: int | None = None,
+        component: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        text: str | None = None,
+        before: tuple[float, int] | None = None,
+        limit: int = 50,
+    ) -> tuple[list[Row], tuple[float, int] | None]:
+        """Find rows, newest first, using the indexes of the filters.
+
+        Pass the returned cursor as ``before`` to get the next page, it is
+        None when there are no more rows.
+        """
+        where, params = _where(level, component, start, end, text, before)
+        with self._lock:
+            rows = self._require_connection().execute(
+                f"SELECT timestamp, rowid, {_COLUMNS} FROM entries{where} "
+                "ORDER BY timestamp DESC, rowid DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            cursor = (rows[-1][0], rows[-1][1])
+        return [row[2:] for row in rows], cursor
+
+    def prune(self, max_age_days: float, max_rows: int) -> int:
+        """Delete rows older than the maximum age and the oldest beyond max_rows.
+
+        Returns the number of deleted rows.
+        """
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            connection = self._require_connection()
+            with connection:
+                connection.execute("BEGIN")
+                deleted = connection.execute(
+                    "DELETE FROM entries WHERE timestamp < ?", (cutoff,)
+                ).rowcount
+                # The timestamp of the newest row that no longer fits
+                first_dropped = connection.execute(
+                    "SELECT timestamp FROM entries ORDER BY timestamp DESC "
+                    "LIMIT 1 OFFSET ?",
+                    (max_rows,),
+                ).fetchone()
+                if first_dropped is not None:
+                    deleted += connection.execute(
+                        "DELETE FROM entries WHERE timestamp <= ?", first_dropped
+                    ).rowcount
+        if deleted:
+            _LOGGER.debug("Pruned %d rows from %s", deleted, self.path)
+        return deleted
+
+    def clear(self) -> None:
+        """Delete all rows."""
+        with self._lock:
+            connection = self._require_connection()
+            with connection:
+                connection.execute("BEGIN")
+                connection.execute("DELETE FROM entries")
+
+    def _require_connection(self) -> sqlite3.Connection:
+        """Get the connection, the store must be open."""
+        if self._connection is None:
+            raise RuntimeError(f"{self.path} is not open")
+        return self._connection
@@ -0,0 +1,142 @@
+"""Fast parser for Home Assistant log header lines.
+
+Only uses the standard library so it can be benchmarked without a running
+Home Assistant instance.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+import re
+
+# Priority of the levels that can be monitored, anything else is ignored
+LEVEL_PRIORITY = {"WARNING": 1, "ERROR": 2, "CRITICAL": 3}
+
+# Upper bound for the logger name to component cache
+_MAX_CACHED_LOGGERS = 4096
+
+# Used when a header does not have the expected fixed layout
+# Format: YYYY-MM-DD HH:MM:SS[.mmm] LEVEL (thread) [logger] message
+_HEADER_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})(?:\.(\d+))?\s+(\w+)\s+\(([^)]+)\)\s+\[([^\]]+)\]\s+(.+)$"
+)
+
+
+def component_from_logger(logger_name: str) -> str:
+    """Get the integration a logger belongs to from its name."""
+    if logger_name.startswith("homeassistant.components."):
+        return logger_name.split(".", 3)[2]
+    if logger_name.startswith("custom_components."):
+        return ".".join(logger_name.split(".", 2)[:2])
+    return logger_name.split(".", 1)[0]
+
+
+class LogLineParser:
+    """Parse header lines, rejecting unwanted lines as early as possible.
+
+    The level is sliced from its fixed offset right after the timestamp and
+    checked before anything else, then the logger name is located and
+    excluded integrations are dropped. Only lines that are kept pay for
+    timestamp parsing, which is cached per second. A parser is built for one
+    configuration; create a new one when the options change.
+    """
+
+    def __init__(self, min_level: str, excluded: Iterable[str] = ()) -> None:
+        """Initialize the parser."""
+        self._min_priority = LEVEL_PRIORITY.get(min_level, 1)
+        # Accepted levels with their trailing space, checked with one startswith()
+        self._level_prefixes = tuple(
+            f"{level} "
+            for level, priority in LEVEL_PRIORITY.items()
+            if priority >= self._min_priority
+        )
+        self._excluded = frozenset(excluded)
+        # Logger name to component, or None if the component is excluded
+        self._components: dict[str, str | None] = {}
+        self._second: str | None = None
+        self._second_value: datetime | None = None
+
+    def parse(self, line: str) -> tuple[datetime, str, str, str] | None:
+        """Parse a header line into timestamp, level, component and message.
+
+        Returns None for lines that are not headers, are below the minimum
+        level or come from an excluded integration.
+        """
+        # The level follows the timestamp, with or without milliseconds
+        level_start = 24 if line[19:20] == "." else 20
+        if not line.startswith(self._level_prefixes, level_start):
+            return None
+        # Cheap check that the line starts with a timestamp
+        if line[4] != "-" or line[13] != ":" or not line[:4].isdigit():
+            return None
+
+        level_end = line.find(" ", level_start)
+        level = line[level_start:level_end]
+
+        thread_end = line.find(") [", level_end)
+        logger_end = line.find("] ", thread_end + 3)
+        if line[level_end + 1 : level_end + 2] != "(" or thread_end < 0 or logger_end < 0:
+            return self._parse_fallback(line)
+
+        logger = line[thread_end + 3 : logger_end]
+        try:
+            component = self._components[logger]
+        except KeyError:
+            component = self._component(logger)
+        if component is None:
+            return None
+
+        return (
+            self._parse_timestamp(line),
+            level,
+            component,
+            line[logger_end + 2 :].strip(),
+        )
+
+    def _component(self, logger: str) -> str | None:
+        """Get the component of a logger, None if it is excluded."""
+        component: str | None = component_from_logger(logger)
+        if component in self._excluded:
+            component = None
+        if len(self._components) < _MAX_CACHED_LOGGERS:
+            self._components[logger] = component
+        return component
+
+    def _parse_timestamp(self, line: str) -> datetime:
+        """Parse the timestamp of a header line, caching the last second."""
+        second = line[:19]
+        if second != self._second:
+            try:
+                self._second_value = datetime.fromisoformat(second)
+            except ValueError:
+                return datetime.now()
+            self._second = second
+        if line[19] == "." and line[20:23].isdigit():
+            return self._second_value.replace(microsecond=int(line[20:23]) * 1000)
+        return self._second_value
+
+    def _parse_fallback(
+        self, line: str
+    ) -> tuple[datetime, str, str, str] | None:
+        """Parse a header with irregular spacing using the full pattern."""
+        match = _HEADER_RE.match(line.strip())
+        if not match:
+            return None
+
+        timestamp_str, millis, level, _thread, logger, message = match.groups()
+        if LEVEL_PRIORITY.get(level, 0) < self._min_priority:
+            return None
+
+        component = self._component(logger)
+        if component is None:
+            return None
+
+        try:
+            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return datetime.now(), level, component, message
+        if millis:
+            # Milliseconds like the fast path, so the record times match
+            timestamp = timestamp.replace(microsecond=int(millis[:3].ljust(3, "0")) * 1000)
+
+        return timestamp, level, component, message
@@ -0,0 +1,241 @@
+"""Compact representation of parsed log entries.
+
+Only uses the standard library so it can be benchmarked without a running
+Home Assistant instance.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from datetime import datetime
+import sys
+from types import MappingProxyType
+from typing import Any
+
+from .const import (
+    ATTR_AI_ANALYSIS,
+    ATTR_COMPONENT,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ATTR_ENTRY_ID,
+    ATTR_GITHUB_URL,
+    ATTR_LEVEL,
+    ATTR_MESSAGE,
+    ATTR_SUGGESTED_FIX,
+    ATTR_TIMESTAMP,
+)
+from .line_parser import LEVEL_PRIORITY
+
+# Level names by the small integer stored on entries
+LEVEL_NAMES = {priority: level for level, priority in LEVEL_PRIORITY.items()}
+
+_EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
+
+class EntryDetails:
+    """Enrichment of an entry, only allocated once there is something to hold."""
+
+    __slots__ = (
+        "entity_ids",
+        "device_id",
+        "github_url",
+        "ai_analysis",
+        "suggested_fix",
+        "_context",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty details."""
+        self.entity_ids: tuple[str, ...] = ()
+        self.device_id: str | None = None
+        self.github_url: str | None = None
+        self.ai_analysis: str | None = None
+        self.suggested_fix: str | None = None
+        self._context: dict[str, Any] | None = None
+
+    @property
+    def context(self) -> dict[str, Any]:
+        """Get the extracted context, created on first use."""
+        if self._context is None:
+            self._context = {}
+        return self._context
+
+
+class LogEntry:
+    """Represent a parsed log entry.
+
+    Entries are slotted and keep the level as a small integer and the
+    component as an interned string shared by all entries of a component.
+    Everything that is not known at parse time lives in an optional
+    EntryDetails, so an entry that is never enriched or analyzed only holds
+    its header fields, message and traceback.
+
+    Enrichment (entities, device, repository and context) is deferred: the
+    enricher given at creation runs the first time one of those fields is
+    read, and its result is kept on the entry.
+    """
+
+    __slots__ = (
+        "entry_id",
+        "timestamp",
+        "last_seen",
+        "_level",
+        "component",
+        "message",
+        "exception",
+        "signature",
+        "analyzed",
+        "_details",
+        "_enricher",
+        "seq",
+    )
+
+    def __init__(
+        self,
+        entry_id: str,
+        timestamp: datetime,
+        level: str,
+        message: str,
+        component: str | None = None,
+        exception: str | None = None,
+        enricher: Callable[[LogEntry], None] | None = None,
+    ) -> None:
+        """Initialize the entry."""
+        self.entry_id = entry_id
+        self.timestamp = timestamp
+        # Time of the newest repeat, repeats are only counted on its signature
+        self.last_seen = timestamp
+        self._level = LEVEL_PRIORITY[level]
+        self.component = sys.intern(component) if component is not None else None
+        self.message = message
+        self.exception = exception
+        self.signature: str | None = None
+        self.analyzed = False
+        self._details: EntryDetails | None = None
+        self._enricher = enricher
+        # Position in the history, assigned when the entry is stored
+        self.seq = 0
+
+    def __repr__(self) -> str:
+        """Return a short description of the entry."""
+        return f"<LogEntry {self.entry_id} {self.level} {self.component}>"
+
+    @property
+    def level(self) -> str:
+        """Get the level name."""
+        return LEVEL_NAMES[self._level]
+
+    @property
+    def level_priority(self) -> int:
+        """Get the level as its priority, higher is more severe."""
+        return self._level
+
+    @property
+    def details(self) -> EntryDetails:
+        """Get the enrichment of the entry, created on first use."""
+        if self._details is None:
+            self._details = EntryDetails()
+        return self._details
+
+    @property
+    def enriched(self) -> bool:
+        """Check if enrichment has run or there is none to run."""
+        return self._enricher is None
+
+    def enrich(self) -> None:
+        """Run the deferred enrichment now, if it has not run yet."""
+        if self._enricher is not None:
+            enricher, self._enricher = self._enricher, None
+            enricher(self)
+
+    def _enriched_details(self) -> EntryDetails | None:
+        """Get the details after running the deferred enrichment."""
+        self.enrich()
+        return self._details
+
+    def _set_detail(self, name: str, value: Any) -> None:
+        """Set an enrichment field, without allocating details for nothing."""
+        if value or self._details is not None:
+            setattr(self.details, name, value)
+
+    @property
+    def entity_ids(self) -> tuple[str, ...]:
+        """Get all entity IDs referenced by the message."""
+        details = self._enriched_details()
+        return details.entity_ids if details else ()
+
+    @entity_ids.setter
+    def entity_ids(self, value: tuple[str, ...] | list[str]) -> None:
+        self._set_detail("entity_ids", tuple(value))
+
+    @property
+    def entity_id(self) -> str | None:
+        """Get the first entity ID referenced by the message."""
+        entity_ids = self.entity_ids
+        return entity_ids[0] if entity_ids else None
+
+    @property
+    def device_id(self) -> str | None:
+        """Get the device of the referenced entities."""
+        details = self._enriched_details()
+        return details.device_id if details else None
+
+    @device_id.setter
+    def device_id(self, value: str | None) -> None:
+        self._set_detail("device_id", value)
+
+    @property
+    def github_url(self) -> str | None:
+        """Get the repository of the component."""
+        details = self._enriched_details()
+        return details.github_url if details else None
+
+    @github_url.setter
+    def github_url(self, value: str | None) -> None:
+        self._set_detail("github_url", value)
+
+    @property
+    def ai_analysis(self) -> str | None:
+        """Get the explanation from the analysis."""
+        return self._details.ai_analysis if self._details else None
+
+    @ai_analysis.setter
+    def ai_analysis(self, value: str | None) -> None:
+        self._set_detail("ai_analysis", value)
+
+    @property
+    def suggested_fix(self) -> str | None:
+        """Get the solution from the analysis."""
+        return self._details.suggested_fix if self._details else None
+
+    @suggested_fix.setter
+    def suggested_fix(self, value: str | None) -> None:
+        self._set_detail("suggested_fix", value)
+
+    @property
+    def context(self) -> Mapping[str, Any]:
+        """Get the context extracted from the message, read-only."""
+        details = self._enriched_details()
+        if details is None or details._context is None:
+            return _EMPTY_CONTEXT
+        return details._context
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            ATTR_ENTRY_ID: self.entry_id,
+            ATTR_TIMESTAMP: self.timestamp.isoformat(),
+            "last_seen": self.last_seen.isoformat(),
+            ATTR_LEVEL: self.level,
+            ATTR_MESSAGE: self.message,
+            ATTR_COMPONENT: self.component,
+            ATTR_ENTITY_ID: self.entity_id,
+            "entity_ids": list(self.entity_ids),
+            ATTR_DEVICE_ID: self.device_id,
+            ATTR_GITHUB_URL: self.github_url,
+            ATTR_AI_ANALYSIS: self.ai_analysis,
+            ATTR_SUGGESTED_FIX: self.suggested_fix,
+            "analyzed": self.analyzed,
+            "exception": self.exception,
+            "signature": self.signature,
+            "context": dict(self.context),
+        }
@@ -0,0 +1,76 @@
+"""In-process log handler for push-mode ingestion."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+import logging
+
+from homeassistant.core import HomeAssistant
+
+from .const import MAX_QUEUED_RECORDS
+
+# Records logged by this integration are never fed back into the monitor
+_OWN_LOGGER_PREFIX = __name__.rpartition(".")[0]
+
+
+class LogDebuggerHandler(logging.Handler):
+    """Queue-backed handler that hands log records to the event loop.
+
+    ``emit`` may be called from any thread. It only appends the record to a
+    bounded queue and wakes up the event loop once per batch, so it never
+    blocks the code that is logging.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        on_records: Callable[[], None],
+        level: int = logging.WARNING,
+    ) -> None:
+        """Initialize the handler."""
+        super().__init__(level)
+        self.hass = hass
+        self._on_records = on_records
+        self._queue: deque[logging.LogRecord] = deque(maxlen=MAX_QUEUED_RECORDS)
+        self._wakeup_pending = False
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue a record for the monitor."""
+        if record.name.startswith(_OWN_LOGGER_PREFIX):
+            return
+
+        try:
+            # Resolve the message and traceback now, their arguments may
+            # change later
+            record.message = record.getMessage()
+            if record.exc_info and not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(record)
+
+            if not self._wakeup_pending:
+                self._wakeup_pending = True
+                try:
+                    self.hass.loop.call_soon_threadsafe(self._wakeup)
+                except RuntimeError:
+                    # Event loop is closed during shutdown
+                    self._wakeup_pending = False
+        except Exception:  # noqa: BLE001
+            # Like any handler, never raise into the code that is logging,
+            # e.g. for format arguments that do not match the message
+            self.handleError(record)
+
+    def _wakeup(self) -> None:
+        """Notify the monitor that records are waiting (runs in event loop)."""
+        self._wakeup_pending = False
+        self._on_records()
+
+    def pop_records(self) -> list[logging.LogRecord]:
+        """Take all queued records."""
+        records = []
+        while self._queue:
+            records.append(self._queue.popleft())
+        return records
@@ -2,75 +2,127 @@
 from __future__ import annotations
 
 import asyncio
+import cProfile
 import logging
-import os
-import re
-from collections import deque
-from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import partial
+import os
 from pathlib import Path
+import sqlite3
+import time
+import tracemalloc
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
+from .ai_analyzer import AIAnalysisCache, AIAnalyzer
+from .ai_budget import AIBudget
+from .analysis_queue import AnalysisQueue
+from .anomaly import AnomalyDetector, AnomalyKey, AnomalyState
 from .const import (
-    ATTR_AI_ANALYSIS,
-    ATTR_COMPONENT,
-    ATTR_DEVICE_ID,
-    ATTR_ENTITY_ID,
-    ATTR_ENTRY_ID,
-    ATTR_GITHUB_URL,
-    ATTR_LEVEL,
-    ATTR_MESSAGE,
-    ATTR_SUGGESTED_FIX,
-    ATTR_TIMESTAMP,
+    ANOMALY_EWMA_INTERVALS,
+    ANOMALY_INTERVAL_SECONDS,
+    ANOMALY_MIN_COUNT,
+    ANOMALY_STARTUP_GRACE_SECONDS,
+    ANOMALY_Z_SCORE,
+    CONF_AI_CONCURRENCY,
     CONF_AUTO_ANALYZE,
     CONF_EXCLUDED_INTEGRATIONS,
+    CONF_HISTORY_MAX_ENTRIES,
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_INGEST_MODE,
     CONF_LOG_LEVEL,
     CONF_MAX_AI_CALLS_PER_HOUR,
+    CONF_MAX_NOTIFICATIONS_PER_MINUTE,
+    CONF_NOTIFICATION_WINDOW,
+    CONF_PERSIST_HISTORY,
+    CONF_PINNED_COMPONENTS,
+    CONF_TOP_COMPONENTS,
+    DEFAULT_AI_CONCURRENCY,
+    DEFAULT_HISTORY_MAX_ENTRIES,
+    DEFAULT_HISTORY_RETENTION_DAYS,
+    DEFAULT_INGEST_MODE,
+    DEFAULT_MAX_NOTIFICATIONS_PER_MINUTE,
+    DEFAULT_NOTIFICATION_WINDOW,
+    DEFAULT_PERSIST_HISTORY,
+    DEFAULT_PROFILE_TOP,
+    DEFAULT_QUERY_LIMIT,
+    DEFAULT_TOP_COMPONENTS,
+    DEFAULT_TREND_DAYS,
+    DOMAIN,
+    EVENT_ANOMALY,
+    HISTORY_DB_FILE,
+    HISTORY_PRUNE_INTERVAL_SECONDS,
+    MAX_LOG_ENTRIES,
+    MAX_ANOMALY_KEYS,
     MAX_LOG_LINES_FULL_SCAN,
+    MAX_RATE_COMPONENTS,
+    PROFILE_DIRECTORY,
+    PROFILE_MAX_FILES,
+    RATE_BUCKET_MINUTES,
+    ROLLUP_MAX_KEYS,
+    ROLLUP_SAVE_INTERVAL_SECONDS,
+    ROLLUP_STORAGE_KEY,
+    ROLLUP_STORAGE_VERSION,
+    ROLLUP_TIERS,
+    SIGNAL_STATS_UPDATED,
+    STAT_AI_BUDGET,
+    STAT_ANOMALIES,
+    STAT_LAST_ERROR,
+    STAT_METRICS,
+    STAT_RATES,
+    TREND_HOURLY_MAX_DAYS,
+    TREND_TOP_COUNT,
 )
+from .entry_store import EntryStore, make_entry_id
+from .history_store import HistoryStore, Row, entry_to_row, row_to_entry
+from .line_parser import LEVEL_PRIORITY, LogLineParser, component_from_logger
+from .log_entry import LogEntry
+from .log_handler import LogDebuggerHandler
+from .log_reader import LogFileReader, LogRecordAssembler
+from .metrics import Metrics
+from .notifications import NotificationDispatcher
 from .parsers import LogParser
+from .profiling import memory_hotspots, profile_hotspots, write_profile
+from .rates import RateTracker
+from .rollups import RollupEngine
+from .signatures import SignatureStore
 
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
-class LogEntry:
-    """Represent a parsed log entry."""
-
-    entry_id: str
-    timestamp: datetime
-    level: str
-    message: str
-    raw_line: str
-    component: str | None = None
-    entity_id: str | None = None
-    device_id: str | None = None
-    github_url: str | None = None
-    ai_analysis: str | None = None
-    suggested_fix: str | None = None
-    analyzed: bool = False
-    context: dict[str, Any] = field(default_factory=dict)
-
-    def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary."""
-        return {
-            ATTR_ENTRY_ID: self.entry_id,
-            ATTR_TIMESTAMP: self.timestamp.isoformat(),
-            ATTR_LEVEL: self.level,
-            ATTR_MESSAGE: self.message,
-            ATTR_COMPONENT: self.component,
-            ATTR_ENTITY_ID: self.entity_id,
-            ATTR_DEVICE_ID: self.device_id,
-            ATTR_GITHUB_URL: self.github_url,
-            ATTR_AI_ANALYSIS: self.ai_analysis,
-            ATTR_SUGGESTED_FIX: self.suggested_fix,
-            "analyzed": self.analyzed,
-            "context": self.context,
-        }
+def _to_millisecond(value: datetime) -> datetime:
+    """Truncate a time to the millisecond precision of log headers."""
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def _as_local_naive(value: datetime | None) -> datetime | None:
+    """Convert a datetime to naive local time like entry timestamps."""
+    if value is None or value.tzinfo is None:
+        return value
+    return dt_util.as_local(value).replace(tzinfo=None)
+
+
+# Lines logged by this integration are never fed back into the monitor,
+# in file mode they would also trigger another scan
+_OWN_COMPONENT = component_from_logger(__package__)
+
+# Snapshot counters, the per-level ones are keyed by level
+_LEVEL_COUNTERS = {
+    "WARNING": "total_warnings",
+    "ERROR": "total_errors",
+    "CRITICAL": "total_critical",
+}
+_STAT_COUNTERS = ("total_entries", "total_signatures", *_LEVEL_COUNTERS.values())
 
 
 class LogMonitor:
@@ -80,17 +132,75 @@ class LogMonitor:
         """Initialize the log monitor."""
         self.hass = hass
         self.config_entry = config_entry
-        self.log_entries: deque[LogEntry] = deque(maxlen=1000)
-        self.last_position = 0
-        self.parser = LogParser(hass)
-        self._ai_call_count = 0
-        self._ai_reset_time = datetime.now()
+        self.log_entries = EntryStore(MAX_LOG_ENTRIES)
+        self.signatures = SignatureStore()
+        self.last_error: LogEntry | None = None
+        self.reader = LogFileReader(self.log_file_path)
+        self.assembler = LogRecordAssembler()
+        self._line_parser: LogLineParser | None = None
+        self._line_parser_config: tuple[str, tuple[str, ...]] | None = None
+        # Timings and counters of the processing stages, for diagnostics
+        self.metrics = Metrics()
+        self.parser = LogParser(hass, self.metrics)
+        # Bound once so entries share one enricher object
+        self._enrich_entry = self.parser.enrich_entry
+        self.ai_cache = AIAnalysisCache(hass)
+        self.ai_analyzer = AIAnalyzer(hass, self.ai_cache)
+        self.analysis_queue = AnalysisQueue(
+            hass, self._async_analyze_entry, self._can_analyze
+        )
+        self.ai_budget = AIBudget(hass, lambda: self.max_ai_calls_per_hour)
+        self.notifications = NotificationDispatcher(
+            hass,
+            lambda: self.notification_window,
+            lambda: self.max_notifications_per_minute,
+            self.metrics,
+        )
+        # Optional persistent history, log_entries is its in-memory hot cache
+        self.history: HistoryStore | None = None
+        self._history_rows: list[Row] = []
+        self._history_analyses: list[tuple[str, str | None, str | None]] = []
+        # Newest row time in the database when it was opened and the rows of
+        # each record ID at that time. Records up to it, read again by the
+        # startup scan, were written before the restart.
+        self._history_until: float | None = None
+        self._history_ids: dict[str, int] = {}
+        self._unsub_prune: CALLBACK_TYPE | None = None
         self._running = False
+        self._handler: LogDebuggerHandler | None = None
+        self._handler_task: asyncio.Task | None = None
+        self._scan_lock = asyncio.Lock()
         
-        # Statistics
-        self.total_warnings = 0
-        self.total_errors = 0
-        self.total_critical = 0
+        # Statistics snapshot, updated as entries arrive. The names of the
+        # values that changed are sent to the sensors once per batch.
+        self.stats: dict[str, int] = dict.fromkeys(_STAT_COUNTERS, 0)
+        self._changed: set[str] = set()
+        self._unsub_budget_refill: CALLBACK_TYPE | None = None
+        # Per-component counts of the last hour, by minute
+        self.rates = RateTracker(RATE_BUCKET_MINUTES, MAX_RATE_COMPONENTS)
+        self._unsub_rates: CALLBACK_TYPE | None = None
+        # Bursts per component and signature
+        self.anomalies = AnomalyDetector(
+            ANOMALY_INTERVAL_SECONDS,
+            ANOMALY_EWMA_INTERVALS,
+            ANOMALY_Z_SCORE,
+            ANOMALY_MIN_COUNT,
+            MAX_ANOMALY_KEYS,
+        )
+        # Counts by minute, hour and day, and the lifetime level counters,
+        # kept across restarts
+        self.rollups = RollupEngine(ROLLUP_TIERS, ROLLUP_MAX_KEYS)
+        self._rollup_store: Store[dict[str, Any]] = Store(
+            hass, ROLLUP_STORAGE_VERSION, ROLLUP_STORAGE_KEY
+        )
+        self._rollups_dirty = False
+        self._unsub_rollups: CALLBACK_TYPE | None = None
+        self._profiling = False
+        # Newest record time processed, to the millisecond, and how often
+        # each record ID was processed at that time. Full scans skip the
+        # records up to it, which were processed when first read.
+        self._ingested_time: datetime | None = None
+        self._ingested_ids: dict[str, int] = {}
 
     @property
     def log_file_path(self) -> Path:
@@ -121,265 +231,1114 @@ class LogMonitor:
             self.config_entry.data.get(CONF_MAX_AI_CALLS_PER_HOUR, 10),
         )
 
+    @property
+    def ai_concurrency(self) -> int:
+        """Get the number of AI analyses that may run at once."""
+        return self.config_entry.options.get(
+            CONF_AI_CONCURRENCY,
+            self.config_entry.data.get(CONF_AI_CONCURRENCY, DEFAULT_AI_CONCURRENCY),
+        )
+
+    @property
+    def ingest_mode(self) -> str:
+        """Get how log records are received."""
+        return self.config_entry.options.get(
+            CONF_INGEST_MODE,
+            self.config_entry.data.get(CONF_INGEST_MODE, DEFAULT_INGEST_MODE),
+        )
+
+    @property
+    def notification_window(self) -> int:
+        """Get the minimum seconds between updates of one notification."""
+        return self.config_entry.options.get(
+            CONF_NOTIFICATION_WINDOW,
+            self.config_entry.data.get(
+                CONF_NOTIFICATION_WINDOW, DEFAULT_NOTIFICATION_WINDOW
+            ),
+        )
+
+    @property
+    def max_notifications_per_minute(self) -> int:
+        """Get the maximum number of notifications sent per minute."""
+        return self.config_entry.options.get(
+            CONF_MAX_NOTIFICATIONS_PER_MINUTE,
+            self.config_entry.data.get(
+                CONF_MAX_NOTIFICATIONS_PER_MINUTE, DEFAULT_MAX_NOTIFICATIONS_PER_MINUTE
+            ),
+        )
+
+    @property
+    def persist_history(self) -> bool:
+        """Get if entries are kept in the history database."""
+        return self.config_entry.options.get(
+            CONF_PERSIST_HISTORY,
+            self.config_entry.data.get(CONF_PERSIST_HISTORY, DEFAULT_PERSIST_HISTORY),
+        )
+
+    @property
+    def history_retention_days(self) -> int:
+        """Get how many days entries are kept in the history database."""
+        return self.config_entry.options.get(
+            CONF_HISTORY_RETENTION_DAYS,
+            self.config_entry.data.get(
+                CONF_HISTORY_RETENTION_DAYS, DEFAULT_HISTORY_RETENTION_DAYS
+            ),
+        )
+
+    @property
+    def history_max_entries(self) -> int:
+        """Get the maximum number of entries in the history database."""
+        return self.config_entry.options.get(
+            CONF_HISTORY_MAX_ENTRIES,
+            self.config_entry.data.get(
+                CONF_HISTORY_MAX_ENTRIES, DEFAULT_HISTORY_MAX_ENTRIES
+            ),
+        )
+
     @property
     def excluded_integrations(self) -> list[str]:
         """Get list of excluded integrations."""
         return self.config_entry.options.get(CONF_EXCLUDED_INTEGRATIONS, [])
 
-    def _reset_ai_counter_if_needed(self) -> None:
-        """Reset AI call counter if an hour has passed."""
-        now = datetime.now()
-        if now - self._ai_reset_time > timedelta(hours=1):
-            self._ai_call_count = 0
-            self._ai_reset_time = now
+    @property
+    def top_components(self) -> int:
+        """Get how many of the noisiest integrations get a rate sensor."""
+        return self.config_entry.options.get(
+            CONF_TOP_COMPONENTS,
+            self.config_entry.data.get(CONF_TOP_COMPONENTS, DEFAULT_TOP_COMPONENTS),
+        )
 
-    def _can_use_ai(self) -> bool:
-        """Check if we can make another AI call."""
-        self._reset_ai_counter_if_needed()
-        return self._ai_call_count < self.max_ai_calls_per_hour
+    @property
+    def pinned_components(self) -> list[str]:
+        """Get the integrations that always have a rate sensor."""
+        return self.config_entry.options.get(CONF_PINNED_COMPONENTS, [])
+
+    def _can_analyze(self, entry: LogEntry) -> bool:
+        """Check if an entry can be analyzed now, from the cache or with AI."""
+        return self.ai_cache.async_contains(entry) or self.ai_budget.async_can_spend(
+            entry.level
+        )
 
     def _should_process_level(self, level: str) -> bool:
         """Check if this log level should be processed."""
-        level_priority = {"WARNING": 1, "ERROR": 2, "CRITICAL": 3}
-        configured_priority = level_priority.get(self.log_level_filter, 1)
-        message_priority = level_priority.get(level.upper(), 0)
+        configured_priority = LEVEL_PRIORITY.get(self.log_level_filter, 1)
+        message_priority = LEVEL_PRIORITY.get(level.upper(), 0)
         return message_priority >= configured_priority
 
+    def _update_line_parser(self) -> LogLineParser:
+        """Rebuild the line parser if the options changed."""
+        config = (
+            self.log_level_filter,
+            (*self.excluded_integrations, _OWN_COMPONENT),
+        )
+        if self._line_parser is None or config != self._line_parser_config:
+            self._line_parser = LogLineParser(*config)
+            self._line_parser_config = config
+        return self._line_parser
+
     async def async_start(self) -> None:
         """Start monitoring logs."""
         self._running = True
+        self.parser.entity_index.async_start()
+        await self.ai_cache.async_load()
+        await self.ai_budget.async_load()
+        await self._async_load_rollups()
+        self.analysis_queue.async_start(self.ai_concurrency)
+        if self.persist_history:
+            await self._async_open_history()
+        self._async_schedule_budget_refill()
+        # Startup logs in bursts, baselines are built before alerting
+        self.anomalies.quiet_until = time.time() + ANOMALY_STARTUP_GRACE_SECONDS
+        # Rates and anomalies change as minutes pass, even without new records
+        self._unsub_rates = async_track_time_interval(
+            self.hass, self._async_minute_tick, timedelta(minutes=1)
+        )
+        self._unsub_rollups = async_track_time_interval(
+            self.hass,
+            self._async_save_rollups,
+            timedelta(seconds=ROLLUP_SAVE_INTERVAL_SECONDS),
+        )
         _LOGGER.info("Log monitor started")
         
         # Initialize file position
         if await self.hass.async_add_executor_job(self.log_file_path.exists):
-            self.last_position = await self.hass.async_add_executor_job(
-                lambda: self.log_file_path.stat().st_size
-            )
+            await self.hass.async_add_executor_job(self.reader.seek_to_end)
 
     async def async_stop(self) -> None:
         """Stop monitoring logs."""
         self._running = False
+        self.async_detach_handler()
+        self.analysis_queue.async_stop()
+        self.notifications.async_stop()
+        self.parser.entity_index.async_stop()
+        if self._unsub_budget_refill is not None:
+            self._unsub_budget_refill()
+            self._unsub_budget_refill = None
+        if self._unsub_rates is not None:
+            self._unsub_rates()
+            self._unsub_rates = None
+        if self._unsub_rollups is not None:
+            self._unsub_rollups()
+            self._unsub_rollups = None
+        await self._async_save_rollups()
+        await self._async_close_history()
         _LOGGER.info("Log monitor stopped")
 
+    async def _async_load_rollups(self) -> None:
+        """Restore the rollups and the level counters."""
+        if data := await self._rollup_store.async_load():
+            self.rollups.restore(data)
+        for level, key in _LEVEL_COUNTERS.items():
+            self._set_stat(key, self.rollups.totals[LEVEL_PRIORITY[level] - 1])
+
+    async def _async_save_rollups(self, _now: datetime | None = None) -> None:
+        """Checkpoint the rollups if they changed."""
+        if not self._rollups_dirty:
+            return
+        self._rollups_dirty = False
+        self.rollups.compact(time.time())
+        await self._rollup_store.async_save(self.rollups.as_dict())
+
+    async def _async_open_history(self) -> None:
+        """Open the history database and prune it periodically."""
+        history = HistoryStore(self.hass.config.path(HISTORY_DB_FILE))
+        try:
+            await self.hass.async_add_executor_job(history.open)
+            newest = await self.hass.async_add_executor_job(history.newest)
+        except (sqlite3.Error, OSError, RuntimeError) as err:
+            _LOGGER.error("Unable to open history database %s: %s", history.path, err)
+            await self.hass.async_add_executor_job(history.close)
+            return
+        if newest is not None:
+            self._history_until, self._history_ids = newest
+        self.history = history
+        await self._async_prune_history()
+        self._unsub_prune = async_track_time_interval(
+            self.hass,
+            self._async_prune_history,
+            timedelta(seconds=HISTORY_PRUNE_INTERVAL_SECONDS),
+        )
+
+    async def _async_close_history(self) -> None:
+        """Write pending rows and close the history database."""
+        if self._unsub_prune is not None:
+            self._unsub_prune()
+            self._unsub_prune = None
+        if self.history is None:
+            return
+        await self._async_flush_history()
+        await self.hass.async_add_executor_job(self.history.close)
+        self.history = None
+
+    async def _async_prune_history(self, _now: datetime | None = None) -> None:
+        """Drop history rows beyond the retention limits."""
+        if self.history is None:
+            return
+        try:
+            await self.hass.async_add_executor_job(
+                self.history.prune,
+                self.history_retention_days,
+                self.history_max_entries,
+            )
+        except sqlite3.Error as err:
+            _LOGGER.error("Error pruning history database: %s", err)
+
+    async def _async_flush_history(self) -> None:
+        """Write the rows and analyses collected since the last flush."""
+        if self.history is None or not (self._history_rows or self._history_analyses):
+            return
+        rows, self._history_rows = self._history_rows, []
+        analyses, self._history_analyses = self._history_analyses, []
+        try:
+            await self.hass.async_add_executor_job(self.history.write, rows, analyses)
+        except sqlite3.Error as err:
+            _LOGGER.error("Error writing %d rows to history database: %s", len(rows), err)
+
+    def async_attach_handler(self) -> None:
+        """Receive log records directly from the logging system."""
+        if self._handler is not None:
+            return
+        self._handler = LogDebuggerHandler(
+            self.hass,
+            self._async_schedule_handler_drain,
+            logging.getLevelName(self.log_level_filter),
+        )
+        logging.getLogger().addHandler(self._handler)
+        _LOGGER.info("Log monitor receiving records from the logging system")
+
+    def async_detach_handler(self) -> None:
+        """Stop receiving log records from the logging system."""
+        if self._handler is None:
+            return
+        logging.getLogger().removeHandler(self._handler)
+        self._handler = None
+        if self._handler_task is not None:
+            self._handler_task.cancel()
+            self._handler_task = None
+
+    def _async_schedule_handler_drain(self) -> None:
+        """Start processing queued records unless already doing so."""
+        if self._handler_task is None or self._handler_task.done():
+            self._handler_task = self.hass.async_create_background_task(
+                self._async_drain_handler(), f"{DOMAIN} log handler"
+            )
+
+    async def _async_drain_handler(self) -> None:
+        """Process queued records until the handler queue is empty."""
+        while self._handler is not None and (records := self._handler.pop_records()):
+            await self._process_log_records(records)
+
     async def async_scan_logs(self, full_scan: bool = False) -> None:
         """Scan log file for entries.
         
         Args:
             full_scan: If True, scan entire log file. If False, only read new entries since last position.
         """
+        # Scans can be triggered by the timer, file events and services at once
+        async with self._scan_lock:
+            metrics = self.metrics
+            lines_read = metrics.counters["lines_read"]
+            bytes_behind = metrics.bytes_behind
+            start = time.perf_counter()
+            await self._async_scan_logs(full_scan)
+            metrics.add_time("scan", time.perf_counter() - start)
+            metrics.counters["scans"] += 1
+            if (
+                metrics.counters["lines_read"] != lines_read
+                or metrics.bytes_behind != bytes_behind
+            ):
+                # Idle scans leave the diagnostic sensors alone
+                self._changed.add(STAT_METRICS)
+                self._async_publish()
+
+    async def _async_scan_logs(self, full_scan: bool) -> None:
+        """Scan log file for entries while holding the scan lock."""
         if not await self.hass.async_add_executor_job(self.log_file_path.exists):
             _LOGGER.warning("Log file not found: %s", self.log_file_path)
             return
 
         try:
-            file_size = await self.hass.async_add_executor_job(
-                lambda: self.log_file_path.stat().st_size
-            )
-            
-            # If file was rotated or truncated, reset position
-            if file_size < self.last_position:
-                self.last_position = 0
-                _LOGGER.info("Log file rotated, resetting position")
-            
             # Read lines using executor
             if full_scan:
-                _LOGGER.info("Performing full log scan")
+                _LOGGER.debug("Performing full log scan")
+                self.assembler.reset()
                 new_lines = await self.hass.async_add_executor_job(
                     self._read_full_log
                 )
+            elif self._handler is not None:
+                # Records reach the monitor through the handler, the file is
+                # only read again by full scans, which skip what was ingested
+                await self.hass.async_add_executor_job(self.reader.seek_to_end)
+                new_lines = []
             else:
                 new_lines = await self.hass.async_add_executor_job(
                     self._read_log_lines
                 )
             
-            # Process new lines
-            if new_lines:
-                _LOGGER.info("Processing %d log lines", len(new_lines))
-                await self._process_log_lines(new_lines)
-            else:
-                _LOGGER.debug("No new log entries to process")
+            # A large backlog is read in parts, each processed before the
+            # next one is read
+            while True:
+                # Group tracebacks with their header line. The last record is
+                # complete once the reader reached the end of the file and is
+                # not waiting for the rest of a line.
+                records = self.assembler.feed(
+                    new_lines,
+                    flush=self.reader.at_end and self.reader.pending_bytes == 0,
+                )
+                
+                # Process new records
+                if records:
+                    await self._process_log_lines(records, reread=full_scan)
+                
+                if self.reader.at_end:
+                    break
+                new_lines = await self.hass.async_add_executor_job(
+                    self._read_log_lines
+                )
                 
         except Exception as e:
             _LOGGER.error("Error scanning logs: %s", e, exc_info=True)
 
+    async def async_profile_scan(
+        self,
+        *,
+        full_scan: bool = False,
+        top: int = DEFAULT_PROFILE_TOP,
+        sort: str = "cumulative",
+        memory: bool = False,
+    ) -> dict[str, Any]:
+        """Run one scan under cProfile, and tracemalloc if asked.
+
+        The sorted statistics are written to the profile directory and the
+        top functions are returned. The profiler only sees the event loop
+        thread: the file read runs in the executor and is reported by its
+        duration, and other work on the loop during the scan is included.
+        Raises ValueError when a profile is already running.
+        """
+        if self._profiling:
+            raise ValueError("A scan is already being profiled")
+        self._profiling = True
+        try:
+            return await self._async_profile_scan(full_scan, top, sort, memory)
+        finally:
+            self._profiling = False
+
+    async def _async_profile_scan(
+        self, full_scan: bool, top: int, sort: str, memory: bool
+    ) -> dict[str, Any]:
+        """Profile a scan and summarize it."""
+        # Tracing that was already running, e.g. by the profiler integration,
+        # is left running
+        trace = memory and not tracemalloc.is_tracing()
+        if trace:
+            tracemalloc.start()
+        elif memory:
+            tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        counters = dict(self.metrics.counters)
+        file_read = self.metrics.timings["file_read"].total
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            # Python 3.12 allows a single profiler at a time
+            if trace:
+                tracemalloc.stop()
+            raise ValueError(f"Unable to start the profiler: {err}") from err
+        try:
+            await self.async_scan_logs(full_scan)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - start
+            snapshot = peak = None
+            if memory:
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+            if trace:
+                tracemalloc.stop()
+
+        name = f"scan_{datetime.now():%Y%m%d_%H%M%S_%f}"
+        path = await self.hass.async_add_executor_job(
+            write_profile,
+            profiler,
+            Path(self.hass.config.path(PROFILE_DIRECTORY)),
+            name,
+            sort,
+            PROFILE_MAX_FILES,
+        )
+        hotspots = await self.hass.async_add_executor_job(
+            profile_hotspots, profiler, sort, top
+        )
+        _LOGGER.info("Profile of a log scan written to %s", path)
+        result: dict[str, Any] = {
+            "full_scan": full_scan,
+            "duration_ms": round(duration * 1000, 3),
+            "file_read_ms": round(
+                self.metrics.timings["file_read"].total - file_read, 3
+            ),
+            **{
+                key: value - counters[key]
+                for key, value in self.metrics.counters.items()
+                if key != "scans"
+            },
+            "stats_file": str(path),
+            "hotspots": hotspots,
+        }
+        if snapshot is not None:
+            result["memory"] = {
+                "peak_kib": round(peak / 1024, 1),
+                "hotspots": await self.hass.async_add_executor_job(
+                    memory_hotspots, snapshot, top
+                ),
+            }
+        return result
+
     def _read_log_lines(self) -> list[str]:
-        """Read new lines from log file since last position (runs in executor)."""
-        with open(self.log_file_path, "r", encoding="utf-8", errors="ignore") as f:
-            f.seek(self.last_position)
-            new_lines = f.readlines()
-            self.last_position = f.tell()
-        return new_lines
+        """Read new lines from log file since last position (runs in executor).
+        
+        Rotation and truncation are handled by the reader, and a line that is
+        still being written is held back until it is complete.
+        """
+        start = time.perf_counter()
+        lines = self.reader.read_new_lines()
+        self._count_read(lines, time.perf_counter() - start)
+        return lines
 
     def _read_full_log(self) -> list[str]:
-        """Read entire log file (runs in executor).
+        """Read the tail of the log file (runs in executor).
         
-        Reads the last MAX_LOG_LINES_FULL_SCAN lines or the entire file if smaller.
-        Updates last_position to end of file.
+        Reads the last MAX_LOG_LINES_FULL_SCAN lines or the entire file if smaller,
+        without loading the whole file into memory.
+        Continues incremental reads from the end of the last complete line.
+        """
+        start = time.perf_counter()
+        lines = self.reader.read_tail(MAX_LOG_LINES_FULL_SCAN)
+        self._count_read(lines, time.perf_counter() - start)
+        return lines
+
+    def _count_read(self, lines: list[str], seconds: float) -> None:
+        """Add the timing of a read and the bytes left behind (runs in executor)."""
+        self.metrics.add_time("file_read", seconds)
+        self.metrics.counters["lines_read"] += len(lines)
+        try:
+            size = os.stat(self.log_file_path).st_size
+        except OSError:
+            return
+        self.metrics.set_bytes_behind(max(0, size - self.reader.position))
+
+    def _count_batch(
+        self, records: int, accepted: int, parse_time: float, total_time: float
+    ) -> None:
+        """Add the timings and counts of a batch of records."""
+        counters = self.metrics.counters
+        counters["records"] += records
+        counters["records_accepted"] += accepted
+        counters["records_skipped"] += records - accepted
+        self.metrics.add_time("parse", parse_time)
+        self.metrics.add_time("process", total_time - parse_time)
+
+    async def _process_log_lines(
+        self, records: list[tuple[str, str | None]], reread: bool = False
+    ) -> None:
+        """Process log records (header line and optional continuation).
+
+        With reread, the records may have been processed before, e.g. by a
+        full scan. They are in log order, so the ones already processed
+        are skipped up to the first new one.
         """
-        with open(self.log_file_path, "r", encoding="utf-8", errors="ignore") as f:
-            # Read all lines
-            all_lines = f.readlines()
-            # Take last MAX_LOG_LINES_FULL_SCAN lines to avoid overwhelming the system
-            lines_to_process = all_lines[-MAX_LOG_LINES_FULL_SCAN:] if len(all_lines) > MAX_LOG_LINES_FULL_SCAN else all_lines
-            # Update position to end of file
-            f.seek(0, os.SEEK_END)  # Seek to end
-            self.last_position = f.tell()
-        return lines_to_process
-
-
-    async def _process_log_lines(self, lines: list[str]) -> None:
-        """Process new log lines."""
-        for line in lines:
+        self._update_line_parser()
+        parse_time = 0.0
+        accepted = 0
+        # Occurrences of record IDs at the ingested time in this batch
+        seen: dict[str, int] = {}
+        batch_start = time.perf_counter()
+        for line, exception in records:
             try:
-                entry = await self._parse_log_line(line)
+                start = time.perf_counter()
+                entry = await self._parse_log_line(line, exception)
+                parse_time += time.perf_counter() - start
                 if entry:
-                    self.log_entries.append(entry)
-                    self._update_statistics(entry)
-                    
-                    # Auto-analyze if enabled
-                    if self.auto_analyze and self._can_use_ai():
-                        await self.async_analyze_entry(entry.entry_id, use_ai=True)
-                    
-                    # Send notification for critical errors
-                    if entry.level == "CRITICAL" or entry.level == "ERROR":
-                        await self._send_notification(entry)
+                    accepted += 1
+                    if reread:
+                        if self._was_ingested(entry, seen):
+                            self.metrics.counters["records_duplicate"] += 1
+                            continue
+                        reread = False
+                    await self._process_entry(entry)
                         
             except Exception as e:
                 _LOGGER.debug("Error processing log line: %s - %s", line[:100], e)
+        
+        self._count_batch(
+            len(records), accepted, parse_time, time.perf_counter() - batch_start
+        )
+        if accepted:
+            # Only when records were accepted: the line this writes is never
+            # accepted, so with debug logging a scan does not trigger another
+            _LOGGER.debug("Processed %d log records, %d accepted", len(records), accepted)
+        self._async_end_anomalies(self.anomalies.pop_ended())
+        self._async_publish()
+        await self._async_flush_history()
+
+    async def _process_log_records(self, records: list[logging.LogRecord]) -> None:
+        """Process log records received from the logging system."""
+        parse_time = 0.0
+        accepted = 0
+        batch_start = time.perf_counter()
+        for record in records:
+            try:
+                start = time.perf_counter()
+                entry = await self._parse_log_record(record)
+                parse_time += time.perf_counter() - start
+                if entry:
+                    accepted += 1
+                    await self._process_entry(entry)
+
+            except Exception as e:
+                _LOGGER.debug("Error processing log record: %s - %s", record.name, e)
+
+        self._count_batch(
+            len(records), accepted, parse_time, time.perf_counter() - batch_start
+        )
+        self._async_end_anomalies(self.anomalies.pop_ended())
+        self._async_publish()
+        await self._async_flush_history()
 
-    async def _parse_log_line(self, line: str) -> LogEntry | None:
-        """Parse a single log line."""
-        # Basic regex to match Home Assistant log format
-        # Format: YYYY-MM-DD HH:MM:SS LEVEL (component) [source] message
-        pattern = r"^(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+(\w+)\s+\(([^)]+)\)\s+\[([^\]]+)\]\s+(.+)$"
-        match = re.match(pattern, line.strip())
+    def _was_ingested(self, entry: LogEntry, seen: dict[str, int]) -> bool:
+        """Check if a record read again was processed before."""
+        timestamp = _to_millisecond(entry.timestamp)
+        if self._ingested_time is None or timestamp > self._ingested_time:
+            return False
+        if timestamp < self._ingested_time:
+            return True
+        # Identical records of one millisecond share an ID, count them
+        seen[entry.entry_id] = count = seen.get(entry.entry_id, 0) + 1
+        return count <= self._ingested_ids.get(entry.entry_id, 0)
+
+    def _is_new_in_history(self, entry: LogEntry) -> bool:
+        """Check if a record was not written to the history before a restart."""
+        if self._history_until is None:
+            return True
+        timestamp = entry.timestamp.timestamp()
+        if timestamp > self._history_until:
+            # The records from before the restart were all read
+            self._history_until = None
+            self._history_ids = {}
+            return True
+        if timestamp < self._history_until:
+            return False
+        rows = self._history_ids.get(entry.entry_id, 0)
+        if rows:
+            self._history_ids[entry.entry_id] = rows - 1
+            return False
+        return True
+
+    def _mark_ingested(self, entry: LogEntry) -> None:
+        """Move the ingested time forward to a processed record."""
+        timestamp = _to_millisecond(entry.timestamp)
+        if self._ingested_time is None or timestamp > self._ingested_time:
+            self._ingested_time = timestamp
+            self._ingested_ids = {}
+        if timestamp == self._ingested_time:
+            ids = self._ingested_ids
+            ids[entry.entry_id] = ids.get(entry.entry_id, 0) + 1
+
+    async def _process_entry(self, entry: LogEntry) -> None:
+        """Count a new record, and store it unless it repeats a stored one.
+
+        Every record is counted, including identical records logged in the
+        same millisecond, which share an entry ID.
+        """
+        self._mark_ingested(entry)
+        group, _ = self.signatures.record(entry)
+        self._update_statistics(entry)
+        self._set_stat("total_signatures", len(self.signatures))
+        if self.history is not None and self._is_new_in_history(entry):
+            # Every occurrence is kept, repeats included
+            self._history_rows.append(entry_to_row(entry))
+        
+        if group.entry is not None:
+            # Repeat of a message still in the history, only counted
+            group.entry.last_seen = entry.timestamp
+            if entry.level in ("ERROR", "CRITICAL"):
+                # The occurrence count shown with the last error changed
+                self.last_error = group.entry
+                self._changed.add(STAT_LAST_ERROR)
+                self.notifications.async_add_occurrence(group.entry, entry.timestamp)
+            return
         
-        if not match:
+        # Keep signature groups pointing at entries that are still stored
+        if (evicted := self.log_entries.append(entry)) is not None:
+            evicted_group = self.signatures.get(evicted.signature)
+            if evicted_group is not None and evicted_group.entry is evicted:
+                evicted_group.entry = None
+        group.entry = entry
+        self._set_stat("total_entries", len(self.log_entries))
+        if entry.level in ("ERROR", "CRITICAL"):
+            self.last_error = entry
+            self._changed.add(STAT_LAST_ERROR)
+        
+        # Auto-analyze in the background so slow AI responses never hold
+        # up log processing
+        if self.auto_analyze:
+            self.analysis_queue.async_enqueue(entry)
+        
+        # Send notification for critical errors
+        if entry.level == "CRITICAL" or entry.level == "ERROR":
+            self.notifications.async_add_occurrence(entry, entry.timestamp)
+
+    async def _parse_log_line(
+        self, line: str, exception: str | None = None
+    ) -> LogEntry | None:
+        """Parse a log header line, with the traceback that followed it."""
+        # Lines below the configured level or from excluded integrations
+        # are rejected before any timestamp parsing
+        line_parser = self._line_parser or self._update_line_parser()
+        parsed = line_parser.parse(line)
+        if parsed is None:
             return None
         
-        timestamp_str, level, component, source, message = match.groups()
+        timestamp, level, component, message = parsed
         
-        # Check if we should process this level
+        # Create entry
+        entry = LogEntry(
+            entry_id=make_entry_id(line),
+            timestamp=timestamp,
+            level=level,
+            message=message,
+            component=component,
+            exception=exception,
+            enricher=self._enrich_entry,
+        )
+        
+        return entry
+
+    async def _parse_log_record(self, record: logging.LogRecord) -> LogEntry | None:
+        """Create an entry from a log record, no text parsing needed."""
+        level = record.levelname
         if not self._should_process_level(level):
             return None
         
-        # Check if component is excluded
+        component = component_from_logger(record.name)
         if component in self.excluded_integrations:
             return None
         
-        try:
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            timestamp = datetime.now()
+        # Split the way the record is assembled from the log file: the first
+        # line is the message, the other lines and the traceback follow it
+        message, _, continuation = record.message.partition("\n")
+        exception = "\n".join(
+            part for part in (continuation.rstrip("\n"), record.exc_text) if part
+        ) or None
         
-        # Create entry
-        entry_id = f"{timestamp.timestamp()}_{hash(line) % 10000}"
+        timestamp = datetime.fromtimestamp(record.created)
+        # The header line Home Assistant writes for this record, so the ID is
+        # the same as when the record is read from the log file
+        header = (
+            f"{timestamp:%Y-%m-%d %H:%M:%S}.{int(record.msecs):03d} {level} "
+            f"({record.threadName}) [{record.name}] {message}"
+        )
         entry = LogEntry(
-            entry_id=entry_id,
+            entry_id=make_entry_id(header),
             timestamp=timestamp,
             level=level,
             message=message,
-            raw_line=line,
             component=component,
+            exception=exception,
+            enricher=self._enrich_entry,
         )
         
-        # Parse additional details
-        await self.parser.parse_entry(entry)
-        
         return entry
 
     def _update_statistics(self, entry: LogEntry) -> None:
-        """Update statistics counters."""
-        if entry.level == "WARNING":
-            self.total_warnings += 1
-        elif entry.level == "ERROR":
-            self.total_errors += 1
-        elif entry.level == "CRITICAL":
-            self.total_critical += 1
+        """Update rates, rollups and statistics counters."""
+        timestamp = entry.timestamp.timestamp()
+        if entry.component is not None and self.rates.record(
+            entry.component, entry.level_priority, timestamp
+        ):
+            self._changed.add(STAT_RATES)
+        now = time.time()
+        for key in (("component", entry.component), ("signature", entry.signature)):
+            if key[1] is not None and (
+                state := self.anomalies.observe(key, entry.component, timestamp, now)
+            ):
+                self._async_anomaly_started(key, state, entry)
+        if not self.rollups.record(
+            timestamp, entry.level_priority, entry.component, entry.signature
+        ):
+            # Counted before the restart, e.g. read again by the startup scan
+            return
+        self._rollups_dirty = True
+        if (key := _LEVEL_COUNTERS.get(entry.level)) is not None:
+            self.stats[key] += 1
+            self._changed.add(key)
+
+    def _set_stat(self, key: str, value: int) -> None:
+        """Set a value of the statistics snapshot, noting if it changed."""
+        if self.stats[key] != value:
+            self.stats[key] = value
+            self._changed.add(key)
+
+    @callback
+    def _async_publish(self) -> None:
+        """Tell the sensors which statistics changed since the last call."""
+        if not self._changed:
+            return
+        changed = frozenset(self._changed)
+        self._changed.clear()
+        async_dispatcher_send(
+            self.hass, SIGNAL_STATS_UPDATED.format(self.config_entry.entry_id), changed
+        )
+
+    @callback
+    def _async_budget_changed(self) -> None:
+        """Publish the AI budget and schedule the update for its next token."""
+        self._changed.add(STAT_AI_BUDGET)
+        self._async_publish()
+        self._async_schedule_budget_refill()
+
+    @callback
+    def _async_schedule_budget_refill(self) -> None:
+        """Publish the AI budget again when its next whole token is available."""
+        if self._unsub_budget_refill is not None:
+            self._unsub_budget_refill()
+            self._unsub_budget_refill = None
+        if (next_token := self.ai_budget.next_token_at) is not None:
+            self._unsub_budget_refill = async_track_point_in_utc_time(
+                self.hass, self._async_budget_refilled, next_token
+            )
+
+    @callback
+    def _async_budget_refilled(self, _now: datetime) -> None:
+        """Handle a new whole token in the AI budget."""
+        self._unsub_budget_refill = None
+        self._async_budget_changed()
+
+    @callback
+    def _async_anomaly_started(
+        self, key: AnomalyKey, state: AnomalyState, entry: LogEntry
+    ) -> None:
+        """Announce a burst of records."""
+        # Not a warning, it would be counted as a record itself
+        _LOGGER.info(
+            "Burst of log records from %s %s: %d in the last minute, usually %.1f",
+            key[0],
+            key[1],
+            state.count,
+            state.mean,
+        )
+        self.hass.bus.async_fire(
+            EVENT_ANOMALY,
+            {
+                "state": "started",
+                **self._anomaly_data(key, state),
+                "level": entry.level,
+                "message": entry.message[:255],
+            },
+        )
+        self._changed.add(STAT_ANOMALIES)
+
+    @callback
+    def _async_end_anomalies(
+        self, ended: list[tuple[AnomalyKey, AnomalyState]]
+    ) -> None:
+        """Announce the bursts that ended."""
+        for key, state in ended:
+            data = self._anomaly_data(key, state)
+            # The interval that ended it counts nothing yet
+            del data["count"]
+            self.hass.bus.async_fire(EVENT_ANOMALY, {"state": "ended", **data})
+            self._changed.add(STAT_ANOMALIES)
+
+    @staticmethod
+    def _anomaly_data(key: AnomalyKey, state: AnomalyState) -> dict[str, Any]:
+        """Describe an anomaly for events and attributes."""
+        return {
+            "kind": key[0],
+            "component": state.component,
+            "signature": key[1] if key[0] == "signature" else None,
+            "count": state.count,
+            "peak": state.peak,
+            "baseline": round(state.mean, 2),
+            "threshold": round(state.threshold, 2),
+            "started": dt_util.utc_from_timestamp(state.started).isoformat(),
+        }
+
+    def get_anomalies(self) -> list[dict[str, Any]]:
+        """Get the ongoing anomalies."""
+        return [
+            self._anomaly_data(key, state)
+            for key, state in self.anomalies.active.items()
+        ]
+
+    @callback
+    def _async_minute_tick(self, _now: datetime) -> None:
+        """Publish the rates and anomalies as their windows move on."""
+        now = time.time()
+        self._async_end_anomalies(self.anomalies.advance(now))
+        if len(self.rates):
+            self.rates.prune(now)
+            self._changed.add(STAT_RATES)
+        self._async_publish()
 
     async def async_analyze_entry(self, entry_id: str, use_ai: bool = True) -> None:
         """Analyze a specific log entry."""
         # Find the entry
-        entry = next((e for e in self.log_entries if e.entry_id == entry_id), None)
+        entry = self.log_entries.get(entry_id)
+        if entry is None and self.history is not None:
+            # Older entries are only in the history database
+            if row := await self.hass.async_add_executor_job(self.history.get, entry_id):
+                entry = row_to_entry(row, self._enrich_entry)
         if not entry:
             _LOGGER.warning("Log entry not found: %s", entry_id)
             return
         
+        await self._async_analyze_entry(entry, use_ai)
+
+    async def _async_analyze_entry(self, entry: LogEntry, use_ai: bool = True) -> None:
+        """Analyze a log entry."""
+        entry_id = entry.entry_id
         if entry.analyzed:
             _LOGGER.debug("Entry already analyzed: %s", entry_id)
             return
         
-        # Use AI if requested and available
-        if use_ai and self._can_use_ai():
-            from .ai_analyzer import AIAnalyzer
+        # Identical errors analyzed before are answered from the cache
+        # without spending an AI call
+        if use_ai and (analysis := self.ai_cache.async_get(entry)):
+            entry.ai_analysis = analysis.get("explanation")
+            entry.suggested_fix = analysis.get("solution")
+            entry.analyzed = True
+            
+            _LOGGER.info("Cached AI analysis used for entry: %s", entry_id)
             
-            analyzer = AIAnalyzer(self.hass)
-            analysis = await analyzer.analyze_log_entry(entry)
+            # Update notification with AI insights
+            self.notifications.async_update(entry)
+            self._changed.add(STAT_AI_BUDGET)
+            self._async_analysis_done(entry)
+            await self._async_store_analysis(entry)
+            return
+        
+        # Use AI if requested and available
+        # The token is taken before the call so concurrent analyses cannot
+        # overspend the budget
+        if use_ai and self.ai_budget.async_try_spend(entry.level):
+            self._async_budget_changed()
+            start = time.perf_counter()
+            analysis = await self.ai_analyzer.analyze_log_entry(entry)
+            self.metrics.add_time("ai_call", time.perf_counter() - start)
             
             if analysis:
                 entry.ai_analysis = analysis.get("explanation")
                 entry.suggested_fix = analysis.get("solution")
                 entry.analyzed = True
-                self._ai_call_count += 1
                 
                 _LOGGER.info("AI analysis completed for entry: %s", entry_id)
                 
                 # Update notification with AI insights
-                await self._send_notification(entry)
+                self.notifications.async_update(entry)
+                self._changed.add(STAT_AI_BUDGET)
+                self._async_analysis_done(entry)
+                await self._async_store_analysis(entry)
 
-    async def _send_notification(self, entry: LogEntry) -> None:
-        """Send a persistent notification for a log entry."""
-        title = f"{entry.level}: {entry.component or 'Unknown'}"
-        
-        message_parts = [f"**Message:** {entry.message[:200]}"]
-        
-        if entry.entity_id:
-            message_parts.append(f"**Entity:** `{entry.entity_id}`")
-        
-        if entry.device_id:
-            message_parts.append(f"**Device ID:** `{entry.device_id}`")
-        
-        if entry.github_url:
-            message_parts.append(f"**Repository:** {entry.github_url}")
-        
-        if entry.ai_analysis:
-            message_parts.append(f"\n**AI Analysis:**\n{entry.ai_analysis}")
-        
-        if entry.suggested_fix:
-            message_parts.append(f"\n**Suggested Fix:**\n```yaml\n{entry.suggested_fix[:500]}\n```")
-        
-        message = "\n\n".join(message_parts)
-        
-        await self.hass.services.async_call(
-            "persistent_notification",
-            "create",
-            {
-                "title": title,
-                "message": message,
-                "notification_id": f"log_debugger_{entry.entry_id}",
-            },
+    @callback
+    def _async_analysis_done(self, entry: LogEntry) -> None:
+        """Publish an analysis, shown by the last error and cache statistics."""
+        if entry is self.last_error:
+            self._changed.add(STAT_LAST_ERROR)
+        self._async_publish()
+
+    async def _async_store_analysis(self, entry: LogEntry) -> None:
+        """Keep the analysis of an entry in the history database."""
+        if self.history is None:
+            return
+        self._history_analyses.append(
+            (entry.entry_id, entry.ai_analysis, entry.suggested_fix)
         )
+        await self._async_flush_history()
 
     async def async_clear_history(self) -> None:
         """Clear the log entry history."""
         self.log_entries.clear()
-        self.total_warnings = 0
-        self.total_errors = 0
-        self.total_critical = 0
+        self.signatures.clear()
+        self.notifications.async_clear()
+        self.last_error = None
+        # The level counters are lifetime totals kept by the rollups
+        self._set_stat("total_entries", 0)
+        self._set_stat("total_signatures", 0)
+        self.rates.clear()
+        self.anomalies.clear()
+        self._changed.update((STAT_LAST_ERROR, STAT_RATES, STAT_ANOMALIES))
+        self._async_publish()
+        if self.history is not None:
+            self._history_rows.clear()
+            self._history_analyses.clear()
+            self._history_until = None
+            self._history_ids = {}
+            await self.hass.async_add_executor_job(self.history.clear)
         _LOGGER.info("Log history cleared")
 
+    async def async_query_entries(
+        self,
+        *,
+        level: str | None = None,
+        component: str | None = None,
+        entity_id: str | None = None,
+        device_id: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        text: str | None = None,
+        cursor: str | None = None,
+        limit: int = DEFAULT_QUERY_LIMIT,
+        count_only: bool = False,
+        history: bool = False,
+    ) -> dict[str, Any]:
+        """Find entries, newest first, in the recent entries or the database.
+
+        Raises ValueError for a cursor from another query or an unsupported
+        filter.
+        """
+        # Entry timestamps are naive local time
+        start = _as_local_naive(start)
+        end = _as_local_naive(end)
+
+        if history:
+            return await self._async_query_history(
+                level,
+                component,
+                entity_id,
+                device_id,
+                start,
+                end,
+                text,
+                cursor,
+                limit,
+                count_only,
+            )
+
+        filters = {
+            "level": level,
+            "component": component,
+            "entity_id": entity_id,
+            "device_id": device_id,
+            "start": start,
+            "end": end,
+            "text": text,
+        }
+        if count_only:
+            return {"count": self.log_entries.count(**filters)}
+
+        before = None
+        if cursor is not None:
+            try:
+                before = int(cursor)
+            except ValueError as err:
+                raise ValueError(f"Invalid cursor: {cursor}") from err
+
+        entries, next_seq = self.log_entries.query(
+            **filters, before=before, limit=limit
+        )
+        return {
+            "entries": [self._entry_with_repeats(entry) for entry in entries],
+            "next_cursor": None if next_seq is None else str(next_seq),
+        }
+
+    def _entry_with_repeats(self, entry: LogEntry) -> dict[str, Any]:
+        """Describe a stored entry with the occurrences of its signature."""
+        data = entry.to_dict()
+        group = self.signatures.get(entry.signature)
+        if group is not None and group.entry is entry:
+            data["occurrences"] = group.count
+            data["first_seen"] = group.first_seen.isoformat()
+        else:
+            # The signature was dropped or counts a newer entry now
+            data["occurrences"] = None
+            data["first_seen"] = None
+        return data
+
+    async def _async_query_history(
+        self,
+        level: str | None,
+        component: str | None,
+        entity_id: str | None,
+        device_id: str | None,
+        start: datetime | None,
+        end: datetime | None,
+        text: str | None,
+        cursor: str | None,
+        limit: int,
+        count_only: bool,
+    ) -> dict[str, Any]:
+        """Find entries in the history database."""
+        if self.history is None:
+            raise ValueError("The history database is not enabled")
+        if entity_id is not None or device_id is not None:
+            # Entities and devices are not stored, they depend on the registries
+            raise ValueError("entity_id and device_id cannot be used with history")
+
+        filters = {
+            "level": None if level is None else LEVEL_PRIORITY.get(level, -1),
+            "component": component,
+            "start": start,
+            "end": end,
+            "text": text,
+        }
+        # Include the rows of the current batch
+        await self._async_flush_history()
+        if count_only:
+            count = await self.hass.async_add_executor_job(
+                partial(self.history.count, **filters)
+            )
+            return {"count": count}
+
+        before = None
+        if cursor is not None:
+            try:
+                timestamp, rowid = cursor.split(":")
+                before = (float(timestamp), int(rowid))
+            except ValueError as err:
+                raise ValueError(f"Invalid cursor: {cursor}") from err
+
+        rows, next_cursor = await self.hass.async_add_executor_job(
+            partial(self.history.query, **filters, before=before, limit=limit)
+        )
+        return {
+            "entries": [
+                row_to_entry(row, self._enrich_entry).to_dict() for row in rows
+            ],
+            "next_cursor": (
+                None if next_cursor is None else f"{next_cursor[0]!r}:{next_cursor[1]}"
+            ),
+        }
+
+    def get_trends(
+        self,
+        *,
+        days: int = DEFAULT_TREND_DAYS,
+        level: str | None = None,
+        component: str | None = None,
+        signature: str | None = None,
+    ) -> dict[str, Any]:
+        """Get the counts of the last days from the rollups.
+
+        The series is by hour up to a week and by day beyond, buckets
+        already rolled up to a coarser tier count at the start of their
+        hour or day.
+        """
+        end = time.time()
+        start = end - days * 86400
+        resolution = 3600 if days <= TREND_HOURLY_MAX_DAYS else 86400
+        priority = None if level is None else LEVEL_PRIORITY[level]
+        series = self.rollups.series(
+            start,
+            end,
+            resolution,
+            level=priority,
+            component=component,
+            signature=signature,
+        )
+        levels = sorted(LEVEL_PRIORITY, key=LEVEL_PRIORITY.__getitem__)
+        totals = [0] * len(levels)
+        for counts in series.values():
+            for index, count in enumerate(counts):
+                totals[index] += count
+        result: dict[str, Any] = {
+            "start": dt_util.utc_from_timestamp(start).isoformat(),
+            "end": dt_util.utc_from_timestamp(end).isoformat(),
+            "resolution": "hour" if resolution == 3600 else "day",
+            "totals": dict(zip(levels, totals)),
+            "series": [
+                {
+                    "start": dt_util.utc_from_timestamp(slot).isoformat(),
+                    **dict(zip(levels, counts)),
+                }
+                for slot, counts in series.items()
+            ],
+        }
+        if signature is None:
+            result["top_signatures"] = [
+                {"signature": key, "count": count}
+                for key, count in self.rollups.top(
+                    2, TREND_TOP_COUNT, start, end, level=priority, component=component
+                )
+            ]
+            if component is None:
+                result["top_components"] = [
+                    {"component": key, "count": count}
+                    for key, count in self.rollups.top(
+                        1, TREND_TOP_COUNT, start, end, level=priority
+                    )
+                ]
+        return result
+
     def get_recent_entries(self, count: int = 50) -> list[LogEntry]:
         """Get recent log entries."""
-        return list(self.log_entries)[-count:]
+        return self.log_entries.recent(count)
 
     def get_statistics(self) -> dict[str, Any]:
         """Get current statistics."""
         return {
-            "total_entries": len(self.log_entries),
-            "total_warnings": self.total_warnings,
-            "total_errors": self.total_errors,
-            "total_critical": self.total_critical,
-            "ai_calls_remaining": max(
-                0, self.max_ai_calls_per_hour - self._ai_call_count
-            ),
+            **self.stats,
+            **self.ai_budget.get_statistics(),
+            **self.ai_cache.get_statistics(),
+            **self.analysis_queue.get_statistics(),
+            **self.notifications.get_statistics(),
         }
@@ -0,0 +1,329 @@
+"""Low-level log file reading helpers.
+
+These helpers only use the standard library so they can be exercised from the
+benchmark scripts without a running Home Assistant instance.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+# Size of the blocks read backwards from the end of the file
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# Most bytes read by one incremental read, the rest is left for the next one
+MAX_READ_BYTES = 1024 * 1024
+
+# Limits for the continuation lines (tracebacks) kept per record
+MAX_RECORD_LINES = 200
+MAX_RECORD_BYTES = 32 * 1024
+
+
+def read_tail_lines(
+    path: str | Path,
+    max_lines: int,
+    block_size: int = TAIL_BLOCK_SIZE,
+    complete_only: bool = False,
+) -> tuple[list[str], int]:
+    """Read the last ``max_lines`` lines of a file (blocking).
+
+    The file is read in fixed-size blocks backwards from EOF until enough
+    newlines have been seen, so memory and time scale with ``max_lines`` and
+    not with the size of the file.
+
+    Args:
+        path: File to read.
+        max_lines: Maximum number of lines to return.
+        block_size: Size of the blocks read backwards from EOF.
+        complete_only: If True, an unterminated last line is left out and the
+            returned offset points just past the last newline.
+
+    Returns:
+        A tuple of the decoded lines (with line endings) and the file offset
+        the read stopped at.
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        blocks: list[bytes] = []
+        newlines = 0
+        tail_length = None
+
+        # One extra newline is needed to know where the first wanted line starts
+        while position > 0 and (newlines <= max_lines or tail_length is None):
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size)
+            blocks.append(block)
+            if tail_length is None and b"\n" in block:
+                tail_length = end - position - block.rindex(b"\n") - 1
+            newlines += block.count(b"\n")
+
+    if tail_length is None:
+        # No newline at all, the whole file is one line
+        tail_length = end
+
+    data = b"".join(reversed(blocks))
+    del blocks
+
+    lines = data.split(b"\n")
+    # split() leaves an empty item after a trailing newline, or the unterminated last line
+    last = lines.pop()
+    lines = [line + b"\n" for line in lines]
+    if complete_only:
+        end -= tail_length
+    elif last:
+        lines.append(last)
+
+    # The first line is only complete if we reached the start of the file
+    if position > 0 and lines:
+        lines.pop(0)
+
+    if max_lines <= 0:
+        return [], end
+
+    return [
+        line.decode("utf-8", errors="replace") for line in lines[-max_lines:]
+    ], end
+
+
+def _decode_lines(data: bytes) -> list[str]:
+    """Decode a block of newline-terminated lines."""
+    lines = data.decode("utf-8", errors="replace").split("\n")
+    # Only "\n" ends a line, str.splitlines() would also split on "\r" and friends
+    last = lines.pop()
+    lines = [line + "\n" for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+class LogFileReader:
+    """Byte-exact incremental reader for a rotating log file.
+
+    The reader works on raw bytes and keeps an unterminated trailing line
+    buffered until the rest of it has been written. Rotation is detected by
+    comparing the device and inode of the path with the file that was being
+    read; the remainder of the rotated file is drained before the new file is
+    read from the start. A read returns at most ``max_read_bytes``, so a large
+    backlog is read in several calls instead of all at once. Every method is
+    blocking and must run in the executor.
+    """
+
+    def __init__(self, path: str | Path, max_read_bytes: int = MAX_READ_BYTES) -> None:
+        """Initialize the reader."""
+        self.path = Path(path)
+        self.max_read_bytes = max_read_bytes
+        self._identity: tuple[int, int] | None = None
+        self._offset = 0
+        self._partial = b""
+        self._at_end = True
+
+    @property
+    def position(self) -> int:
+        """Return the offset of the next unread byte in the current file."""
+        return self._offset
+
+    @property
+    def at_end(self) -> bool:
+        """Return False if the last read stopped before the end of the file."""
+        return self._at_end
+
+    @property
+    def pending_bytes(self) -> int:
+        """Return the number of buffered bytes of an unterminated line."""
+        return len(self._partial)
+
+    def seek_to_end(self) -> None:
+        """Skip everything currently in the file up to its last complete line."""
+        self.read_tail(0)
+
+    def read_tail(self, max_lines: int) -> list[str]:
+        """Read the last complete lines and continue incrementally from there."""
+        stat = os.stat(self.path)
+        lines, self._offset = read_tail_lines(
+            self.path, max_lines, complete_only=True
+        )
+        self._identity = (stat.st_dev, stat.st_ino)
+        self._partial = b""
+        self._at_end = True
+        return lines
+
+    def read_new_lines(self) -> list[str]:
+        """Read the complete lines written since the previous call.
+
+        At most ``max_read_bytes`` are read, ``at_end`` tells if there is
+        more to read.
+        """
+        self._at_end = True
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        identity = (stat.st_dev, stat.st_ino)
+
+        if self._identity is None:
+            self._identity = identity
+        elif identity != self._identity:
+            lines = self._drain_rotated()
+            if self._at_end:
+                _LOGGER.info("Log file rotated, reading the new file")
+                self._identity = identity
+                self._offset = 0
+                self._partial = b""
+                # The new file is read by the next call
+                self._at_end = False
+            return lines
+        elif stat.st_size < self._offset:
+            _LOGGER.info("Log file truncated, resetting position")
+            self._offset = 0
+            self._partial = b""
+
+        try:
+            with open(self.path, "rb") as f:
+                opened = os.fstat(f.fileno())
+                if (opened.st_dev, opened.st_ino) != self._identity:
+                    # Rotated between stat() and open(), pick it up on the next call
+                    return []
+                f.seek(self._offset)
+                data = f.read(self.max_read_bytes)
+                self._at_end = f.tell() >= os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return []
+
+        self._offset += len(data)
+        data = self._partial + data
+        split = data.rfind(b"\n") + 1
+        self._partial = data[split:]
+        return _decode_lines(data[:split])
+
+    def _drain_rotated(self) -> list[str]:
+        """Read what is left of the file that was rotated away.
+
+        Like other reads, at most ``max_read_bytes`` are read and ``at_end``
+        is False if the rotated file has more.
+        """
+        candidates = [self.path.with_name(f"{self.path.name}.1")]
+        candidates.extend(
+            sorted(self.path.parent.glob(f"{self.path.name}.*"), reverse=True)
+        )
+
+        for candidate in candidates:
+            try:
+                stat = os.stat(candidate)
+            except OSError:
+                continue
+            if (stat.st_dev, stat.st_ino) != self._identity:
+                continue
+            with open(candidate, "rb") as f:
+                f.seek(self._offset)
+                data = self._partial + f.read(self.max_read_bytes)
+                self._offset = f.tell()
+            if self._offset < stat.st_size:
+                self._at_end = False
+                split = data.rfind(b"\n") + 1
+                self._partial = data[split:]
+                return _decode_lines(data[:split])
+            # The rotated file will not grow any more, so its last line is final
+            return _decode_lines(data)
+
+        _LOGGER.warning(
+            "Rotated log file not found, unread lines after offset %d were lost",
+            self._offset,
+        )
+        return _decode_lines(self._partial)
+
+
+def is_header_line(line: str) -> bool:
+    """Check if a line starts a new record (begins with a timestamp)."""
+    return (
+        len(line) > 19
+        and line[4] == "-"
+        and line[7] == "-"
+        and line[13] == ":"
+        and line[16] == ":"
+        and line[0].isdigit()
+    )
+
+
+class LogRecordAssembler:
+    """Group continuation lines with the header line they belong to.
+
+    Multi-line records, such as an ERROR followed by its traceback, are
+    assembled incrementally: the last record of a batch is held back until
+    the next header arrives or the caller knows the record is complete.
+    Records are yielded as ``(header, continuation)`` tuples where the
+    continuation is None for single-line records.
+    """
+
+    def __init__(
+        self,
+        max_lines: int = MAX_RECORD_LINES,
+        max_bytes: int = MAX_RECORD_BYTES,
+    ) -> None:
+        """Initialize the assembler."""
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._header: str | None = None
+        self._continuation: list[str] = []
+        self._size = 0
+        self._truncated = False
+        self.truncated_records = 0
+        self.orphan_lines = 0
+
+    def feed(
+        self, lines: list[str], flush: bool = False
+    ) -> list[tuple[str, str | None]]:
+        """Add lines and return the records that are complete.
+
+        Args:
+            lines: New physical lines in file order.
+            flush: If True, the last record is known to be complete as well.
+        """
+        records: list[tuple[str, str | None]] = []
+
+        for line in lines:
+            if is_header_line(line):
+                if self._header is not None:
+                    records.append(self._take())
+                self._header = line
+            elif self._header is None:
+                # Continuation of a record we never saw the start of
+                self.orphan_lines += 1
+            elif (
+                len(self._continuation) < self.max_lines
+                and self._size + len(line) <= self.max_bytes
+            ):
+                self._continuation.append(line)
+                self._size += len(line)
+            else:
+                self._truncated = True
+
+        if flush and self._header is not None:
+            records.append(self._take())
+
+        return records
+
+    def reset(self) -> None:
+        """Drop the record being assembled."""
+        self._header = None
+        self._continuation = []
+        self._size = 0
+        self._truncated = False
+
+    def _take(self) -> tuple[str, str | None]:
+        """Return the pending record and start over."""
+        header = self._header
+        continuation = None
+        if self._continuation:
+            continuation = "".join(self._continuation).rstrip("\n")
+            if self._truncated:
+                self.truncated_records += 1
+                continuation += "\n[...]"
+        self.reset()
+        return header, continuation
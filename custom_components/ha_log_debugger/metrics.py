@@ -0,0 +1,121 @@
+"""Timing histograms and counters of the log processing stages.
+
+Only uses the standard library so it can be benchmarked without a running
+Home Assistant instance.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds of the histogram buckets in milliseconds, the last bucket
+# holds everything slower
+BUCKET_BOUNDS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# Timed stages, per scan or batch unless noted
+STAGES = (
+    "scan",  # reading and processing the new lines of the log file
+    "file_read",  # reading new lines, in the executor
+    "parse",  # turning records into entries
+    "process",  # deduplication, statistics and storage of entries
+    "enrich",  # per entry, when its details are first read
+    "registry_lookup",  # per enriched entry that mentions entities
+    "notification",  # per persistent notification service call
+    "ai_call",  # per AI analysis request
+)
+
+COUNTERS = (
+    "scans",
+    "lines_read",
+    "records",
+    "records_accepted",  # at or above the level, not excluded
+    "records_skipped",  # below the level or from excluded integrations
+    "records_duplicate",  # read again, e.g. by a full scan
+)
+
+
+class Histogram:
+    """Count, total, maximum and bucketed distribution of durations."""
+
+    __slots__ = ("buckets", "count", "total", "max", "last")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add a duration."""
+        milliseconds = seconds * 1000
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.last = milliseconds
+        if milliseconds > self.max:
+            self.max = milliseconds
+
+    def percentile(self, fraction: float) -> float | None:
+        """Estimate a percentile as the upper bound of its bucket."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, round(self.max, 3))
+        # In the open last bucket, bounded by the maximum
+        return round(self.max, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Describe the histogram in milliseconds."""
+        labels = [f"<={bound}" for bound in BUCKET_BOUNDS_MS]
+        labels.append(f">{BUCKET_BOUNDS_MS[-1]}")
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "last_ms": round(self.last, 3),
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "buckets_ms": dict(zip(labels, self.buckets)),
+        }
+
+
+class Metrics:
+    """Timings per stage and counters, cheap enough for the hot paths.
+
+    Callers take time.perf_counter() around a stage and add the difference,
+    a histogram update is a bisect over ten bounds and a few additions.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.timings = {stage: Histogram() for stage in STAGES}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        # Bytes written to the log file that were not read yet, after a scan
+        self.bytes_behind = 0
+        self.max_bytes_behind = 0
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add the duration of a stage."""
+        self.timings[stage].add(seconds)
+
+    def set_bytes_behind(self, value: int) -> None:
+        """Set the unread bytes of the log file."""
+        self.bytes_behind = value
+        if value > self.max_bytes_behind:
+            self.max_bytes_behind = value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Describe all metrics."""
+        return {
+            "timings": {stage: timing.as_dict() for stage, timing in self.timings.items()},
+            "counters": dict(self.counters),
+            "bytes_behind": self.bytes_behind,
+            "max_bytes_behind": self.max_bytes_behind,
+        }
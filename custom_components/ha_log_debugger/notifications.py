@@ -0,0 +1,210 @@
+"""Coalescing persistent notification dispatcher."""
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import MAX_NOTIFICATION_BATCHES
+from .metrics import Metrics
+
+if TYPE_CHECKING:
+    from .log_entry import LogEntry
+
+
+@dataclass
+class NotificationBatch:
+    """Occurrences of one signature shown in a single notification."""
+
+    notification_id: str
+    entry: LogEntry
+    first_seen: datetime
+    last_seen: datetime
+    count: int = 0
+    last_sent: float | None = None
+
+
+class NotificationDispatcher:
+    """Send persistent notifications, coalescing repeats.
+
+    Every signature has one notification that is updated in place with an
+    occurrence count. A signature's notification is updated at most once per
+    window, and no more than a set number of notifications are sent per
+    minute in total; anything held back is sent by a single timer.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        get_window: Callable[[], float],
+        get_max_per_minute: Callable[[], int],
+        metrics: Metrics,
+    ) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._metrics = metrics
+        self._get_window = get_window
+        self._get_max_per_minute = get_max_per_minute
+        self._batches: OrderedDict[str, NotificationBatch] = OrderedDict()
+        self._dirty: dict[str, None] = {}
+        self._sent_times: deque[float] = deque()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self.sent = 0
+        self.coalesced = 0
+
+    @callback
+    def async_add_occurrence(self, entry: LogEntry, seen: datetime) -> None:
+        """Count an occurrence of an entry's message."""
+        batch = self._get_batch(entry)
+        batch.count += 1
+        batch.last_seen = seen
+        if batch.notification_id in self._dirty:
+            self.coalesced += 1
+        self._mark_dirty(batch)
+
+    @callback
+    def async_update(self, entry: LogEntry) -> None:
+        """Refresh the notification of an entry, e.g. after AI analysis."""
+        batch = self._get_batch(entry)
+        batch.entry = entry
+        batch.count = max(batch.count, 1)
+        self._mark_dirty(batch)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel pending notifications."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+    @callback
+    def async_clear(self) -> None:
+        """Forget all batches, new occurrences start new counts."""
+        self.async_stop()
+        self._batches.clear()
+        self._dirty.clear()
+
+    def _get_batch(self, entry: LogEntry) -> NotificationBatch:
+        """Get or create the batch of an entry."""
+        notification_id = f"log_debugger_{entry.signature or entry.entry_id}"
+        batch = self._batches.get(notification_id)
+        if batch is None:
+            batch = NotificationBatch(
+                notification_id=notification_id,
+                entry=entry,
+                first_seen=entry.timestamp,
+                last_seen=entry.timestamp,
+            )
+            self._batches[notification_id] = batch
+            if len(self._batches) > MAX_NOTIFICATION_BATCHES:
+                evicted, _ = self._batches.popitem(last=False)
+                self._dirty.pop(evicted, None)
+        else:
+            self._batches.move_to_end(notification_id)
+        return batch
+
+    def _mark_dirty(self, batch: NotificationBatch) -> None:
+        """Schedule a batch to be sent."""
+        self._dirty[batch.notification_id] = None
+        self._async_flush()
+
+    @callback
+    def _async_flush(self, _now: Any = None) -> None:
+        """Send the notifications that are due and allowed by the rate limit."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+        now = time.monotonic()
+        window = self._get_window()
+        max_per_minute = self._get_max_per_minute()
+        while self._sent_times and self._sent_times[0] <= now - 60:
+            self._sent_times.popleft()
+
+        next_due: float | None = None
+        for notification_id in list(self._dirty):
+            batch = self._batches[notification_id]
+            due = now if batch.last_sent is None else batch.last_sent + window
+            if len(self._sent_times) >= max_per_minute:
+                due = max(due, self._sent_times[0] + 60)
+            if due > now:
+                next_due = due if next_due is None else min(next_due, due)
+                continue
+
+            del self._dirty[notification_id]
+            batch.last_sent = now
+            self._sent_times.append(now)
+            self._send(batch)
+
+        if next_due is not None:
+            self._unsub_flush = async_call_later(
+                self.hass, next_due - now, self._async_flush
+            )
+
+    def _send(self, batch: NotificationBatch) -> None:
+        """Create or update the notification of a batch."""
+        self.sent += 1
+        self.hass.async_create_task(
+            self._async_call(
+                {
+                    "title": f"{batch.entry.level}: {batch.entry.component or 'Unknown'}",
+                    "message": self._format_message(batch),
+                    "notification_id": batch.notification_id,
+                }
+            )
+        )
+
+    async def _async_call(self, data: dict[str, Any]) -> None:
+        """Call the notification service and time it."""
+        start = time.perf_counter()
+        await self.hass.services.async_call("persistent_notification", "create", data)
+        self._metrics.add_time("notification", time.perf_counter() - start)
+
+    @staticmethod
+    def _format_message(batch: NotificationBatch) -> str:
+        """Build the notification text."""
+        entry = batch.entry
+        message_parts = [f"**Message:** {entry.message[:200]}"]
+
+        if batch.count > 1:
+            message_parts.append(
+                f"**Occurrences:** {batch.count} "
+                f"(first {batch.first_seen:%Y-%m-%d %H:%M:%S}, "
+                f"last {batch.last_seen:%Y-%m-%d %H:%M:%S})"
+            )
+
+        if entry.exception:
+            message_parts.append(
+                f"**Exception:** `{entry.exception.splitlines()[-1][:200]}`"
+            )
+
+        if entry.entity_id:
+            message_parts.append(f"**Entity:** `{entry.entity_id}`")
+
+        if entry.device_id:
+            message_parts.append(f"**Device ID:** `{entry.device_id}`")
+
+        if entry.github_url:
+            message_parts.append(f"**Repository:** {entry.github_url}")
+
+        if entry.ai_analysis:
+            message_parts.append(f"\n**AI Analysis:**\n{entry.ai_analysis}")
+
+        if entry.suggested_fix:
+            message_parts.append(f"\n**Suggested Fix:**\n```yaml\n{entry.suggested_fix[:500]}\n```")
+
+        return "\n\n".join(message_parts)
+
+    def get_statistics(self) -> dict[str, int]:
+        """Get dispatcher counters."""
+        return {
+            "notifications_sent": self.sent,
+            "notifications_coalesced": self.coalesced,
+            "notifications_pending": len(self._dirty),
+        }
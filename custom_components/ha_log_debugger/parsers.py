@@ -1,14 +1,20 @@
 """Log entry parsing and pattern matching."""
 from __future__ import annotations
 
+import logging
 import re
+import time
 from typing import TYPE_CHECKING
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 
+from .metrics import Metrics
+
 if TYPE_CHECKING:
-    from .log_monitor import LogEntry
+    from .log_entry import LogEntry
+
+_LOGGER = logging.getLogger(__name__)
 
 # Known integration GitHub repositories
 INTEGRATION_REPOS = {
@@ -25,15 +31,131 @@ INTEGRATION_REPOS = {
     "sensor": "https://github.com/home-assistant/core/tree/dev/homeassistant/components/sensor",
 }
 
+# Common error patterns and their explanations, checked in order
+ERROR_PATTERNS = (
+    (
+        "unknown",
+        re.compile(r"(state|value).*unknown"),
+        "A sensor or entity has an 'unknown' state, usually because it hasn't received data yet or the source is unavailable.",
+    ),
+    (
+        "unavailable",
+        re.compile(r"(state|entity).*unavailable"),
+        "An entity is unavailable, typically because the device is offline or the integration cannot communicate with it.",
+    ),
+    (
+        "timeout",
+        re.compile(r"timeout|timed out"),
+        "A connection or operation exceeded the allowed time limit. This often indicates network issues or an overloaded device.",
+    ),
+    (
+        "connection",
+        re.compile(r"connection.*(?:refused|failed|error|reset)"),
+        "Failed to establish a connection to a device or service. Check network connectivity and service availability.",
+    ),
+    (
+        "template",
+        re.compile(r"template.*error|error.*rendering"),
+        "A Jinja2 template has an error. This is usually due to referencing undefined variables or incorrect syntax.",
+    ),
+    (
+        "energy",
+        re.compile(r"energy.*calculation|calculate.*energy"),
+        "Energy calculation failed, often because one or more energy sensors have invalid or missing values.",
+    ),
+    (
+        "setup",
+        re.compile(r"setup.*failed|failed.*setup"),
+        "An integration or component failed to set up properly. Check the configuration and logs for more details.",
+    ),
+    (
+        "authentication",
+        re.compile(r"auth(?:entication)?.*(?:failed|error)|invalid.*(?:token|key|password|credentials)"),
+        "Authentication failed. Check your credentials, API keys, or tokens for this integration.",
+    ),
+)
+
+# Values extracted into the context of an entry
+NUMBER_PATTERN = re.compile(r"\b\d+\.?\d*\b")
+FILE_PATH_PATTERN = re.compile(r"[/\\][\w/\\.-]+\.\w+")
+IP_ADDRESS_PATTERN = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
+URL_PATTERN = re.compile(r"https?://[^\s]+")
+
+# Candidate entity IDs: domain.object_id not preceded by a word or a dot,
+# so module paths like homeassistant.components.x do not match in the middle
+ENTITY_ID_CANDIDATE = re.compile(r"(?<![\w.])[a-z0-9_]+\.[a-z0-9_]+")
+
+
+class EntityIdIndex:
+    """Set of registered entity IDs kept in sync with the entity registry.
+
+    Messages are scanned once for candidate tokens and every candidate is
+    checked against the set, so all real entity references are found in a
+    single linear pass without touching the registry.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self._entity_ids: set[str] | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Follow entity registry updates."""
+        self._unsub = self.hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following entity registry updates."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @property
+    def entity_ids(self) -> set[str]:
+        """Get the registered entity IDs, built on first use."""
+        if self._entity_ids is None:
+            self._entity_ids = set(er.async_get(self.hass).entities)
+        return self._entity_ids
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        """Apply an entity registry change to the index."""
+        if self._entity_ids is None:
+            return
+        action = event.data["action"]
+        entity_id = event.data["entity_id"]
+        if action == "create":
+            self._entity_ids.add(entity_id)
+        elif action == "remove":
+            self._entity_ids.discard(entity_id)
+        elif action == "update" and "old_entity_id" in event.data:
+            self._entity_ids.discard(event.data["old_entity_id"])
+            self._entity_ids.add(entity_id)
+
+    def find(self, message: str) -> list[str]:
+        """Find all registered entity IDs mentioned in a message, in order."""
+        entity_ids = self.entity_ids
+        found: list[str] = []
+        for candidate in ENTITY_ID_CANDIDATE.findall(message.lower()):
+            if candidate in entity_ids and candidate not in found:
+                found.append(candidate)
+        return found
+
 
 class LogParser:
     """Parse and extract information from log entries."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(self, hass: HomeAssistant, metrics: Metrics | None = None) -> None:
         """Initialize the parser."""
         self.hass = hass
+        self.metrics = metrics or Metrics()
         self._entity_registry = None
         self._device_registry = None
+        self.entity_index = EntityIdIndex(hass)
 
     @property
     def entity_registry(self) -> er.EntityRegistry:
@@ -49,24 +171,45 @@ class LogParser:
             self._device_registry = dr.async_get(self.hass)
         return self._device_registry
 
-    async def parse_entry(self, entry: LogEntry) -> None:
-        """Parse a log entry and extract relevant information."""
+    @callback
+    def enrich_entry(self, entry: LogEntry) -> None:
+        """Extract entities, device, repository and context of an entry.
+
+        Used as the deferred enricher of entries, so it runs the first time
+        one of these fields is read and never for entries nobody looks at.
+        """
+        start = time.perf_counter()
+        try:
+            self._enrich_entry(entry)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Error enriching log entry %s: %s", entry.entry_id, err)
+        self.metrics.add_time("enrich", time.perf_counter() - start)
+
+    def _enrich_entry(self, entry: LogEntry) -> None:
+        """Extract entities, device, repository and context of an entry."""
         # Extract entity IDs
-        entity_id = self._extract_entity_id(entry.message)
-        if entity_id:
-            entry.entity_id = entity_id
+        entry.entity_ids = self.entity_index.find(entry.message)
+        if entry.entity_ids:
+            start = time.perf_counter()
+            # Try to get device from the first entity that has one
+            for entity_id in entry.entity_ids:
+                entity = self.entity_registry.async_get(entity_id)
+                if entity and entity.device_id:
+                    break
+            else:
+                entity = None
             
-            # Try to get device from entity
-            entity = self.entity_registry.async_get(entity_id)
-            if entity and entity.device_id:
+            if entity:
                 entry.device_id = entity.device_id
                 
                 # Get device info
                 device = self.device_registry.async_get(entity.device_id)
                 if device:
-                    entry.context["device_name"] = device.name_by_user or device.name
-                    entry.context["manufacturer"] = device.manufacturer
-                    entry.context["model"] = device.model
+                    context = entry.details.context
+                    context["device_name"] = device.name_by_user or device.name
+                    context["manufacturer"] = device.manufacturer
+                    context["model"] = device.model
+            self.metrics.add_time("registry_lookup", time.perf_counter() - start)
 
         # Extract GitHub URL
         if entry.component:
@@ -75,28 +218,6 @@ class LogParser:
         # Extract additional context
         self._extract_context(entry)
 
-    def _extract_entity_id(self, message: str) -> str | None:
-        """Extract entity ID from log message."""
-        # Pattern: domain.entity_name
-        patterns = [
-            r"entity[:\s]+([a-z_]+\.[a-z0-9_]+)",
-            r"'([a-z_]+\.[a-z0-9_]+)'",
-            r"`([a-z_]+\.[a-z0-9_]+)`",
-            r"\b([a-z_]+\.[a-z0-9_]+)\b",
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
-            if match:
-                entity_id = match.group(1)
-                # Validate it's a real entity format
-                if "." in entity_id and len(entity_id.split(".")) == 2:
-                    # Check if entity exists
-                    if self.entity_registry.async_get(entity_id):
-                        return entity_id
-        
-        return None
-
     def _get_github_url(self, component: str) -> str | None:
         """Get GitHub URL for a component."""
         # Check known repos
@@ -119,68 +240,28 @@ class LogParser:
         """Extract additional context from the log message."""
         message = entry.message.lower()
         
-        # Common error patterns and their explanations
-        patterns = {
-            "unknown": {
-                "pattern": r"(state|value).*unknown",
-                "explanation": "A sensor or entity has an 'unknown' state, usually because it hasn't received data yet or the source is unavailable.",
-            },
-            "unavailable": {
-                "pattern": r"(state|entity).*unavailable",
-                "explanation": "An entity is unavailable, typically because the device is offline or the integration cannot communicate with it.",
-            },
-            "timeout": {
-                "pattern": r"timeout|timed out",
-                "explanation": "A connection or operation exceeded the allowed time limit. This often indicates network issues or an overloaded device.",
-            },
-            "connection": {
-                "pattern": r"connection.*(?:refused|failed|error|reset)",
-                "explanation": "Failed to establish a connection to a device or service. Check network connectivity and service availability.",
-            },
-            "template": {
-                "pattern": r"template.*error|error.*rendering",
-                "explanation": "A Jinja2 template has an error. This is usually due to referencing undefined variables or incorrect syntax.",
-            },
-            "energy": {
-                "pattern": r"energy.*calculation|calculate.*energy",
-                "explanation": "Energy calculation failed, often because one or more energy sensors have invalid or missing values.",
-            },
-            "setup": {
-                "pattern": r"setup.*failed|failed.*setup",
-                "explanation": "An integration or component failed to set up properly. Check the configuration and logs for more details.",
-            },
-            "authentication": {
-                "pattern": r"auth(?:entication)?.*(?:failed|error)|invalid.*(?:token|key|password|credentials)",
-                "explanation": "Authentication failed. Check your credentials, API keys, or tokens for this integration.",
-            },
-        }
-        
-        for error_type, info in patterns.items():
-            if re.search(info["pattern"], message):
-                entry.context["error_type"] = error_type
-                entry.context["basic_explanation"] = info["explanation"]
+        for error_type, pattern, explanation in ERROR_PATTERNS:
+            if pattern.search(message):
+                entry.details.context["error_type"] = error_type
+                entry.details.context["basic_explanation"] = explanation
                 break
         
         # Extract numbers that might be relevant
-        numbers = re.findall(r"\b\d+\.?\d*\b", entry.message)
+        numbers = NUMBER_PATTERN.findall(entry.message)
         if numbers:
-            entry.context["numbers"] = numbers
+            entry.details.context["numbers"] = numbers
         
         # Extract file paths
-        file_paths = re.findall(r"[/\\][\w/\\.-]+\.\w+", entry.message)
+        file_paths = FILE_PATH_PATTERN.findall(entry.message)
         if file_paths:
-            entry.context["file_paths"] = file_paths
+            entry.details.context["file_paths"] = file_paths
         
         # Extract IP addresses
-        ip_addresses = re.findall(
-            r"\b(?:\d{1,3}\.){3}\d{1,3}\b", entry.message
-        )
+        ip_addresses = IP_ADDRESS_PATTERN.findall(entry.message)
         if ip_addresses:
-            entry.context["ip_addresses"] = ip_addresses
+            entry.details.context["ip_addresses"] = ip_addresses
         
         # Extract URLs
-        urls = re.findall(
-            r"https?://[^\s]+", entry.message
-        )
+        urls = URL_PATTERN.findall(entry.message)
         if urls:
-            entry.context["urls"] = urls
+            entry.details.context["urls"] = urls
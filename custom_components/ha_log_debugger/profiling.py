@@ -0,0 +1,74 @@
+"""Summaries of profiled log scans.
+
+Only uses the standard library so it can be benchmarked without a running
+Home Assistant instance.
+"""
+from __future__ import annotations
+
+import cProfile
+from pathlib import Path
+import pstats
+import tracemalloc
+from typing import Any
+
+# pstats sort keys offered by the profile_scan service
+PROFILE_SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+
+def profile_hotspots(
+    profiler: cProfile.Profile, sort: str, count: int
+) -> list[dict[str, Any]]:
+    """Get the functions that took the most time, as pstats sorts them."""
+    stats = pstats.Stats(profiler)
+    stats.sort_stats(sort)
+    hotspots = []
+    for function in stats.fcn_list[:count]:
+        primitive_calls, calls, total, cumulative, _ = stats.stats[function]
+        filename, line, name = function
+        hotspots.append(
+            {
+                "function": name,
+                "file": filename,
+                "line": line,
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+        )
+    return hotspots
+
+
+def memory_hotspots(
+    snapshot: tracemalloc.Snapshot, count: int
+) -> list[dict[str, Any]]:
+    """Get the source lines holding the most memory allocated while tracing."""
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kib": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:count]
+    ]
+
+
+def write_profile(
+    profiler: cProfile.Profile, directory: Path, name: str, sort: str, keep: int
+) -> Path:
+    """Write the sorted statistics and the raw profile, keep the newest files.
+
+    The text file is what pstats prints, the .prof file can be loaded by
+    pstats or a profile viewer. Returns the path of the text file.
+    """
+    directory.mkdir(exist_ok=True)
+    path = directory / f"{name}.txt"
+    with open(path, "w", encoding="utf-8") as file:
+        pstats.Stats(profiler, stream=file).sort_stats(sort).print_stats()
+    profiler.dump_stats(directory / f"{name}.prof")
+
+    # Names start with the time, so they sort by age
+    for suffix in ("txt", "prof"):
+        for old in sorted(directory.glob(f"*.{suffix}"))[:-keep]:
+            old.unlink(missing_ok=True)
+    return path
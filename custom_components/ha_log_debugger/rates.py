@@ -0,0 +1,147 @@
+"""Per-component log rates kept in fixed-size time buckets.
+
+Only uses the standard library so it can be benchmarked without a running
+Home Assistant instance.
+"""
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+import heapq
+
+from .line_parser import LEVEL_PRIORITY
+
+_LEVELS = len(LEVEL_PRIORITY)
+_ZEROS = array("L", [0]) * _LEVELS
+
+
+def _by_level(totals: list[int]) -> dict[str, int]:
+    """Name the per-level totals of a window."""
+    return {level: totals[priority - 1] for level, priority in LEVEL_PRIORITY.items()}
+
+
+class RateBuckets:
+    """Counts per level for the last minutes, in a ring of one-minute buckets.
+
+    Minute m is counted in bucket m % size. Buckets of minutes that passed
+    without records are zeroed when the ring moves past them, so recording
+    is O(1) amortized and a window sum is O(minutes) whatever the number of
+    records.
+    """
+
+    __slots__ = ("size", "_counts", "_minute")
+
+    def __init__(self, size: int) -> None:
+        """Initialize empty buckets."""
+        self.size = size
+        self._counts = array("L", [0]) * (size * _LEVELS)
+        # Newest minute in the ring
+        self._minute: int | None = None
+
+    def _advance(self, minute: int) -> None:
+        """Move the ring forward to a newer minute."""
+        if self._minute is None or minute - self._minute >= self.size:
+            self._counts = array("L", [0]) * (self.size * _LEVELS)
+        else:
+            for skipped in range(self._minute + 1, minute + 1):
+                start = (skipped % self.size) * _LEVELS
+                self._counts[start : start + _LEVELS] = _ZEROS
+        self._minute = minute
+
+    def add(self, minute: int, priority: int) -> bool:
+        """Count a record, return False if it is older than the ring."""
+        if self._minute is None or minute > self._minute:
+            self._advance(minute)
+        elif minute <= self._minute - self.size:
+            return False
+        self._counts[(minute % self.size) * _LEVELS + priority - 1] += 1
+        return True
+
+    def totals(self, now: int, minutes: int) -> list[int]:
+        """Sum the counts per level of the minutes up to now, by priority - 1."""
+        totals = [0] * _LEVELS
+        if self._minute is None:
+            return totals
+        first = max(now - min(minutes, self.size) + 1, self._minute - self.size + 1)
+        counts = self._counts
+        for minute in range(first, min(now, self._minute) + 1):
+            start = (minute % self.size) * _LEVELS
+            for level in range(_LEVELS):
+                totals[level] += counts[start + level]
+        return totals
+
+    def is_idle(self, now: int) -> bool:
+        """Check if nothing was counted in the minutes the ring covers."""
+        return self._minute is None or self._minute <= now - self.size
+
+
+class RateTracker:
+    """Recent record counts of every component.
+
+    Only counts are kept, never the records, so rates cost the same memory
+    whatever the log volume. The least recently logging component is
+    dropped beyond max_components.
+    """
+
+    def __init__(self, minutes: int, max_components: int) -> None:
+        """Initialize the tracker."""
+        self.minutes = minutes
+        self.max_components = max_components
+        self._components: OrderedDict[str, RateBuckets] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of tracked components."""
+        return len(self._components)
+
+    def record(self, component: str, priority: int, timestamp: float) -> bool:
+        """Count a record logged at a POSIX timestamp.
+
+        Returns False if it is older than the tracked minutes.
+        """
+        buckets = self._components.get(component)
+        if buckets is None:
+            buckets = self._components[component] = RateBuckets(self.minutes)
+            if len(self._components) > self.max_components:
+                self._components.popitem(last=False)
+        else:
+            self._components.move_to_end(component)
+        return buckets.add(int(timestamp // 60), priority)
+
+    def counts(self, component: str, now: float, minutes: int) -> dict[str, int]:
+        """Get the records per level of a component in the last minutes."""
+        buckets = self._components.get(component)
+        if buckets is None:
+            return _by_level([0] * _LEVELS)
+        return _by_level(buckets.totals(int(now // 60), minutes))
+
+    def top(
+        self, count: int, now: float, minutes: int
+    ) -> list[tuple[str, dict[str, int]]]:
+        """Get the components with the most records in the last minutes."""
+        minute = int(now // 60)
+        totals = (
+            (component, buckets.totals(minute, minutes))
+            for component, buckets in self._components.items()
+        )
+        return [
+            (component, _by_level(levels))
+            for component, levels in heapq.nlargest(
+                count,
+                (item for item in totals if any(item[1])),
+                key=lambda item: sum(item[1]),
+            )
+        ]
+
+    def prune(self, now: float) -> None:
+        """Drop the components that logged nothing in the tracked minutes."""
+        minute = int(now // 60)
+        for component in [
+            component
+            for component, buckets in self._components.items()
+            if buckets.is_idle(minute)
+        ]:
+            del self._components[component]
+
+    def clear(self) -> None:
+        """Drop all counts."""
+        self._components.clear()
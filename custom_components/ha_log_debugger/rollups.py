@@ -0,0 +1,198 @@
+"""Record counts rolled up by minute, hour and day.
+
+Only uses the standard library so it can be benchmarked without a running
+Home Assistant instance.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+import heapq
+from typing import Any
+
+from .line_parser import LEVEL_PRIORITY
+
+_LEVELS = len(LEVEL_PRIORITY)
+
+# (priority, component, signature), "" when there is none
+RollupKey = tuple[int, str, str]
+Bucket = dict[RollupKey, int]
+
+
+def _add(bucket: Bucket, key: RollupKey, count: int, max_keys: int) -> None:
+    """Add to a key of a bucket, folding new keys of a full bucket.
+
+    Beyond max_keys, new signatures are counted on their component and new
+    components on their level, so a bucket stays bounded whatever the
+    variety of the log.
+    """
+    if key not in bucket and len(bucket) >= max_keys:
+        key = (key[0], key[1], "")
+        if key not in bucket and len(bucket) >= max_keys:
+            key = (key[0], "", "")
+    bucket[key] = bucket.get(key, 0) + count
+
+
+class RollupEngine:
+    """Counts per level, component and signature in time tiers.
+
+    Records are counted in one-minute buckets. Buckets older than the
+    retention of their tier are merged into the bucket of the next, coarser
+    tier that covers them, and dropped from the last tier, so a count is
+    in exactly one tier at a time and memory is bounded by the number of
+    buckets and keys per bucket, not by the number of records.
+
+    Lifetime totals per level are kept next to the tiers. The engine
+    remembers the newest recorded time, and once restored ignores records
+    up to it, which were counted before the restart.
+    """
+
+    def __init__(
+        self, tiers: tuple[tuple[int, int], ...], max_keys: int
+    ) -> None:
+        """Initialize the engine with (seconds, retained buckets) per tier."""
+        self.tiers = tiers
+        self.max_keys = max_keys
+        self._buckets: list[dict[int, Bucket]] = [{} for _ in tiers]
+        self.totals = [0] * _LEVELS
+        self.watermark = 0.0
+        self._restored_until = 0.0
+
+    def record(
+        self,
+        timestamp: float,
+        priority: int,
+        component: str | None,
+        signature: str | None,
+    ) -> bool:
+        """Count a record, return False if it was counted before a restart."""
+        if timestamp <= self._restored_until:
+            return False
+        seconds = self.tiers[0][0]
+        start = int(timestamp // seconds) * seconds
+        minutes = self._buckets[0]
+        bucket = minutes.get(start)
+        new_bucket = bucket is None
+        if new_bucket:
+            bucket = minutes[start] = {}
+        _add(bucket, (priority, component or "", signature or ""), 1, self.max_keys)
+        self.totals[priority - 1] += 1
+        if timestamp > self.watermark:
+            self.watermark = timestamp
+        if new_bucket:
+            self.compact()
+        return True
+
+    def compact(self, now: float | None = None) -> None:
+        """Move buckets past the retention of their tier to the next tier."""
+        now = max(self.watermark, now or 0.0)
+        last = len(self.tiers) - 1
+        for tier, (seconds, retained) in enumerate(self.tiers):
+            cutoff = now - seconds * retained
+            buckets = self._buckets[tier]
+            expired = [start for start in buckets if start + seconds <= cutoff]
+            for start in expired:
+                bucket = buckets.pop(start)
+                if tier == last:
+                    continue
+                coarse = self.tiers[tier + 1][0]
+                target = self._buckets[tier + 1].setdefault(
+                    start // coarse * coarse, {}
+                )
+                for key, count in bucket.items():
+                    _add(target, key, count, self.max_keys)
+
+    def _counts(
+        self,
+        start: float,
+        end: float,
+        level: int | None,
+        component: str | None,
+        signature: str | None,
+    ) -> Iterator[tuple[int, RollupKey, int]]:
+        """Yield the bucket start, key and count of matching keys in a range."""
+        for (seconds, _), buckets in zip(self.tiers, self._buckets):
+            for bucket_start, bucket in buckets.items():
+                if bucket_start + seconds <= start or bucket_start >= end:
+                    continue
+                for key, count in bucket.items():
+                    if (
+                        (level is None or key[0] == level)
+                        and (component is None or key[1] == component)
+                        and (signature is None or key[2] == signature)
+                    ):
+                        yield bucket_start, key, count
+
+    def series(
+        self,
+        start: float,
+        end: float,
+        resolution: int,
+        *,
+        level: int | None = None,
+        component: str | None = None,
+        signature: str | None = None,
+    ) -> dict[int, list[int]]:
+        """Sum the counts per level by slots of resolution seconds.
+
+        Buckets coarser than the resolution are counted in the slot of
+        their start.
+        """
+        slots: dict[int, list[int]] = {}
+        for bucket_start, key, count in self._counts(
+            start, end, level, component, signature
+        ):
+            slot = slots.get(bucket_start // resolution * resolution)
+            if slot is None:
+                slot = slots[bucket_start // resolution * resolution] = [0] * _LEVELS
+            slot[key[0] - 1] += count
+        return dict(sorted(slots.items()))
+
+    def top(
+        self,
+        field: int,
+        count: int,
+        start: float,
+        end: float,
+        *,
+        level: int | None = None,
+        component: str | None = None,
+    ) -> list[tuple[str, int]]:
+        """Get the components (field 1) or signatures (field 2) counted most."""
+        totals: dict[str, int] = {}
+        for _, key, value in self._counts(start, end, level, component, None):
+            if key[field]:
+                totals[key[field]] = totals.get(key[field], 0) + value
+        return heapq.nlargest(count, totals.items(), key=lambda item: item[1])
+
+    def __len__(self) -> int:
+        """Return the number of keys held in all buckets."""
+        return sum(
+            len(bucket) for buckets in self._buckets for bucket in buckets.values()
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the state to persist."""
+        return {
+            "totals": list(self.totals),
+            "watermark": self.watermark,
+            "tiers": [
+                [
+                    [start, [[*key, count] for key, count in bucket.items()]]
+                    for start, bucket in buckets.items()
+                ]
+                for buckets in self._buckets
+            ],
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore a persisted state, tiers that no longer exist are dropped."""
+        self.totals = (list(data["totals"]) + [0] * _LEVELS)[:_LEVELS]
+        self.watermark = self._restored_until = data["watermark"]
+        for buckets, stored in zip(self._buckets, data["tiers"]):
+            buckets.clear()
+            for start, keys in stored:
+                buckets[start] = {
+                    (priority, component, signature): count
+                    for priority, component, signature, count in keys
+                }
+        self.compact()
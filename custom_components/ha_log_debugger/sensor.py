@@ -1,20 +1,35 @@
 """Sensor platform for Log Debugger for Home Assistant."""
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
 from datetime import datetime
 import logging
+import time
 from typing import Any
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    NOISIEST_COMPONENTS,
+    RATE_BUCKET_MINUTES,
+    RATE_SENSOR_MINUTES,
+    SIGNAL_STATS_UPDATED,
+    STAT_AI_BUDGET,
+    STAT_LAST_ERROR,
+    STAT_METRICS,
+    STAT_RATES,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,15 +49,56 @@ async def async_setup_entry(
         LogDebuggerCriticalSensor(log_monitor, config_entry),
         LogDebuggerLastErrorSensor(log_monitor, config_entry),
         LogDebuggerAICallsSensor(log_monitor, config_entry),
+        LogDebuggerNoisiestSensor(log_monitor, config_entry),
+        LogDebuggerScanDurationSensor(log_monitor, config_entry),
+        LogDebuggerBacklogSensor(log_monitor, config_entry),
+    ]
+
+    # The noisiest integrations change all the time, so they get a fixed
+    # set of rank sensors instead of a sensor each
+    rate_sensors: list[LogDebuggerRateBaseSensor] = [
+        LogDebuggerRankRateSensor(log_monitor, config_entry, rank)
+        for rank in range(1, log_monitor.top_components + 1)
     ]
+    rate_sensors.extend(
+        LogDebuggerComponentRateSensor(log_monitor, config_entry, component)
+        for component in sorted(set(log_monitor.pinned_components))
+    )
+    _async_remove_stale_rate_sensors(hass, config_entry, rate_sensors)
 
-    async_add_entities(sensors)
+    async_add_entities([*sensors, *rate_sensors])
+
+
+@callback
+def _async_remove_stale_rate_sensors(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    rate_sensors: list[LogDebuggerRateBaseSensor],
+) -> None:
+    """Remove rate sensors of unpinned integrations and of ranks now unused."""
+    registry = er.async_get(hass)
+    prefix = f"{config_entry.entry_id}_rate_"
+    wanted = {sensor.unique_id for sensor in rate_sensors}
+    for entity in er.async_entries_for_config_entry(registry, config_entry.entry_id):
+        if (
+            entity.domain == "sensor"
+            and entity.unique_id.startswith(prefix)
+            and entity.unique_id not in wanted
+        ):
+            registry.async_remove(entity.entity_id)
 
 
 class LogDebuggerBaseSensor(SensorEntity):
-    """Base class for log debugger sensors."""
+    """Base class for log debugger sensors.
+
+    Sensors are not polled, the log monitor signals which statistics changed
+    and a sensor only writes its state when one it shows is among them.
+    """
 
     _attr_has_entity_name = True
+    _attr_should_poll = False
+    # Statistics shown by the sensor
+    _stats: frozenset[str] = frozenset()
 
     def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
@@ -58,13 +114,19 @@ class LogDebuggerBaseSensor(SensorEntity):
     async def async_added_to_hass(self) -> None:
         """Handle entity added to hass."""
         await super().async_added_to_hass()
-        # Force an update when added
-        self.async_schedule_update_ha_state(True)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_STATS_UPDATED.format(self._config_entry.entry_id),
+                self._async_stats_updated,
+            )
+        )
 
-    async def async_update(self) -> None:
-        """Update the sensor."""
-        # Override in subclasses
-        pass
+    @callback
+    def _async_stats_updated(self, changed: frozenset[str]) -> None:
+        """Write the state if a statistic shown by the sensor changed."""
+        if not self._stats.isdisjoint(changed):
+            self.async_write_ha_state()
 
 
 class LogDebuggerTotalSensor(LogDebuggerBaseSensor):
@@ -73,6 +135,9 @@ class LogDebuggerTotalSensor(LogDebuggerBaseSensor):
     _attr_name = "Total Log Entries"
     _attr_icon = "mdi:text-box-multiple"
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _stats = frozenset(
+        ("total_entries", "total_warnings", "total_errors", "total_critical")
+    )
 
     def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
@@ -82,17 +147,18 @@ class LogDebuggerTotalSensor(LogDebuggerBaseSensor):
     @property
     def native_value(self) -> int:
         """Return the state of the sensor."""
-        stats = self.log_monitor.get_statistics()
-        return stats.get("total_entries", 0)
+        stats = self.log_monitor.stats
+        return stats["total_warnings"] + stats["total_errors"] + stats["total_critical"]
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional attributes."""
-        stats = self.log_monitor.get_statistics()
+        stats = self.log_monitor.stats
         return {
-            "warnings": stats.get("total_warnings", 0),
-            "errors": stats.get("total_errors", 0),
-            "critical": stats.get("total_critical", 0),
+            "stored_entries": stats["total_entries"],
+            "warnings": stats["total_warnings"],
+            "errors": stats["total_errors"],
+            "critical": stats["total_critical"],
         }
 
 
@@ -102,6 +168,7 @@ class LogDebuggerWarningSensor(LogDebuggerBaseSensor):
     _attr_name = "Warnings"
     _attr_icon = "mdi:alert"
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _stats = frozenset(("total_warnings",))
 
     def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
@@ -111,7 +178,7 @@ class LogDebuggerWarningSensor(LogDebuggerBaseSensor):
     @property
     def native_value(self) -> int:
         """Return the state of the sensor."""
-        return self.log_monitor.total_warnings
+        return self.log_monitor.stats["total_warnings"]
 
 
 class LogDebuggerErrorSensor(LogDebuggerBaseSensor):
@@ -120,6 +187,7 @@ class LogDebuggerErrorSensor(LogDebuggerBaseSensor):
     _attr_name = "Errors"
     _attr_icon = "mdi:alert-circle"
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _stats = frozenset(("total_errors",))
 
     def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
@@ -129,7 +197,7 @@ class LogDebuggerErrorSensor(LogDebuggerBaseSensor):
     @property
     def native_value(self) -> int:
         """Return the state of the sensor."""
-        return self.log_monitor.total_errors
+        return self.log_monitor.stats["total_errors"]
 
 
 class LogDebuggerCriticalSensor(LogDebuggerBaseSensor):
@@ -138,6 +206,7 @@ class LogDebuggerCriticalSensor(LogDebuggerBaseSensor):
     _attr_name = "Critical Errors"
     _attr_icon = "mdi:alert-octagon"
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _stats = frozenset(("total_critical",))
 
     def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
@@ -147,7 +216,7 @@ class LogDebuggerCriticalSensor(LogDebuggerBaseSensor):
     @property
     def native_value(self) -> int:
         """Return the state of the sensor."""
-        return self.log_monitor.total_critical
+        return self.log_monitor.stats["total_critical"]
 
 
 class LogDebuggerLastErrorSensor(LogDebuggerBaseSensor):
@@ -155,6 +224,7 @@ class LogDebuggerLastErrorSensor(LogDebuggerBaseSensor):
 
     _attr_name = "Last Error"
     _attr_icon = "mdi:message-alert"
+    _stats = frozenset((STAT_LAST_ERROR,))
 
     def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
@@ -164,44 +234,49 @@ class LogDebuggerLastErrorSensor(LogDebuggerBaseSensor):
     @property
     def native_value(self) -> str:
         """Return the state of the sensor."""
-        recent_entries = self.log_monitor.get_recent_entries(count=10)
-        
-        # Find the most recent error or critical
-        for entry in reversed(recent_entries):
-            if entry.level in ["ERROR", "CRITICAL"]:
-                return entry.message[:255]  # Limit length
-        
-        return "No recent errors"
+        entry = self.log_monitor.last_error
+        if entry is None:
+            return "No recent errors"
+        return entry.message[:255]  # Limit length
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional attributes."""
-        recent_entries = self.log_monitor.get_recent_entries(count=10)
+        entry = self.log_monitor.last_error
+        if entry is None:
+            return {}
         
-        # Find the most recent error or critical
-        for entry in reversed(recent_entries):
-            if entry.level in ["ERROR", "CRITICAL"]:
-                attrs = {
-                    "timestamp": entry.timestamp.isoformat(),
-                    "level": entry.level,
-                    "component": entry.component,
-                    "full_message": entry.message,
-                }
-                
-                if entry.entity_id:
-                    attrs["entity_id"] = entry.entity_id
-                if entry.device_id:
-                    attrs["device_id"] = entry.device_id
-                if entry.github_url:
-                    attrs["github_url"] = entry.github_url
-                if entry.ai_analysis:
-                    attrs["ai_analysis"] = entry.ai_analysis
-                if entry.suggested_fix:
-                    attrs["suggested_fix"] = entry.suggested_fix
-                
-                return attrs
+        attrs = {
+            # The last error may be a repeat of the stored entry
+            "timestamp": entry.last_seen.isoformat(),
+            "level": entry.level,
+            "component": entry.component,
+            "full_message": entry.message,
+        }
+        
+        # Repeats of the same message are counted on its signature
+        group = self.log_monitor.signatures.get(entry.signature)
+        if group is not None:
+            attrs["occurrences"] = group.count
+            attrs["first_seen"] = group.first_seen.isoformat()
+            attrs["last_seen"] = group.last_seen.isoformat()
         
-        return {}
+        if entry.entity_id:
+            attrs["entity_id"] = entry.entity_id
+        if len(entry.entity_ids) > 1:
+            attrs["entity_ids"] = list(entry.entity_ids)
+        if entry.device_id:
+            attrs["device_id"] = entry.device_id
+        if entry.github_url:
+            attrs["github_url"] = entry.github_url
+        if entry.ai_analysis:
+            attrs["ai_analysis"] = entry.ai_analysis
+        if entry.suggested_fix:
+            attrs["suggested_fix"] = entry.suggested_fix
+        if entry.exception:
+            attrs["exception"] = entry.exception
+        
+        return attrs
 
 
 class LogDebuggerAICallsSensor(LogDebuggerBaseSensor):
@@ -209,22 +284,233 @@ class LogDebuggerAICallsSensor(LogDebuggerBaseSensor):
 
     _attr_name = "AI Analysis Remaining"
     _attr_icon = "mdi:robot"
+    _stats = frozenset((STAT_AI_BUDGET,))
 
     def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
         super().__init__(log_monitor, config_entry)
         self._attr_unique_id = f"{config_entry.entry_id}_ai_calls"
+        self._budget: dict[str, Any] = {}
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Take the budget statistics once for the state and attributes."""
+        self._budget = self.log_monitor.ai_budget.get_statistics()
+        super().async_write_ha_state()
 
     @property
     def native_value(self) -> int:
         """Return the state of the sensor."""
-        stats = self.log_monitor.get_statistics()
-        return stats.get("ai_calls_remaining", 0)
+        return self._budget.get("ai_calls_remaining", 0)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional attributes."""
+        budget = self._budget
         return {
             "max_calls_per_hour": self.log_monitor.max_ai_calls_per_hour,
             "auto_analyze_enabled": self.log_monitor.auto_analyze,
+            "tokens": budget.get("ai_tokens"),
+            "critical_reserve": budget.get("ai_critical_reserve"),
+            "next_refill": budget.get("ai_next_token"),
+            "full_refill": budget.get("ai_budget_full"),
+            "calls_spent": budget.get("ai_calls_spent"),
+            **self.log_monitor.ai_cache.get_statistics(),
         }
+
+
+class LogDebuggerRateBaseSensor(LogDebuggerBaseSensor, ABC):
+    """Base class for sensors showing rates.
+
+    Rates move as minutes pass, so the values are computed once per signal
+    and the state is only written when they differ from the last written.
+    """
+
+    _stats = frozenset((STAT_RATES,))
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity added to hass."""
+        self._async_compute()
+        await super().async_added_to_hass()
+
+    @callback
+    def _async_stats_updated(self, changed: frozenset[str]) -> None:
+        """Write the state if the rates shown by the sensor changed."""
+        if self._stats.isdisjoint(changed):
+            return
+        state = (self._attr_native_value, self._attr_extra_state_attributes)
+        self._async_compute()
+        if state != (self._attr_native_value, self._attr_extra_state_attributes):
+            self.async_write_ha_state()
+
+    @abstractmethod
+    @callback
+    def _async_compute(self) -> None:
+        """Set the native value and attributes from the rates."""
+
+
+class LogDebuggerComponentRateSensor(LogDebuggerRateBaseSensor):
+    """Sensor showing the error rate of an integration."""
+
+    _attr_icon = "mdi:chart-line"
+    _attr_native_unit_of_measurement = "errors/min"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, log_monitor, config_entry: ConfigEntry, component: str | None
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(log_monitor, config_entry)
+        self.component = component
+        self._attr_name = f"{component} errors per minute"
+        self._attr_unique_id = f"{config_entry.entry_id}_rate_{component}"
+
+    @callback
+    def _async_compute(self) -> None:
+        """Set the errors per minute and the counts of the last hour."""
+        if self.component is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {"component": None}
+            return
+        rates = self.log_monitor.rates
+        now = time.time()
+        recent = rates.counts(self.component, now, RATE_SENSOR_MINUTES)
+        hour = rates.counts(self.component, now, RATE_BUCKET_MINUTES)
+        self._attr_native_value = round(
+            (recent["ERROR"] + recent["CRITICAL"]) / RATE_SENSOR_MINUTES, 2
+        )
+        self._attr_extra_state_attributes = {
+            "component": self.component,
+            "window_minutes": RATE_SENSOR_MINUTES,
+            "warnings_per_minute": round(recent["WARNING"] / RATE_SENSOR_MINUTES, 2),
+            "warnings_last_hour": hour["WARNING"],
+            "errors_last_hour": hour["ERROR"],
+            "critical_last_hour": hour["CRITICAL"],
+        }
+
+
+class LogDebuggerRankRateSensor(LogDebuggerComponentRateSensor):
+    """Sensor showing the error rate of the integration at a noisiness rank.
+
+    The integration changes as the ranking does, it is named by the
+    ``component`` attribute.
+    """
+
+    def __init__(self, log_monitor, config_entry: ConfigEntry, rank: int) -> None:
+        """Initialize the sensor."""
+        super().__init__(log_monitor, config_entry, None)
+        self.rank = rank
+        self._attr_name = f"Noisy integration {rank} errors per minute"
+        self._attr_unique_id = f"{config_entry.entry_id}_rate_top_{rank}"
+
+    @callback
+    def _async_compute(self) -> None:
+        """Follow the integration at the rank, then set its rates."""
+        top = self.log_monitor.rates.top(self.rank, time.time(), RATE_BUCKET_MINUTES)
+        self.component = top[-1][0] if len(top) == self.rank else None
+        super()._async_compute()
+
+
+class LogDebuggerNoisiestSensor(LogDebuggerRateBaseSensor):
+    """Sensor showing the integrations that logged the most in the last hour."""
+
+    _attr_name = "Noisiest Integration"
+    _attr_icon = "mdi:volume-high"
+
+    def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(log_monitor, config_entry)
+        self._attr_unique_id = f"{config_entry.entry_id}_noisiest"
+
+    @callback
+    def _async_compute(self) -> None:
+        """Set the noisiest integration and the ranking."""
+        top = self.log_monitor.rates.top(
+            NOISIEST_COMPONENTS, time.time(), RATE_BUCKET_MINUTES
+        )
+        self._attr_native_value = top[0][0] if top else "None"
+        self._attr_extra_state_attributes = {
+            "top": [
+                {
+                    "component": component,
+                    "warnings": counts["WARNING"],
+                    "errors": counts["ERROR"],
+                    "critical": counts["CRITICAL"],
+                    "total": sum(counts.values()),
+                }
+                for component, counts in top
+            ],
+        }
+
+
+class LogDebuggerDiagnosticSensor(LogDebuggerBaseSensor):
+    """Base class for sensors showing the monitor's own performance.
+
+    Disabled by default, they are only updated by scans that read lines.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _stats = frozenset((STAT_METRICS,))
+
+
+class LogDebuggerScanDurationSensor(LogDebuggerDiagnosticSensor):
+    """Sensor showing how long the last scan of the log file took."""
+
+    _attr_name = "Scan Duration"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(log_monitor, config_entry)
+        self._attr_unique_id = f"{config_entry.entry_id}_scan_duration"
+
+    @property
+    def native_value(self) -> float:
+        """Return the state of the sensor."""
+        return round(self.log_monitor.metrics.timings["scan"].last, 2)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the scan percentiles and the mean of every stage."""
+        timings = self.log_monitor.metrics.timings
+        scan = timings["scan"]
+        return {
+            "scans": scan.count,
+            "p50_ms": scan.percentile(0.5),
+            "p99_ms": scan.percentile(0.99),
+            "max_ms": round(scan.max, 2),
+            "stage_mean_ms": {
+                stage: round(timing.total / timing.count, 3)
+                for stage, timing in timings.items()
+                if timing.count
+            },
+        }
+
+
+class LogDebuggerBacklogSensor(LogDebuggerDiagnosticSensor):
+    """Sensor showing the bytes of the log file not read yet."""
+
+    _attr_name = "Log Backlog"
+    _attr_icon = "mdi:file-clock-outline"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+
+    def __init__(self, log_monitor, config_entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(log_monitor, config_entry)
+        self._attr_unique_id = f"{config_entry.entry_id}_backlog"
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return self.log_monitor.metrics.bytes_behind
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the peak backlog and the line and record counters."""
+        metrics = self.log_monitor.metrics
+        return {"max_bytes": metrics.max_bytes_behind, **metrics.counters}
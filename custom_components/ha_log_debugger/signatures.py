@@ -0,0 +1,118 @@
+"""Message fingerprinting and signature-level deduplication."""
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+import hashlib
+import re
+from typing import TYPE_CHECKING, Any
+
+from .const import MAX_SIGNATURES, SIGNATURE_SAMPLES
+
+if TYPE_CHECKING:
+    from .log_entry import LogEntry
+
+# Variable parts of a message, masked in one pass. Order matters: quoted
+# values and URLs first so their contents are not masked piecemeal.
+_VARIABLE_PARTS = re.compile(
+    r"(?P<str>'[^']*'|\"[^\"]*\")"
+    r"|(?P<url>https?://\S+)"
+    r"|(?P<uuid>\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b)"
+    r"|(?P<ip>\b(?:\d{1,3}\.){3}\d{1,3}(?::\d+)?\b)"
+    r"|(?P<hex>\b0x[0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{8,}\b)"
+    r"|(?P<num>\b\d+(?:\.\d+)?\b)"
+)
+
+
+def normalize_message(message: str) -> str:
+    """Reduce a message to a template by masking its variable parts."""
+    return _VARIABLE_PARTS.sub(lambda match: f"<{match.lastgroup}>", message)
+
+
+def template_signature(level: str, component: str | None, template: str) -> str:
+    """Get a stable identifier for a message template."""
+    return hashlib.blake2b(
+        f"{level}|{component}|{template}".encode(), digest_size=8
+    ).hexdigest()
+
+
+@dataclass
+class SignatureGroup:
+    """All occurrences of one message template."""
+
+    signature: str
+    level: str
+    component: str | None
+    template: str
+    first_seen: datetime
+    last_seen: datetime
+    count: int = 0
+    samples: deque[str] = field(default_factory=lambda: deque(maxlen=SIGNATURE_SAMPLES))
+    entry: LogEntry | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "signature": self.signature,
+            "level": self.level,
+            "component": self.component,
+            "template": self.template,
+            "first_seen": self.first_seen.isoformat(),
+            "last_seen": self.last_seen.isoformat(),
+            "count": self.count,
+            "samples": list(self.samples),
+        }
+
+
+class SignatureStore:
+    """Signature groups, evicting the least recently seen beyond a limit."""
+
+    def __init__(self, max_signatures: int = MAX_SIGNATURES) -> None:
+        """Initialize the store."""
+        self.max_signatures = max_signatures
+        self._groups: OrderedDict[str, SignatureGroup] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of signatures."""
+        return len(self._groups)
+
+    def get(self, signature: str | None) -> SignatureGroup | None:
+        """Get the group of a signature."""
+        return self._groups.get(signature)
+
+    def record(self, entry: LogEntry) -> tuple[SignatureGroup, bool]:
+        """Count an entry in its group, return the group and if it is new."""
+        template = normalize_message(entry.message)
+        signature = template_signature(entry.level, entry.component, template)
+        entry.signature = signature
+
+        group = self._groups.get(signature)
+        is_new = group is None
+        if group is None:
+            group = SignatureGroup(
+                signature=signature,
+                level=entry.level,
+                component=entry.component,
+                template=template,
+                first_seen=entry.timestamp,
+                last_seen=entry.timestamp,
+            )
+            self._groups[signature] = group
+            if len(self._groups) > self.max_signatures:
+                self._groups.popitem(last=False)
+        else:
+            self._groups.move_to_end(signature)
+
+        group.count += 1
+        group.last_seen = entry.timestamp
+        group.samples.append(entry.message)
+        return group, is_new
+
+    def top(self, count: int = 10) -> list[SignatureGroup]:
+        """Get the groups with the most occurrences."""
+        return sorted(self._groups.values(), key=lambda g: g.count, reverse=True)[:count]
+
+    def clear(self) -> None:
+        """Remove all groups."""
+        self._groups.clear()
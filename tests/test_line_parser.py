@@ -0,0 +1,26 @@
+"""Tests of the log line parser.
+
+Usage:
+    python -m pytest tests
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import fake_hass  # noqa: E402
+
+fake_hass.install()
+
+from ha_log_debugger.line_parser import LogLineParser  # noqa: E402
+
+
+def test_fallback_keeps_milliseconds_like_the_fast_path() -> None:
+    """Both header parsers give a record the same time."""
+    parser = LogLineParser("WARNING")
+    line = "2026-10-17 10:00:00.123 ERROR (MainThread) [homeassistant.components.demo] Failed"
+
+    assert parser._parse_fallback(line) == parser.parse(line)
+    assert parser._parse_fallback(line)[0].microsecond == 123000
@@ -0,0 +1,98 @@
+"""Tests of the log monitor, run on the stand-in Home Assistant of the benchmarks.
+
+Usage:
+    python -m pytest tests
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import fake_hass  # noqa: E402
+
+fake_hass.install()
+
+from ha_log_debugger.const import (  # noqa: E402
+    CONF_INGEST_MODE,
+    CONF_PERSIST_HISTORY,
+    INGEST_MODE_HANDLER,
+)
+from ha_log_debugger.log_monitor import LogMonitor  # noqa: E402
+
+# The format Home Assistant writes home-assistant.log with
+_LOG_FORMAT = "%(asctime)s.%(msecs)03d %(levelname)s (%(threadName)s) [%(name)s] %(message)s"
+
+_COUNTERS = ("total_warnings", "total_errors", "total_critical")
+
+
+def test_profile_scan_in_handler_mode_counts_nothing_again(tmp_path: Path) -> None:
+    """Records received by the handler are not counted again from the file."""
+
+    async def run() -> None:
+        path = tmp_path / "home-assistant.log"
+        path.touch()
+        file_handler = logging.FileHandler(path)
+        file_handler.setFormatter(logging.Formatter(_LOG_FORMAT, "%Y-%m-%d %H:%M:%S"))
+        logger = logging.getLogger("homeassistant.components.demo")
+        logger.addHandler(file_handler)
+
+        hass = fake_hass.FakeHass([], str(tmp_path))
+        entry = fake_hass.FakeConfigEntry(options={CONF_INGEST_MODE: INGEST_MODE_HANDLER})
+        monitor = LogMonitor(hass, entry)
+        await monitor.async_start()
+        await monitor.async_scan_logs(full_scan=True)
+        monitor.async_attach_handler()
+        try:
+            for number in range(5):
+                logger.error("Update %d failed", number)
+            file_handler.flush()
+            # Let the handler hand the records to the monitor
+            await asyncio.sleep(0.1)
+            counted = {key: monitor.stats[key] for key in _COUNTERS}
+            counters = dict(monitor.metrics.counters)
+            assert counted["total_errors"] == 5
+
+            await monitor.async_profile_scan()
+
+            assert {key: monitor.stats[key] for key in _COUNTERS} == counted
+            assert monitor.metrics.counters["records_accepted"] == counters["records_accepted"]
+        finally:
+            logger.removeHandler(file_handler)
+            file_handler.close()
+            await monitor.async_stop()
+
+    asyncio.run(run())
+
+
+def test_history_keeps_identical_records_once_across_restarts(tmp_path: Path) -> None:
+    """Identical records of one millisecond each get a row, written only once."""
+    path = tmp_path / "home-assistant.log"
+    line = "2026-10-17 10:00:00.123 ERROR (MainThread) [homeassistant.components.demo] Failed\n"
+    path.write_text(line * 3)
+
+    async def start() -> LogMonitor:
+        hass = fake_hass.FakeHass([], str(tmp_path))
+        entry = fake_hass.FakeConfigEntry(options={CONF_PERSIST_HISTORY: True})
+        monitor = LogMonitor(hass, entry)
+        await monitor.async_start()
+        await monitor.async_scan_logs(full_scan=True)
+        return monitor
+
+    async def run() -> None:
+        monitor = await start()
+        assert monitor.stats["total_errors"] == 3
+        assert monitor.history.count() == 3
+        await monitor.async_stop()
+
+        # The startup scan reads the same records again
+        with path.open("a") as log:
+            log.write(line.replace(".123", ".456"))
+        monitor = await start()
+        assert monitor.history.count() == 4
+        await monitor.async_stop()
+
+    asyncio.run(run())